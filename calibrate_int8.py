@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Calibración y exportación del modelo YOLO a un engine TensorRT INT8.
+
+Captura frames representativos de la cámara, genera el YAML de calibración y
+exporta models/best_b<lote>_int8.engine, que run_pose_detection.py y
+run_postprocess.py usan automáticamente cuando existe para su --batch-size (por
+delante del engine FP16).
+
+INT8 reduce a la mitad los bytes por peso respecto a FP16 y duplica el
+rendimiento de los tensor cores; la pérdida típica de mAP es inferior al 1 %,
+pero conviene validarla con el conjunto de validación propio antes de usar el
+engine en producción.
+
+Uso:
+    python calibrate_int8.py                   # 500 frames de la cámara 0
+    python calibrate_int8.py --frames 1000 --stride 3
+    python calibrate_int8.py --skip-capture    # Reutilizar frames ya capturados
+    python calibrate_int8.py --batch 4         # Engine con lote dinámico de hasta 4 frames
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import yaml
+from ultralytics import YOLO
+
+# Agregar el directorio src al path
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from vision.camera import open_camera, read_latest
+from vision.detector import int8_engine_path_for
+
+MODEL_PATH = "models/best.pt"
+CALIB_DIR = Path("data/calibration/images")
+CALIB_YAML = Path("config/calib.yaml")
+
+
+def capture_calibration_frames(output_dir: Path, num_frames: int, stride: int, camera_index: int) -> int:
+    """
+    Captura frames de la cámara para la calibración INT8.
+
+    Args:
+        output_dir: Carpeta donde guardar las imágenes
+        num_frames: Número de frames a guardar
+        stride: Guardar uno de cada `stride` frames (más variedad de escenas)
+        camera_index: Índice de la cámara
+
+    Returns:
+        Número de frames guardados
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cap, buffer_ok = open_camera(camera_index)
+    if not cap.isOpened():
+        print(f"❌ No se pudo abrir la cámara {camera_index}")
+        return 0
+
+    print(f"📸 Capturando {num_frames} frames (1 de cada {stride}). Mueve el pórtico por todo su recorrido...")
+    saved = 0
+    read = 0
+    try:
+        while saved < num_frames:
+            ret, frame = read_latest(cap, buffer_ok)
+            if not ret:
+                print("❌ No se pudo leer el frame de la cámara")
+                break
+            read += 1
+            if read % stride:
+                continue
+
+            cv2.imwrite(str(output_dir / f"calib_{saved:05d}.jpg"), frame)
+            saved += 1
+            if saved % 50 == 0:
+                print(f"   {saved}/{num_frames} frames")
+    finally:
+        cap.release()
+
+    return saved
+
+
+def write_calibration_yaml(model: YOLO, images_dir: Path, yaml_path: Path) -> Path:
+    """
+    Genera el YAML de dataset que usa ultralytics para calibrar INT8.
+
+    Args:
+        model: Modelo YOLO (para copiar nombres de clases y forma de keypoints)
+        images_dir: Carpeta con las imágenes de calibración
+        yaml_path: Ruta del YAML a generar
+
+    Returns:
+        Ruta del YAML generado
+    """
+    data = {
+        'path': str(images_dir.parent.resolve()),
+        'train': images_dir.name,
+        'val': images_dir.name,
+        'names': dict(model.names),
+    }
+    kpt_shape = getattr(model.model, 'kpt_shape', None)
+    if kpt_shape is not None:
+        data['kpt_shape'] = list(kpt_shape)
+
+    yaml_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(yaml_path, 'w', encoding='utf-8') as file:
+        yaml.safe_dump(data, file, allow_unicode=True, sort_keys=False)
+    return yaml_path
+
+
+def export_int8_engine(model_path: str, data_yaml: Path, imgsz: int, workspace: int,
+                       batch: int = 1) -> str:
+    """
+    Exporta el modelo a TensorRT INT8 sin sobrescribir el engine FP16.
+
+    ultralytics escribe el engine junto al .pt con su mismo nombre, así que se
+    exporta desde una copia temporal best_b<lote>_int8.pt para obtener
+    best_b<lote>_int8.engine.
+
+    Args:
+        model_path: Ruta al modelo YOLO (.pt)
+        data_yaml: YAML de calibración
+        imgsz: Tamaño de entrada del engine
+        workspace: Memoria de trabajo de TensorRT en GiB
+        batch: Tamaño de lote máximo; si es mayor que 1 el engine se exporta con lote dinámico
+
+    Returns:
+        Ruta del engine INT8 generado
+    """
+    engine_path = int8_engine_path_for(model_path, batch)
+    int8_source = os.path.splitext(engine_path)[0] + ".pt"
+    shutil.copyfile(model_path, int8_source)
+
+    try:
+        exported_path = YOLO(int8_source).export(format="engine", int8=True, data=str(data_yaml),
+                                                 workspace=workspace, imgsz=imgsz, device=0,
+                                                 dynamic=batch > 1, batch=batch)
+    finally:
+        os.remove(int8_source)
+
+    return str(exported_path)
+
+
+def main():
+    """Captura frames de calibración y exporta el engine INT8."""
+    parser = argparse.ArgumentParser(description="Calibración INT8 y exportación a TensorRT")
+    parser.add_argument("--model", default=MODEL_PATH, help="Modelo YOLO de partida (.pt)")
+    parser.add_argument("--frames", type=int, default=500, help="Frames de calibración (500-1000 recomendado)")
+    parser.add_argument("--stride", type=int, default=5, help="Guardar uno de cada N frames capturados")
+    parser.add_argument("--camera", type=int, default=0, help="Índice de la cámara")
+    parser.add_argument("--imgsz", type=int, default=640, help="Tamaño de entrada del engine")
+    parser.add_argument("--workspace", type=int, default=4, help="Workspace de TensorRT en GiB")
+    parser.add_argument("--batch", type=int, default=1,
+                        help="Tamaño de lote máximo del engine (el --batch-size de los scripts)")
+    parser.add_argument("--skip-capture", action="store_true",
+                        help="No capturar: usar las imágenes existentes en data/calibration/images")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        print(f"❌ Archivo de modelo no encontrado: {args.model}")
+        return
+
+    if not args.skip_capture:
+        saved = capture_calibration_frames(CALIB_DIR, args.frames, args.stride, args.camera)
+        if saved == 0:
+            return
+        print(f"✅ {saved} frames guardados en {CALIB_DIR}")
+
+    if not any(CALIB_DIR.glob("*.jpg")):
+        print(f"❌ No hay imágenes de calibración en {CALIB_DIR}")
+        return
+
+    data_yaml = write_calibration_yaml(YOLO(args.model), CALIB_DIR, CALIB_YAML)
+    print(f"📝 YAML de calibración: {data_yaml}")
+
+    print("⚙️ Exportando a TensorRT INT8 (puede tardar varios minutos)...")
+    start = time.time()
+    try:
+        engine_path = export_int8_engine(args.model, data_yaml, args.imgsz, args.workspace,
+                                         args.batch)
+    except Exception as e:
+        print(f"❌ Error exportando a TensorRT INT8: {e}")
+        return
+
+    print(f"✅ Engine INT8 generado en {time.time() - start:.0f}s: {engine_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,50 +10,133 @@ import time
 import logging
 import threading
 import json
+from dataclasses import dataclass, asdict
 from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: se usa json de la librería estándar
+    orjson = None
 
 # Agregar el directorio src al path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from mqtt.dicapua_publisher import DicapuaPublisher
 
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler con buffer grande que vuelca a disco periódicamente.
+    
+    El flush por registro de logging.FileHandler se desactiva; los datos se
+    escriben cada flush_interval segundos, al llamar a force_flush() o al cerrar.
+    """
+    
+    def __init__(self, filename, mode='a', encoding=None, buffer_size=1 << 16, flush_interval=5.0):
+        self.buffer_size = buffer_size
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self._flush_stop = threading.Event()
+        self._flush_thread = threading.Thread(target=self._periodic_flush, args=(flush_interval,), daemon=True)
+        self._flush_thread.start()
+    
+    def _open(self):
+        """Abre el fichero de log con un buffer de escritura grande"""
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=getattr(self, 'errors', None))
+    
+    def flush(self):
+        """No-op: el volcado se hace en force_flush()"""
+    
+    def force_flush(self):
+        """Vuelca a disco los registros pendientes"""
+        self.acquire()
+        try:
+            if self.stream and hasattr(self.stream, "flush"):
+                self.stream.flush()
+        finally:
+            self.release()
+    
+    def _periodic_flush(self, interval):
+        """Hilo que vuelca el buffer cada interval segundos"""
+        while not self._flush_stop.wait(interval):
+            self.force_flush()
+    
+    def close(self):
+        """Detiene el volcado periódico y cierra el fichero"""
+        self._flush_stop.set()
+        self.force_flush()
+        super().close()
+
+
 # Configurar logging
+file_handler = BufferedFileHandler('dicapua_monitor.log')
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('dicapua_monitor.log'),
+        file_handler,
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Número de muestras simuladas precalculadas (mcm de los periodos 10 y 20)
+SIM_SAMPLES = 20
+
+# dataclass(slots=True) solo existe a partir de Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class MonitorStats:
+    """Contadores del monitoreo"""
+    total_attempts: int = 0
+    successful_sends: int = 0
+    failed_sends: int = 0
+    disconnections: int = 0
+    reconnections: int = 0
+    start_time: Optional[datetime] = None
+
+
 class DicapuaMonitor:
     """Monitor continuo de conexión DicapuaIoT"""
     
+    __slots__ = ('publisher', 'stats', '_stop', '_connected_evt',
+                 '_sim', '_marker_tpl', '_portico_tpl', '_start_perf')
+    
     def __init__(self):
         self.publisher = None
-        self.running = False
-        self.stats = {
-            'total_attempts': 0,
-            'successful_sends': 0,
-            'failed_sends': 0,
-            'disconnections': 0,
-            'reconnections': 0,
-            'start_time': None
-        }
+        self._stop = threading.Event()
+        self._connected_evt = threading.Event()
+        self.stats = MonitorStats()
+        self._start_perf = None
+        
+        # Buffer circular de datos simulados: columnas (marcador, pórtico) en cm
+        samples = np.arange(SIM_SAMPLES)
+        self._sim = np.stack([5.0 + (samples % 10),      # 5-15 cm
+                              15.0 + (samples % 20)],    # 15-35 cm
+                             axis=1).round(2)
+        
+        # Plantillas de payload reutilizadas en cada envío. El publisher copia los
+        # campos en sus propios diccionarios, así que se pueden mutar sin riesgo.
+        self._marker_tpl = {"distance_cm": 0.0, "timestamp": 0.0, "type": "marker"}
+        self._portico_tpl = {"distance_cm": 0.0, "timestamp": 0.0, "source": "portico_pulsador"}
         
     def start_monitoring(self, duration_minutes=30):
         """Inicia el monitoreo por el tiempo especificado"""
         logger.info(f"🚀 Iniciando monitoreo DicapuaIoT por {duration_minutes} minutos")
         logger.info("=" * 70)
         
-        self.stats['start_time'] = datetime.now()
-        self.running = True
+        self.stats.start_time = datetime.now()
+        self._start_perf = time.perf_counter()
+        self._stop.clear()
+        send_thread = None
         
         try:
             # Crear publisher
             self.publisher = DicapuaPublisher()
+            self.publisher.on_connection_change = self._on_connection_change
             
             # Iniciar conexión
             if not self.publisher.start_client_direct_mode():
@@ -75,18 +158,22 @@ class DicapuaMonitor:
             send_thread.start()
             
             # Monitorear por el tiempo especificado
-            end_time = time.time() + (duration_minutes * 60)
-            last_status_check = 0
+            # Reloj monotónico: inmune a saltos del reloj de pared (NTP)
+            end_time = time.monotonic() + (duration_minutes * 60)
+            last_status_check = float('-inf')
             
-            while time.time() < end_time and self.running:
-                current_time = time.time()
+            while not self._stop.is_set():
+                current_time = time.monotonic()
+                if current_time >= end_time:
+                    break
                 
                 # Verificar estado cada 30 segundos
                 if current_time - last_status_check >= 30:
                     self._check_connection_status()
                     last_status_check = current_time
                 
-                time.sleep(5)
+                if self._stop.wait(5):
+                    break
             
             logger.info("⏰ Tiempo de monitoreo completado")
             
@@ -95,99 +182,112 @@ class DicapuaMonitor:
         except Exception as e:
             logger.error(f"❌ Error en monitoreo: {e}")
         finally:
-            self.running = False
+            self._stop.set()
+            if send_thread is not None:
+                send_thread.join(timeout=5)
             self._cleanup()
             self._print_final_stats()
     
+    def _on_connection_change(self, connected):
+        """Refleja el estado de conexión notificado por el publisher"""
+        if connected:
+            self._connected_evt.set()
+        else:
+            self._connected_evt.clear()
+    
     def _wait_for_connection(self, timeout=30):
-        """Espera a que se establezca la conexión"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self.publisher and self.publisher.dicapua_connected:
-                return True
-            time.sleep(1)
-        return False
+        """Espera a que se establezca la conexión (señalada por el publisher)"""
+        return self._connected_evt.wait(timeout)
     
     def _data_sender(self):
         """Hilo que envía datos periódicamente"""
         logger.info("📤 Iniciando envío periódico de datos")
         
-        while self.running:
+        # Referencias locales para evitar búsquedas de atributos en el bucle
+        stats = self.stats
+        stop = self._stop
+        connected_evt = self._connected_evt
+        sim = self._sim
+        marker_data = self._marker_tpl
+        portico_data = self._portico_tpl
+        
+        while not stop.is_set():
             try:
-                if self.publisher and self.publisher.dicapua_connected:
-                    # Generar datos simulados
-                    marker_distance = 5.0 + (time.time() % 10)  # 5-15 cm
-                    portico_distance = 15.0 + (time.time() % 20)  # 15-35 cm
+                if connected_evt.is_set():
+                    # Tomar datos simulados del buffer circular
+                    now = time.time()
+                    marker_distance, portico_distance = sim[stats.total_attempts % SIM_SAMPLES].tolist()
                     
-                    # Enviar datos de marcador
-                    marker_data = {
-                        "distance_cm": round(marker_distance, 2),
-                        "timestamp": time.time(),
-                        "type": "marker"
-                    }
+                    # Datos de marcador
+                    marker_data["distance_cm"] = marker_distance
+                    marker_data["timestamp"] = now
                     
-                    # Enviar datos de pórtico
-                    portico_data = {
-                        "distance_cm": round(portico_distance, 2),
-                        "timestamp": time.time(),
-                        "source": "portico_pulsador"
-                    }
+                    # Datos de pórtico
+                    portico_data["distance_cm"] = portico_distance
+                    portico_data["timestamp"] = now
                     
-                    self.stats['total_attempts'] += 1
+                    stats.total_attempts += 1
                     
-                    # Enviar marcador
+                    # Enviar marcador y pórtico consecutivamente
                     success1 = self.publisher.send_marker_distance(marker_data)
-                    time.sleep(1)
-                    
-                    # Enviar pórtico
                     success2 = self.publisher.send_distance_data(portico_data)
                     
                     if success1 and success2:
-                        self.stats['successful_sends'] += 1
-                        logger.info(f"✅ Datos enviados: marker={marker_distance:.2f}cm, portico={portico_distance:.2f}cm")
+                        stats.successful_sends += 1
+                        logger.info("✅ Datos enviados: marker=%.2fcm, portico=%.2fcm", marker_distance, portico_distance)
                     else:
-                        self.stats['failed_sends'] += 1
-                        logger.warning(f"⚠️ Error enviando datos: marker={success1}, portico={success2}")
+                        stats.failed_sends += 1
+                        logger.warning("⚠️ Error enviando datos: marker=%s, portico=%s", success1, success2)
                 
                 else:
                     logger.warning("⚠️ No conectado, esperando...")
-                    time.sleep(5)
+                    if stop.wait(5):
+                        break
                 
-                # Esperar antes del siguiente envío
-                time.sleep(15)  # Enviar cada 15 segundos
+                # Esperar antes del siguiente envío (se interrumpe al detener)
+                if stop.wait(15):  # Enviar cada 15 segundos
+                    break
                 
             except Exception as e:
-                logger.error(f"❌ Error en envío de datos: {e}")
-                self.stats['failed_sends'] += 1
-                time.sleep(10)
+                logger.error("❌ Error en envío de datos: %s", e)
+                stats.failed_sends += 1
+                if stop.wait(10):
+                    break
     
     def _check_connection_status(self):
         """Verifica el estado de la conexión"""
         if not self.publisher:
             return
         
-        status = self.publisher.get_connection_status()
-        
         # Detectar desconexiones
-        if not status['dicapua_connected']:
-            self.stats['disconnections'] += 1
+        if not self._connected_evt.is_set():
+            self.stats.disconnections += 1
             logger.warning("💔 Desconexión detectada")
             
             # Esperar reconexión
             logger.info("🔄 Esperando reconexión automática...")
             if self._wait_for_connection(timeout=60):
-                self.stats['reconnections'] += 1
+                self.stats.reconnections += 1
                 logger.info("✅ Reconexión exitosa")
             else:
                 logger.error("❌ Reconexión falló")
         
-        # Log de estado periódico
-        uptime = datetime.now() - self.stats['start_time']
-        success_rate = (self.stats['successful_sends'] / max(1, self.stats['total_attempts'])) * 100
+        # Log de estado periódico (solo se calcula si el nivel INFO está activo)
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
-        logger.info(f"📊 Estado: Conectado={status['dicapua_connected']}, "
-                   f"Uptime={str(uptime).split('.')[0]}, "
-                   f"Éxito={success_rate:.1f}% ({self.stats['successful_sends']}/{self.stats['total_attempts']})")
+        uptime_s = time.perf_counter() - self._start_perf
+        success_rate = (self.stats.successful_sends / max(1, self.stats.total_attempts)) * 100
+        
+        logger.info("📊 Estado: Conectado=%s, Uptime=%s, Éxito=%.1f%% (%d/%d)",
+                    self._connected_evt.is_set(), self._format_uptime(uptime_s), success_rate,
+                    self.stats.successful_sends, self.stats.total_attempts)
+    
+    @staticmethod
+    def _format_uptime(seconds):
+        """Formatea una duración en segundos como H:MM:SS"""
+        seconds = int(seconds)
+        return f"{seconds // 3600}:{(seconds // 60) % 60:02d}:{seconds % 60:02d}"
     
     def _cleanup(self):
         """Limpia recursos"""
@@ -195,41 +295,47 @@ class DicapuaMonitor:
             logger.info("🔌 Deteniendo cliente...")
             self.publisher.stop_client()
             logger.info("✅ Cliente detenido")
+        file_handler.force_flush()
     
     def _print_final_stats(self):
         """Imprime estadísticas finales"""
-        if not self.stats['start_time']:
+        if not self.stats.start_time:
             return
         
-        duration = datetime.now() - self.stats['start_time']
-        success_rate = (self.stats['successful_sends'] / max(1, self.stats['total_attempts'])) * 100
+        duration_s = time.perf_counter() - self._start_perf
+        success_rate = (self.stats.successful_sends / max(1, self.stats.total_attempts)) * 100
         
         logger.info("\n" + "=" * 70)
         logger.info("📊 ESTADÍSTICAS FINALES DEL MONITOREO")
         logger.info("=" * 70)
-        logger.info(f"⏰ Duración total: {str(duration).split('.')[0]}")
-        logger.info(f"📤 Intentos de envío: {self.stats['total_attempts']}")
-        logger.info(f"✅ Envíos exitosos: {self.stats['successful_sends']}")
-        logger.info(f"❌ Envíos fallidos: {self.stats['failed_sends']}")
+        logger.info(f"⏰ Duración total: {self._format_uptime(duration_s)}")
+        logger.info(f"📤 Intentos de envío: {self.stats.total_attempts}")
+        logger.info(f"✅ Envíos exitosos: {self.stats.successful_sends}")
+        logger.info(f"❌ Envíos fallidos: {self.stats.failed_sends}")
         logger.info(f"📈 Tasa de éxito: {success_rate:.1f}%")
-        logger.info(f"💔 Desconexiones: {self.stats['disconnections']}")
-        logger.info(f"🔄 Reconexiones: {self.stats['reconnections']}")
+        logger.info(f"💔 Desconexiones: {self.stats.disconnections}")
+        logger.info(f"🔄 Reconexiones: {self.stats.reconnections}")
         
-        if self.stats['disconnections'] > 0:
-            avg_uptime = duration.total_seconds() / (self.stats['disconnections'] + 1)
+        if self.stats.disconnections > 0:
+            avg_uptime = duration_s / (self.stats.disconnections + 1)
             logger.info(f"⏱️ Tiempo promedio entre desconexiones: {avg_uptime:.1f} segundos")
         
         logger.info("=" * 70)
         
         # Guardar estadísticas en archivo
         stats_file = f"dicapua_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(stats_file, 'w') as f:
-            stats_data = self.stats.copy()
-            stats_data['start_time'] = stats_data['start_time'].isoformat()
-            stats_data['end_time'] = datetime.now().isoformat()
-            stats_data['duration_seconds'] = duration.total_seconds()
-            stats_data['success_rate'] = success_rate
-            json.dump(stats_data, f, indent=2)
+        stats_data = asdict(self.stats)
+        stats_data['start_time'] = stats_data['start_time'].isoformat()
+        stats_data['end_time'] = datetime.now().isoformat()
+        stats_data['duration_seconds'] = duration_s
+        stats_data['success_rate'] = success_rate
+        
+        if orjson is not None:
+            with open(stats_file, 'wb') as f:
+                f.write(orjson.dumps(stats_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(stats_file, 'w') as f:
+                json.dump(stats_data, f, indent=2)
         
         logger.info(f"📁 Estadísticas guardadas en: {stats_file}")
 
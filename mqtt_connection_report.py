@@ -8,11 +8,22 @@ import json
 import ssl
 import time
 import logging
+import threading
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 import paho.mqtt.client as mqtt
 from pathlib import Path
 import socket
 import datetime
 
+try:
+    from cryptography import x509
+except ImportError:  # cryptography es opcional: se usa el binario openssl
+    x509 = None
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,243 +31,383 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) solo existe a partir de Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@lru_cache(maxsize=1)
 def load_config():
-    """Cargar configuración de DicapuaIoT"""
+    """Cargar configuración de DicapuaIoT (se lee una sola vez por ejecución)"""
     config_path = Path("src/mqtt/config/dicapuaiot/dicapuaiot.json")
     with open(config_path, 'r') as f:
         return json.load(f)
 
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class CertPaths:
+    """Rutas de certificados y datos de conexión usados por todas las pruebas"""
+    ca_certs: str
+    certfile: str
+    keyfile: str
+    broker: str
+    client_id: str
+
+@lru_cache(maxsize=1)
+def _cert_paths():
+    """Construye (una sola vez) las rutas de certificados y datos del broker"""
+    config = load_config()
+    cert_base = Path("src/mqtt/config")
+    return CertPaths(
+        ca_certs=str(cert_base / config['ca_crt']),
+        certfile=str(cert_base / config['group_1_crt']),
+        keyfile=str(cert_base / config['group_1_key']),
+        broker=config['broker'],
+        client_id=config['client_id']
+    )
+
+@lru_cache(maxsize=8)
+def _make_context(min_version, max_version, ca_certs, certfile, keyfile):
+    """Contexto TLS de cliente compartido por versión TLS y certificados.
+    
+    La CA y la cadena de certificados del cliente se cargan una sola vez por
+    combinación. check_hostname/verify_mode se ajustan en cada prueba.
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.minimum_version = min_version
+    context.maximum_version = max_version
+    context.load_verify_locations(ca_certs)
+    context.load_cert_chain(certfile, keyfile)
+    return context
+
+def _open_tls_connection(context, broker, port, server_hostname, session=None):
+    """Abre una conexión TLS intentando reanudar la sesión indicada.
+    
+    Si el servidor rechaza la reanudación se repite la conexión con un
+    handshake completo.
+    """
+    if session is not None:
+        sock = socket.create_connection((broker, port), timeout=10)
+        try:
+            return context.wrap_socket(sock, server_hostname=server_hostname, session=session)
+        except (ssl.SSLError, ValueError) as e:
+            sock.close()
+            logger.warning("  ⚠️ Reanudación de sesión rechazada, handshake completo: %s", e)
+    
+    sock = socket.create_connection((broker, port), timeout=10)
+    try:
+        return context.wrap_socket(sock, server_hostname=server_hostname)
+    except Exception:
+        sock.close()
+        raise
+
+def _read_session(ssock, ticket_timeout=0.1):
+    """Obtiene la sesión TLS para reutilizarla en la siguiente conexión.
+    
+    En TLS 1.3 los tickets de sesión llegan después del handshake, así que
+    se espera brevemente (como máximo ticket_timeout segundos) a procesarlos.
+    """
+    if ssock.version() == 'TLSv1.3':
+        timeout = ssock.gettimeout()
+        try:
+            ssock.settimeout(ticket_timeout)
+            ssock.recv(1)
+        except (ssl.SSLWantReadError, socket.timeout):
+            pass
+        finally:
+            ssock.settimeout(timeout)
+    return ssock.session
+
 def test_ssl_configurations():
     """Probar diferentes configuraciones SSL/TLS"""
-    config = load_config()
-    broker = config['broker']
+    paths = _cert_paths()
     port = 8883
     
     logger.info("🔐 Probando diferentes configuraciones SSL/TLS...")
     
     # Configuraciones SSL a probar
+    # Las versiones se fijan con minimum_version/maximum_version sobre un
+    # contexto PROTOCOL_TLS_CLIENT (context.protocol es de solo lectura)
     ssl_configs = [
         {
             'name': 'TLS 1.2 con verificación completa',
-            'tls_version': ssl.PROTOCOL_TLSv1_2,
+            'tls_versions': (ssl.TLSVersion.TLSv1_2, ssl.TLSVersion.TLSv1_2),
             'cert_reqs': ssl.CERT_REQUIRED,
             'check_hostname': True
         },
         {
             'name': 'TLS 1.2 sin verificación hostname',
-            'tls_version': ssl.PROTOCOL_TLSv1_2,
+            'tls_versions': (ssl.TLSVersion.TLSv1_2, ssl.TLSVersion.TLSv1_2),
             'cert_reqs': ssl.CERT_REQUIRED,
             'check_hostname': False
         },
         {
-            'name': 'TLS genérico con verificación',
-            'tls_version': ssl.PROTOCOL_TLS,
+            'name': 'TLS 1.3 con verificación',
+            'tls_versions': (ssl.TLSVersion.TLSv1_3, ssl.TLSVersion.TLSv1_3),
             'cert_reqs': ssl.CERT_REQUIRED,
             'check_hostname': True
         },
         {
-            'name': 'TLS genérico sin verificación hostname',
-            'tls_version': ssl.PROTOCOL_TLS,
+            'name': 'TLS 1.3 sin verificación hostname',
+            'tls_versions': (ssl.TLSVersion.TLSv1_3, ssl.TLSVersion.TLSv1_3),
             'cert_reqs': ssl.CERT_REQUIRED,
             'check_hostname': False
         }
     ]
     
-    cert_base = Path("src/mqtt/config")
-    ca_certs = str(cert_base / config['ca_crt'])
-    certfile = str(cert_base / config['group_1_crt'])
-    keyfile = str(cert_base / config['group_1_key'])
+    # Agrupar por versión TLS: cada grupo comparte contexto y sesión y se
+    # prueba en serie; los grupos se prueban en paralelo
+    groups = {}
+    for ssl_config in ssl_configs:
+        groups.setdefault(ssl_config['tls_versions'], []).append(ssl_config)
     
-    results = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        group_results = executor.map(
+            lambda group: _probe_ssl_group(group, paths, port),
+            groups.values()
+        )
+        results_by_name = {result['config']: result for results in group_results for result in results}
     
+    return [results_by_name[ssl_config['name']] for ssl_config in ssl_configs]
+
+def _probe_ssl_group(ssl_configs, paths, port):
+    """Probar en serie configuraciones SSL que comparten versión TLS.
+    
+    Usan un mismo contexto (las sesiones solo se pueden reanudar con el
+    contexto que las creó) y cada conexión reanuda la sesión de la anterior.
+    """
+    try:
+        context = _make_context(*ssl_configs[0]['tls_versions'], paths.ca_certs, paths.certfile, paths.keyfile)
+    except Exception as e:
+        logger.error("  ❌ Error creando contexto SSL: %s", e)
+        return [{'config': ssl_config['name'], 'ssl_success': False, 'error': str(e)}
+                for ssl_config in ssl_configs]
+    
+    results = []
+    session = None
     for ssl_config in ssl_configs:
-        logger.info(f"\n🧪 Probando: {ssl_config['name']}")
+        result, session = _probe_ssl(ssl_config, context, paths.broker, port, session)
+        results.append(result)
+    return results
+
+def _probe_ssl(ssl_config, context, broker, port, session=None):
+    """Probar una configuración SSL. Devuelve (resultado, sesión TLS)"""
+    logger.info("\n🧪 Probando: %s", ssl_config['name'])
+    
+    try:
+        # check_hostname antes que verify_mode: con check_hostname activo no se
+        # puede relajar verify_mode
+        context.check_hostname = ssl_config['check_hostname']
+        context.verify_mode = ssl_config['cert_reqs']
         
-        try:
-            # Crear contexto SSL
-            context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
-            context.load_verify_locations(ca_certs)
-            context.load_cert_chain(certfile, keyfile)
-            context.protocol = ssl_config['tls_version']
-            context.check_hostname = ssl_config['check_hostname']
-            context.verify_mode = ssl_config['cert_reqs']
+        # Probar conexión SSL directa, reanudando la sesión previa si existe
+        server_hostname = broker if ssl_config['check_hostname'] else None
+        with _open_tls_connection(context, broker, port, server_hostname, session) as ssock:
+            logger.info("  ✅ Conexión SSL exitosa (%s, %s)", ssl_config['name'], ssock.version())
+            if ssock.session_reused:
+                logger.info("  ♻️ Sesión TLS reanudada (handshake abreviado)")
+            session = _read_session(ssock)
+            cert = ssock.getpeercert()
+            if cert:
+                logger.info("  📜 Certificado válido hasta: %s", cert.get('notAfter', 'N/A'))
             
-            # Probar conexión SSL directa
-            with socket.create_connection((broker, port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=broker if ssl_config['check_hostname'] else None) as ssock:
-                    logger.info(f"  ✅ Conexión SSL exitosa")
-                    cert = ssock.getpeercert()
-                    if cert:
-                        logger.info(f"  📜 Certificado válido hasta: {cert.get('notAfter', 'N/A')}")
-                    
-                    results.append({
-                        'config': ssl_config['name'],
-                        'ssl_success': True,
-                        'error': None
-                    })
-                    
-        except Exception as e:
-            logger.error(f"  ❌ Error SSL: {e}")
-            results.append({
+            return {
                 'config': ssl_config['name'],
-                'ssl_success': False,
-                'error': str(e)
-            })
-    
-    return results
+                'ssl_success': True,
+                'error': None
+            }, session
+            
+    except Exception as e:
+        logger.error("  ❌ Error SSL (%s): %s", ssl_config['name'], e)
+        return {
+            'config': ssl_config['name'],
+            'ssl_success': False,
+            'error': str(e)
+        }, session
 
 def test_mqtt_with_keepalive_variations():
     """Probar diferentes configuraciones de keepalive y timeouts"""
-    config = load_config()
+    paths = _cert_paths()
     
     logger.info("\n⏱️ Probando diferentes configuraciones de keepalive...")
     
     keepalive_configs = [60, 30, 120, 300]  # Diferentes valores de keepalive
     
-    cert_base = Path("src/mqtt/config")
-    ca_certs = str(cert_base / config['ca_crt'])
-    certfile = str(cert_base / config['group_1_crt'])
-    keyfile = str(cert_base / config['group_1_key'])
+    # Las pruebas son independientes (cliente y socket propios): en paralelo
+    with ThreadPoolExecutor(max_workers=len(keepalive_configs)) as executor:
+        return list(executor.map(
+            lambda keepalive: _probe_keepalive(keepalive, paths),
+            keepalive_configs
+        ))
+
+def _probe_keepalive(keepalive, paths):
+    """Probar una conexión MQTT con el keepalive indicado"""
+    logger.info("\n🔄 Probando keepalive: %s segundos", keepalive)
+    
+    connection_time = 0
+    disconnection_code = None
+    # Se activa al desconectar (o al fallar la conexión) para terminar la prueba
+    done = threading.Event()
     
-    for keepalive in keepalive_configs:
-        logger.info(f"\n🔄 Probando keepalive: {keepalive} segundos")
+    def on_connect(client, userdata, flags, rc):
+        nonlocal connection_time
+        if rc == 0:
+            connection_time = time.time()
+            logger.info("  ✅ Conectado con keepalive %ss", keepalive)
+        else:
+            logger.error("  ❌ Error conexión (keepalive %ss): %s", keepalive, rc)
+            done.set()
+    
+    def on_disconnect(client, userdata, rc):
+        nonlocal disconnection_code
+        disconnection_code = rc
+        done.set()
+        if connection_time > 0:
+            duration = time.time() - connection_time
+            logger.info("  ⏱️ Duración conexión (keepalive %ss): %.2fs", keepalive, duration)
+        if rc != 0:
+            logger.warning("  ⚠️ Desconexión código (keepalive %ss): %s", keepalive, rc)
+    
+    try:
+        # Sufijo aleatorio: evita colisiones de client_id entre pruebas/ejecuciones simultáneas
+        client = mqtt.Client(
+            client_id=paths.client_id + f"_test_{keepalive}_{uuid.uuid4().hex[:6]}",
+            clean_session=True
+        )
         
-        connection_time = 0
-        disconnection_code = None
+        client.tls_set(
+            ca_certs=paths.ca_certs,
+            certfile=paths.certfile,
+            keyfile=paths.keyfile
+        )
         
-        def on_connect(client, userdata, flags, rc):
-            nonlocal connection_time
-            if rc == 0:
-                connection_time = time.time()
-                logger.info(f"  ✅ Conectado con keepalive {keepalive}s")
-            else:
-                logger.error(f"  ❌ Error conexión: {rc}")
+        client.on_connect = on_connect
+        client.on_disconnect = on_disconnect
         
-        def on_disconnect(client, userdata, rc):
-            nonlocal disconnection_code
-            disconnection_code = rc
-            if connection_time > 0:
-                duration = time.time() - connection_time
-                logger.info(f"  ⏱️ Duración conexión: {duration:.2f}s")
-            if rc != 0:
-                logger.warning(f"  ⚠️ Desconexión código: {rc}")
+        client.connect(paths.broker, 8883, keepalive)
+        client.loop_start()
         
+        # Monitorear hasta la desconexión o como máximo 10 segundos
+        if not done.wait(timeout=min(keepalive, 10)):
+            logger.info("  ✅ Conexión estable tras %ss (keepalive %ss)", min(keepalive, 10), keepalive)
+        
+        client.loop_stop()
+        client.disconnect()
+        
+    except Exception as e:
+        logger.error("  ❌ Error en prueba keepalive %s: %s", keepalive, e)
+    
+    return {
+        'keepalive': keepalive,
+        'connected': connection_time > 0,
+        'disconnection_code': disconnection_code
+    }
+
+def _certificate_expiry(cert_path):
+    """Fecha de expiración de un certificado (PEM o DER).
+    
+    Usa cryptography si está instalado (análisis en proceso); si no, recurre
+    al binario openssl.
+    """
+    if x509 is not None:
+        data = cert_path.read_bytes()
         try:
-            client = mqtt.Client(
-                client_id=config['client_id'] + f"_test_{keepalive}",
-                clean_session=True
-            )
-            
-            client.tls_set(
-                ca_certs=ca_certs,
-                certfile=certfile,
-                keyfile=keyfile
-            )
-            
-            client.on_connect = on_connect
-            client.on_disconnect = on_disconnect
-            
-            client.connect(config['broker'], 8883, keepalive)
-            client.loop_start()
-            
-            # Esperar y monitorear
-            time.sleep(10)
-            
-            client.loop_stop()
-            client.disconnect()
-            
-        except Exception as e:
-            logger.error(f"  ❌ Error en prueba keepalive {keepalive}: {e}")
+            cert = x509.load_pem_x509_certificate(data)
+        except ValueError:
+            cert = x509.load_der_x509_certificate(data)
+        # not_valid_after_utc existe desde cryptography 42
+        not_after = getattr(cert, 'not_valid_after_utc', None) or cert.not_valid_after
+        return not_after.isoformat()
+    
+    import subprocess
+    result = subprocess.run(
+        ['openssl', 'x509', '-in', str(cert_path), '-text', '-noout'],
+        capture_output=True, text=True, timeout=10
+    )
+    if result.returncode == 0:
+        # Extraer fecha de expiración
+        for line in result.stdout.split('\n'):
+            if 'Not After' in line:
+                return line.strip()
+    return None
 
 def analyze_certificates():
     """Analizar los certificados SSL"""
     logger.info("\n📜 Analizando certificados SSL...")
     
-    config = load_config()
-    cert_base = Path("src/mqtt/config")
+    paths = _cert_paths()
     
     certificates = {
-        'CA': cert_base / config['ca_crt'],
-        'Client Cert': cert_base / config['group_1_crt'],
-        'Client Key': cert_base / config['group_1_key']
+        'CA': Path(paths.ca_certs),
+        'Client Cert': Path(paths.certfile),
+        'Client Key': Path(paths.keyfile)
     }
     
     for name, cert_path in certificates.items():
         if cert_path.exists():
-            logger.info(f"  ✅ {name}: {cert_path} (existe)")
+            logger.info("  ✅ %s: %s (existe)", name, cert_path)
             
             # Analizar certificado si es .crt
             if cert_path.suffix == '.crt':
                 try:
-                    import subprocess
-                    result = subprocess.run(
-                        ['openssl', 'x509', '-in', str(cert_path), '-text', '-noout'],
-                        capture_output=True, text=True, timeout=10
-                    )
-                    if result.returncode == 0:
-                        # Extraer fecha de expiración
-                        for line in result.stdout.split('\n'):
-                            if 'Not After' in line:
-                                logger.info(f"    📅 Expira: {line.strip()}")
-                                break
+                    expiry = _certificate_expiry(cert_path)
+                    if expiry:
+                        logger.info("    📅 Expira: %s", expiry)
                     else:
-                        logger.warning(f"    ⚠️ No se pudo analizar con openssl")
+                        logger.warning("    ⚠️ No se pudo obtener la fecha de expiración")
                 except Exception as e:
-                    logger.warning(f"    ⚠️ Error analizando certificado: {e}")
+                    logger.warning("    ⚠️ Error analizando certificado: %s", e)
         else:
-            logger.error(f"  ❌ {name}: {cert_path} (NO EXISTE)")
+            logger.error("  ❌ %s: %s (NO EXISTE)", name, cert_path)
+
+# Recomendaciones del diagnóstico (texto constante, se une una sola vez)
+RECOMMENDATIONS_TEXT = "\n".join([
+    "1. PROBLEMA IDENTIFICADO: Código de desconexión 7 (Error de red/conexión)",
+    "   - La conexión SSL se establece correctamente",
+    "   - El servidor DicapuaIoT desconecta inmediatamente después de la conexión",
+    "",
+    "2. POSIBLES CAUSAS:",
+    "   a) Política del servidor que limita conexiones simultáneas",
+    "   b) Certificados expirados o no válidos para el cliente específico",
+    "   c) Configuración de keepalive incompatible",
+    "   d) Firewall o proxy intermedio que interfiere",
+    "",
+    "3. SOLUCIONES RECOMENDADAS:",
+    "   a) Verificar con el administrador de DicapuaIoT:",
+    "      - Estado del servidor y políticas de conexión",
+    "      - Validez de los certificados group_1",
+    "      - Límites de conexiones por cliente",
+    "",
+    "   b) Modificar configuración MQTT:",
+    "      - Aumentar keepalive a 300 segundos",
+    "      - Usar clean_session=False para sesiones persistentes",
+    "      - Implementar reconexión automática con backoff",
+    "",
+    "   c) Verificar conectividad de red:",
+    "      - Probar desde otra red/ubicación",
+    "      - Verificar configuración de proxy/firewall",
+    "      - Usar herramientas como telnet o nmap para probar puerto 8883",
+    "",
+    "4. CÓDIGO DE EJEMPLO PARA RECONEXIÓN ROBUSTA:",
+    "   - Implementar retry logic con exponential backoff",
+    "   - Usar threading para mantener conexión en background",
+    "   - Agregar heartbeat personalizado",
+    "",
+    "5. MONITOREO RECOMENDADO:",
+    "   - Log detallado de intentos de conexión",
+    "   - Métricas de tiempo de conexión",
+    "   - Alertas por desconexiones frecuentes"
+])
 
 def generate_recommendations():
     """Generar recomendaciones basadas en el análisis"""
     logger.info("\n💡 RECOMENDACIONES PARA RESOLVER EL PROBLEMA:")
     logger.info("=" * 60)
     
-    recommendations = [
-        "1. PROBLEMA IDENTIFICADO: Código de desconexión 7 (Error de red/conexión)",
-        "   - La conexión SSL se establece correctamente",
-        "   - El servidor DicapuaIoT desconecta inmediatamente después de la conexión",
-        "",
-        "2. POSIBLES CAUSAS:",
-        "   a) Política del servidor que limita conexiones simultáneas",
-        "   b) Certificados expirados o no válidos para el cliente específico",
-        "   c) Configuración de keepalive incompatible",
-        "   d) Firewall o proxy intermedio que interfiere",
-        "",
-        "3. SOLUCIONES RECOMENDADAS:",
-        "   a) Verificar con el administrador de DicapuaIoT:",
-        "      - Estado del servidor y políticas de conexión",
-        "      - Validez de los certificados group_1",
-        "      - Límites de conexiones por cliente",
-        "",
-        "   b) Modificar configuración MQTT:",
-        "      - Aumentar keepalive a 300 segundos",
-        "      - Usar clean_session=False para sesiones persistentes",
-        "      - Implementar reconexión automática con backoff",
-        "",
-        "   c) Verificar conectividad de red:",
-        "      - Probar desde otra red/ubicación",
-        "      - Verificar configuración de proxy/firewall",
-        "      - Usar herramientas como telnet o nmap para probar puerto 8883",
-        "",
-        "4. CÓDIGO DE EJEMPLO PARA RECONEXIÓN ROBUSTA:",
-        "   - Implementar retry logic con exponential backoff",
-        "   - Usar threading para mantener conexión en background",
-        "   - Agregar heartbeat personalizado",
-        "",
-        "5. MONITOREO RECOMENDADO:",
-        "   - Log detallado de intentos de conexión",
-        "   - Métricas de tiempo de conexión",
-        "   - Alertas por desconexiones frecuentes"
-    ]
-    
-    for rec in recommendations:
-        logger.info(rec)
+    logger.info("%s", RECOMMENDATIONS_TEXT)
 
 def main():
     """Función principal del reporte"""
     logger.info("🔍 REPORTE FINAL DE DIAGNÓSTICO MQTT DICAPUAIOT")
     logger.info("=" * 60)
-    logger.info(f"📅 Fecha: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("📅 Fecha: %s", datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
     
     try:
         # Analizar certificados
@@ -276,7 +427,7 @@ def main():
         logger.info("=" * 60)
         
     except Exception as e:
-        logger.error(f"❌ Error en diagnóstico: {e}")
+        logger.error("❌ Error en diagnóstico: %s", e)
         import traceback
         logger.error(traceback.format_exc())
 
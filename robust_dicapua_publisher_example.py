@@ -1,6 +1,5 @@
 
 # Ejemplo de DicapuaPublisher robusto con reconexión automática
-import time
 import threading
 import paho.mqtt.client as mqtt
 from typing import Optional
@@ -10,15 +9,14 @@ class RobustDicapuaPublisher:
         self.config = config
         self.client: Optional[mqtt.Client] = None
         self.connected = False
-        self.reconnect_thread = None
-        self.should_reconnect = True
-        self.reconnect_delay = 1  # Inicial
+        self.min_reconnect_delay = 1  # Inicial
         self.max_reconnect_delay = 60
+        self.publish_timeout = 5  # Espera máxima de confirmación (PUBACK) en segundos
+        self._stop_event = threading.Event()  # Interrumpe las esperas de reintento al parar
         
     def on_connect(self, client, userdata, flags, rc):
         if rc == 0:
             self.connected = True
-            self.reconnect_delay = 1  # Reset delay
             print("✅ Conectado a DicapuaIoT")
         else:
             print(f"❌ Error conexión: {rc}")
@@ -26,37 +24,11 @@ class RobustDicapuaPublisher:
     def on_disconnect(self, client, userdata, rc):
         self.connected = False
         if rc != 0:
-            print(f"⚠️ Desconexión inesperada: {rc}")
-            if self.should_reconnect:
-                self._schedule_reconnect()
-                
-    def _schedule_reconnect(self):
-        if self.reconnect_thread and self.reconnect_thread.is_alive():
-            return
-            
-        def reconnect_worker():
-            while self.should_reconnect and not self.connected:
-                try:
-                    print(f"🔄 Reintentando conexión en {self.reconnect_delay}s...")
-                    time.sleep(self.reconnect_delay)
-                    
-                    if self.client:
-                        self.client.reconnect()
-                        
-                    # Exponential backoff
-                    self.reconnect_delay = min(
-                        self.reconnect_delay * 2, 
-                        self.max_reconnect_delay
-                    )
-                    
-                except Exception as e:
-                    print(f"❌ Error en reconexión: {e}")
-                    
-        self.reconnect_thread = threading.Thread(target=reconnect_worker)
-        self.reconnect_thread.daemon = True
-        self.reconnect_thread.start()
+            # El hilo de loop_start() de paho reconecta solo con backoff exponencial
+            print(f"⚠️ Desconexión inesperada: {rc} (reconexión automática)")
         
     def connect(self):
+        self._stop_event.clear()
         self.client = mqtt.Client(
             client_id=self.config.client_id + "_robust",
             clean_session=False  # Sesión persistente
@@ -69,6 +41,12 @@ class RobustDicapuaPublisher:
             keyfile=self.config.certs["keyfile"]
         )
         
+        # Reconexión automática de paho con backoff exponencial
+        self.client.reconnect_delay_set(
+            min_delay=self.min_reconnect_delay,
+            max_delay=self.max_reconnect_delay
+        )
+        
         # Callbacks
         self.client.on_connect = self.on_connect
         self.client.on_disconnect = self.on_disconnect
@@ -77,23 +55,39 @@ class RobustDicapuaPublisher:
         self.client.connect(self.config.broker, 8883, 300)
         self.client.loop_start()
         
-    def publish_with_retry(self, topic, payload, retries=3):
+    def publish_with_retry(self, topic, payload, retries=3, qos=1):
+        info = None
         for attempt in range(retries):
             if self.connected:
                 try:
-                    result = self.client.publish(topic, payload)
-                    if result.rc == 0:
-                        return True
-                except Exception as e:
+                    # Publicar de nuevo solo tras un fallo real; si el mensaje QoS 1 sigue
+                    # en vuelo se espera al mismo MQTTMessageInfo para no duplicarlo
+                    if info is None or info.rc != mqtt.MQTT_ERR_SUCCESS:
+                        info = self.client.publish(topic, payload, qos=qos)
+                    if qos == 0:
+                        # Sin confirmación: basta con que paho lo haya encolado
+                        if info.rc == mqtt.MQTT_ERR_SUCCESS:
+                            return True
+                    else:
+                        # Esperar la confirmación real del broker (PUBACK)
+                        info.wait_for_publish(timeout=self.publish_timeout)
+                        if info.is_published():
+                            return True
+                except Exception as e:  # RuntimeError/ValueError si no se pudo encolar
                     print(f"❌ Error publicando (intento {attempt+1}): {e}")
+                    info = None
+            # Desconectado: con clean_session=False paho reenvía el mensaje en vuelo
+            # (DUP) al reconectar, así que solo se espera y se conserva el mismo info
             
             if attempt < retries - 1:
-                time.sleep(2 ** attempt)  # Backoff
+                # Backoff interrumpible por stop()
+                if self._stop_event.wait(2 ** attempt):
+                    break
                 
         return False
         
     def stop(self):
-        self.should_reconnect = False
+        self._stop_event.set()
         if self.client:
             self.client.loop_stop()
             self.client.disconnect()
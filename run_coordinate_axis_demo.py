@@ -3,24 +3,50 @@
 
 Este script muestra cómo usar el CoordinateAxisDrawer junto con las detecciones
 existentes para añadir un sistema de coordenadas visual a los frames.
+
+Uso:
+    python run_coordinate_axis_demo.py            # YOLO en todos los frames
+    python run_coordinate_axis_demo.py --skip 2   # YOLO cada 2 frames, flujo óptico entre medias
+    python run_coordinate_axis_demo.py --static   # Demo con imagen estática
 """
 
 import cv2
 import numpy as np
 import sys
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Agregar el directorio src al path
 sys.path.append(str(Path(__file__).parent / "src"))
 
-from vision.detector import YOLOPoseDetector
-from postprocess.coordinate_axis_drawer import CoordinateAxisDrawer, add_coordinate_system_to_frame
-from postprocess.distance_calculator import DistanceCalculator
-from postprocess.marker_distance_calculator import MarkerDistanceCalculator
+from pipeline import RealtimePipeline
+from vision.camera import open_camera, limit_opencv_threads, FrameGrabber
+from vision.tracker import KeypointFlowTracker
+from vision.async_pipeline import run_async_pipeline
+from vision.display import create_display
+from postprocess.coordinate_axis_drawer import add_coordinate_system_to_frame, COLOR_SCHEMES
+from postprocess.text_banner import TextBanner
 from utils.helpers import ConfigManager
 
-def main():
-    """Función principal del demo."""
+# Cada cuántos frames se actualiza el texto del contador
+INFO_REFRESH_FRAMES = 10
+
+# Dibujar las superposiciones con la T-API (OpenCL) si hay GPU disponible
+USE_OPENCL = cv2.ocl.haveOpenCL()
+
+def main(use_highgui: bool = False, pin_cores: Optional[int] = None, skip: int = 1):
+    """
+    Función principal del demo.
+
+    Args:
+        use_highgui: Mostrar con cv2.imshow en lugar de la ventana OpenGL
+        pin_cores: Núcleos a los que fijar el proceso (None para no fijar)
+        skip: Ejecutar YOLO cada `skip` frames y propagar keypoints con flujo óptico entre medias
+    """
+    # Sin paralelismo interno de OpenCV: el pipeline ya reparte el trabajo en hilos
+    limit_opencv_threads(max_cores=pin_cores)
+    
     print("🎯 Demo del Sistema de Coordenadas")
     print("Controles:")
     print("  'q' - Salir")
@@ -37,23 +63,28 @@ def main():
     # Configuración
     config_path = "config/config.yaml"
     
+    # Hilo para codificar y guardar JPEG sin bloquear el bucle de captura
+    saver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="imwrite")
+    
+    # Ventana OpenGL (o HighGUI con --highgui); se usa siempre desde el hilo principal
+    display = create_display("Demo Sistema de Coordenadas", use_highgui)
+    
+    if USE_OPENCL:
+        cv2.ocl.setUseOpenCL(True)
+        print("⚡ OpenCL disponible: superposiciones en GPU (cv2.UMat)")
+    
     try:
-        # Inicializar componentes
-        detector = YOLOPoseDetector(config_path)
-        detector.load_model()
-        
-        distance_calculator = DistanceCalculator(pixels_per_cm=10.0)
-        marker_calculator = MarkerDistanceCalculator(pixels_per_cm=10.0)
+        # Inicializar componentes (detector, calculadores y sistema de coordenadas)
+        pipeline = RealtimePipeline(config_path)
+        detector = pipeline.detector
+        coord_drawer = pipeline.coord_drawer
         
-        # Inicializar dibujador de coordenadas
-        coord_drawer = CoordinateAxisDrawer(
-            position="bottom_right",
-            size=80,
-            margin=30
-        )
+        if not pipeline.model_loaded:
+            print("❌ Error: No se pudo cargar el modelo YOLO")
+            return
         
         # Inicializar cámara
-        cap = cv2.VideoCapture(0)  # Usar cámara por defecto
+        cap, _ = open_camera(0)  # Usar cámara por defecto (buffer de 1 frame)
         
         if not cap.isOpened():
             print("❌ Error: No se pudo abrir la cámara")
@@ -66,95 +97,91 @@ def main():
         
         # Variables para el demo
         color_mode = 0
-        color_schemes = [
-            {"x_color": (0, 0, 255), "z_color": (0, 255, 0), "origin_color": (255, 255, 255)},  # Rojo/Verde
-            {"x_color": (255, 0, 0), "z_color": (0, 255, 255), "origin_color": (255, 255, 255)},  # Azul/Amarillo
-            {"x_color": (255, 0, 255), "z_color": (0, 255, 255), "origin_color": (255, 255, 255)},  # Magenta/Cian
-            {"x_color": (128, 0, 255), "z_color": (0, 255, 128), "origin_color": (255, 255, 255)}   # Púrpura/Verde lima
-        ]
         
         frame_counter = 0
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("❌ Error: No se pudo leer el frame")
-                break
-            
+        # Textos prerenderizados: el contador se refresca cada INFO_REFRESH_FRAMES
+        # frames y la información de los ejes solo cuando cambia con una tecla
+        info_banner = TextBanner(font_scale=0.7, color=(255, 255, 255), thickness=2)
+        coord_info_banner = TextBanner(font_scale=0.5, color=(200, 200, 200), thickness=1)
+        
+        def update_coord_info():
+            coord_info_banner.set_text(f"Posicion: {coord_drawer.position} | Tamaño: {coord_drawer.size}px")
+        
+        update_coord_info()
+        
+        def draw_frame(frame, detections):
+            """Dibuja y muestra un frame ya detectado; devuelve False para salir."""
+            nonlocal color_mode, frame_counter
             frame_counter += 1
             
             try:
-                # Realizar detecciones
-                detections = detector.detect(frame)
-                
-                # Dibujar detecciones básicas
-                processed_frame = detector.draw_detections(frame, detections)
-                
-                # Añadir cálculos de distancia si hay detecciones
-                if detections:
-                    # Distancia pulsador-pórtico
-                    processed_frame = distance_calculator.draw_distance_on_frame(
-                        processed_frame, detections, show_distance=True, show_line=True
-                    )
-                    
-                    # Distancia del marcador
-                    processed_frame = marker_calculator.draw_distance_on_frame(
-                        processed_frame, detections, show_distance=True, show_line=True
-                    )
-                
-                # Añadir sistema de coordenadas
-                processed_frame = coord_drawer.draw_coordinate_system(processed_frame)
+                # Detecciones, distancias y sistema de coordenadas (sobre UMat si OpenCL está
+                # disponible). El frame capturado solo se usa aquí, así que se dibuja in-place
+                processed_frame = pipeline.process(frame, detections, draw_detections=True,
+                                                   use_opencl=USE_OPENCL)
                 
                 # Añadir información del sistema
-                info_text = f"Frame: {frame_counter} | Detecciones: {len(detections) if detections else 0}"
-                cv2.putText(processed_frame, info_text, (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                if (frame_counter - 1) % INFO_REFRESH_FRAMES == 0:
+                    info_banner.set_text(f"Frame: {frame_counter} | Detecciones: {len(detections) if detections else 0}")
+                info_banner.draw(processed_frame, (10, 30))
                 
                 # Información del sistema de coordenadas
-                coord_info = f"Posicion: {coord_drawer.position} | Tamaño: {coord_drawer.size}px"
-                cv2.putText(processed_frame, coord_info, (10, 60),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+                coord_info_banner.draw(processed_frame, (10, 60))
                 
                 # Mostrar frame
-                cv2.imshow("Demo Sistema de Coordenadas", processed_frame)
+                display.show(processed_frame)
                 
                 # Manejar teclas
-                key = cv2.waitKey(1) & 0xFF
+                key = display.poll_key()
                 
                 if key == ord('q'):
-                    break
+                    return False
                 elif key == ord('1'):
                     coord_drawer.set_position("bottom_right")
+                    update_coord_info()
                     print("📍 Posición: Esquina inferior derecha")
                 elif key == ord('2'):
                     coord_drawer.set_position("bottom_left")
+                    update_coord_info()
                     print("📍 Posición: Esquina inferior izquierda")
                 elif key == ord('3'):
                     coord_drawer.set_position("top_right")
+                    update_coord_info()
                     print("📍 Posición: Esquina superior derecha")
                 elif key == ord('4'):
                     coord_drawer.set_position("top_left")
+                    update_coord_info()
                     print("📍 Posición: Esquina superior izquierda")
                 elif key == ord('+') or key == ord('='):
                     new_size = min(coord_drawer.size + 10, 150)
                     coord_drawer.set_size(new_size)
+                    update_coord_info()
                     print(f"📏 Tamaño aumentado: {new_size}px")
                 elif key == ord('-'):
                     new_size = max(coord_drawer.size - 10, 30)
                     coord_drawer.set_size(new_size)
+                    update_coord_info()
                     print(f"📏 Tamaño reducido: {new_size}px")
                 elif key == ord('c'):
-                    color_mode = (color_mode + 1) % len(color_schemes)
-                    coord_drawer.set_colors(**color_schemes[color_mode])
+                    color_mode = (color_mode + 1) % len(COLOR_SCHEMES)
+                    coord_drawer.set_colors(**COLOR_SCHEMES[color_mode])
                     print(f"🎨 Esquema de colores cambiado: {color_mode + 1}")
                 elif key == ord('s'):
                     filename = f"coordinate_demo_frame_{frame_counter}.jpg"
-                    cv2.imwrite(filename, processed_frame)
-                    print(f"💾 Frame guardado: {filename}")
+                    # Copia: el buffer puede reutilizarse en el siguiente frame
+                    saver.submit(cv2.imwrite, filename, processed_frame.copy())
+                    print(f"💾 Guardando frame: {filename}")
                 
             except Exception as e:
                 print(f"⚠️ Error procesando frame: {e}")
-                continue
+            
+            return True
+        
+        # Captura, detección y dibujo solapados en un pipeline asyncio
+        detect_fn = KeypointFlowTracker(detector.get_detections_data, skip=skip)
+        grabber = FrameGrabber(cap).start()
+        run_async_pipeline(grabber.get_latest, detect_fn, draw_frame)
         
     except KeyboardInterrupt:
         print("\n🛑 Interrumpido por el usuario")
@@ -162,8 +189,12 @@ def main():
         print(f"❌ Error: {e}")
     finally:
         # Limpiar recursos
+        if 'grabber' in locals():
+            grabber.stop()
         if 'cap' in locals():
             cap.release()
+        saver.shutdown(wait=True)
+        display.close()
         cv2.destroyAllWindows()
         print("🧹 Recursos liberados")
 
@@ -181,31 +212,31 @@ def demo_static_image():
     cv2.putText(test_image, "Imagen de Prueba", (220, 400),
                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
     
-    # Probar diferentes posiciones
+    # Probar las cuatro posiciones en un mosaico 2x2 (una ventana y una imagen)
     positions = ["bottom_right", "bottom_left", "top_right", "top_left"]
+    canvas = np.tile(test_image, (2, 2, 1))
     
     for i, position in enumerate(positions):
-        # Crear imagen con sistema de coordenadas
-        result = add_coordinate_system_to_frame(
-            test_image.copy(), 
-            position=position, 
-            size=60, 
-            margin=20
-        )
+        # Cuadrante del mosaico (vista sobre el lienzo, sin copias)
+        row, col = divmod(i, 2)
+        quadrant = canvas[row * height:(row + 1) * height, col * width:(col + 1) * width]
+        
+        # Añadir sistema de coordenadas
+        add_coordinate_system_to_frame(quadrant, position=position, size=60, margin=20)
         
         # Añadir título
         title = f"Posicion: {position}"
-        cv2.putText(result, title, (10, 30),
+        cv2.putText(quadrant, title, (10, 30),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-        
-        # Mostrar y guardar
-        cv2.imshow(f"Demo Estático - {position}", result)
-        cv2.imwrite(f"demo_static_{position}.jpg", result)
-        
-        print(f"✅ Imagen guardada: demo_static_{position}.jpg")
-        
-        # Esperar tecla para continuar
-        cv2.waitKey(2000)  # 2 segundos
+    
+    # Mostrar y guardar
+    cv2.imshow("Demo Estático - Posiciones", canvas)
+    cv2.imwrite("demo_static_all.jpg", canvas)
+    
+    print("✅ Imagen guardada: demo_static_all.jpg")
+    
+    # Esperar tecla para continuar
+    cv2.waitKey(2000)  # 2 segundos
     
     cv2.destroyAllWindows()
     print("🎯 Demo estático completado")
@@ -216,10 +247,16 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Demo del Sistema de Coordenadas")
     parser.add_argument("--static", action="store_true", 
                        help="Ejecutar demo con imagen estática")
+    parser.add_argument("--highgui", action="store_true",
+                       help="Mostrar con cv2.imshow en lugar de la ventana OpenGL")
+    parser.add_argument("--skip", type=int, default=1,
+                       help="Ejecutar YOLO cada N frames y propagar keypoints con flujo óptico entre medias")
+    parser.add_argument("--pin-cores", type=int, default=None,
+                       help="Fijar el proceso a los primeros N núcleos (Linux; por defecto sin fijar)")
     
     args = parser.parse_args()
     
     if args.static:
         demo_static_image()
     else:
-        main()
\ No newline at end of file
+        main(use_highgui=args.highgui, pin_cores=args.pin_cores, skip=args.skip)
\ No newline at end of file
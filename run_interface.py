@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 """Script de lanzamiento para la interfaz interactiva de detección."""
 
+import os
 import sys
 from pathlib import Path
 
+# Pool de OpenMP/MKL de torch a la mitad de los núcleos (antes de importar torch): el
+# resto queda para los hilos de captura, dibujo y Tk
+_num_threads = str(max(1, (os.cpu_count() or 4) // 2))
+os.environ.setdefault("OMP_NUM_THREADS", _num_threads)
+os.environ.setdefault("MKL_NUM_THREADS", _num_threads)
+
 # Agregar el directorio src al path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
@@ -1,17 +1,48 @@
 #!/usr/bin/env python3
-"""Script para ejecutar detección de pose en tiempo real."""
+"""Script para ejecutar detección de pose en tiempo real.
 
-from src.vision.detector import YOLOPoseDetector
+Uso:
+    python run_pose_detection.py            # Usa models/best_b1_int8.engine, models/best_b1_fp16.engine o models/best.pt
+    python run_pose_detection.py --export   # Exporta antes a TensorRT FP16 (una sola vez)
+    python run_pose_detection.py --batch-size 4   # Inferencia por lotes de 4 frames
+"""
+
+import argparse
+
+from src.vision.camera import limit_opencv_threads
+from src.vision.detector import YOLOPoseDetector, export_tensorrt_engine, preferred_model_path
+
+MODEL_PATH = "models/best.pt"
 
 def main():
     """Ejecuta la detección de pose en tiempo real."""
+    parser = argparse.ArgumentParser(description="Detección de pose en tiempo real")
+    parser.add_argument("--export", action="store_true",
+                        help="Exportar el modelo a un engine TensorRT FP16 antes de ejecutar")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Frames por llamada al modelo (1 = sin lotes)")
+    parser.add_argument("--pin-cores", type=int, default=None,
+                        help="Fijar el proceso a los primeros N núcleos (Linux; por defecto sin fijar)")
+    args = parser.parse_args()
+    
+    # Sin paralelismo interno de OpenCV para las primitivas de dibujo por frame
+    limit_opencv_threads(max_cores=args.pin_cores)
+    
+    if args.export:
+        export_tensorrt_engine(MODEL_PATH, batch=args.batch_size)
+    
+    # Preferir los engines TensorRT (INT8 y luego FP16) si ya fueron exportados
+    model_path = preferred_model_path(MODEL_PATH, args.batch_size)
+    if model_path == MODEL_PATH:
+        model_path = None  # Usar el modelo de la configuración
+    
     print("🎯 Iniciando detección de pose en tiempo real...")
     
     # Crear detector
-    detector = YOLOPoseDetector()
+    detector = YOLOPoseDetector(model_path=model_path)
     
     # Ejecutar detección en tiempo real
-    detector.run_real_time_detection()
+    detector.run_real_time_detection(batch_size=args.batch_size)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,6 +5,8 @@ Calcula distancias en tiempo real entre objetos detectados.
 
 Uso:
     python run_postprocess.py
+    python run_postprocess.py --export   # Exporta antes el modelo a TensorRT FP16 (una sola vez)
+    python run_postprocess.py --batch-size 4   # Inferencia por lotes de 4 frames
     
 Controles:
     - 'q': Salir
@@ -14,16 +16,33 @@ Controles:
 
 import sys
 import os
+import argparse
 
 # Agregar el directorio src al path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from postprocess.video_processor import VideoPostProcessor
+from vision.camera import limit_opencv_threads
+from vision.detector import export_tensorrt_engine, preferred_model_path
+
+MODEL_PATH = "models/best.pt"
 
 def main():
     """
     Función principal del postprocesamiento.
     """
+    parser = argparse.ArgumentParser(description="Postprocesamiento de detecciones")
+    parser.add_argument("--export", action="store_true",
+                        help="Exportar el modelo a un engine TensorRT FP16 antes de ejecutar")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Frames por llamada al modelo (1 = sin lotes)")
+    parser.add_argument("--pin-cores", type=int, default=None,
+                        help="Fijar el proceso a los primeros N núcleos (Linux; por defecto sin fijar)")
+    args = parser.parse_args()
+    
+    # Sin paralelismo interno de OpenCV para las primitivas de dibujo por frame
+    limit_opencv_threads(max_cores=args.pin_cores)
+    
     print("=" * 60)
     print("    POSTPROCESAMIENTO DE DETECCIONES - CÁLCULO DE DISTANCIAS")
     print("=" * 60)
@@ -41,10 +60,17 @@ def main():
     print("=" * 60)
     
     try:
+        if args.export:
+            export_tensorrt_engine(MODEL_PATH, batch=args.batch_size)
+        
+        # Preferir los engines TensorRT (INT8 y luego FP16) si ya fueron exportados
+        model_path = preferred_model_path(MODEL_PATH, args.batch_size)
+        
         # Crear procesador con configuración por defecto
         processor = VideoPostProcessor(
-            model_path="models/best.pt",
-            pixels_per_cm=10.0  # Factor inicial, se puede calibrar en tiempo real
+            model_path=model_path,
+            pixels_per_cm=10.0,  # Factor inicial, se puede calibrar en tiempo real
+            batch_size=args.batch_size
         )
         
         # Ejecutar procesamiento en tiempo real
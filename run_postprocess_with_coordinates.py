@@ -4,8 +4,13 @@
 Este script demuestra cómo usar el CoordinateAxisDrawer junto con
 los calculadores de distancia existentes para añadir un sistema de
 coordenadas visual a las detecciones.
+
+Uso:
+    python run_postprocess_with_coordinates.py            # YOLO en todos los frames
+    python run_postprocess_with_coordinates.py --skip 2   # YOLO cada 2 frames, flujo óptico entre medias
 """
 
+import argparse
 import cv2
 import sys
 from pathlib import Path
@@ -15,27 +20,47 @@ src_path = str(Path(__file__).parent / "src")
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from vision.detector import YOLOPoseDetector
-from postprocess.distance_calculator import DistanceCalculator
-from postprocess.marker_distance_calculator import MarkerDistanceCalculator
-from postprocess.coordinate_axis_drawer import CoordinateAxisDrawer
+from pipeline import RealtimePipeline
+from vision.tracker import KeypointFlowTracker
+from vision.camera import open_camera, limit_opencv_threads, FrameGrabber
+from vision.async_pipeline import run_async_pipeline
+from vision.display import create_display
+from postprocess.text_banner import TextBanner
+
+# Dibujar las superposiciones con la T-API (OpenCL) si hay GPU disponible
+USE_OPENCL = cv2.ocl.haveOpenCL()
 
 def main():
     """Función principal del script."""
+    parser = argparse.ArgumentParser(description="Postprocesamiento con sistema de coordenadas")
+    parser.add_argument("--skip", type=int, default=1,
+                        help="Ejecutar YOLO cada N frames y propagar keypoints con flujo óptico entre medias")
+    parser.add_argument("--highgui", action="store_true",
+                        help="Mostrar con cv2.imshow en lugar de la ventana OpenGL")
+    parser.add_argument("--pin-cores", type=int, default=None,
+                        help="Fijar el proceso a los primeros N núcleos (Linux; por defecto sin fijar)")
+    args = parser.parse_args()
+    
+    # Sin paralelismo interno de OpenCV: el pipeline ya reparte el trabajo en hilos
+    limit_opencv_threads(max_cores=args.pin_cores)
+    
     print("🚀 Iniciando postprocesamiento con sistema de coordenadas...")
     
-    # Inicializar componentes
-    detector = YOLOPoseDetector("config/config.yaml")
-    distance_calc = DistanceCalculator(pixels_per_cm=10.0)
-    marker_calc = MarkerDistanceCalculator(pixels_per_cm=10.0)
-    coord_drawer = CoordinateAxisDrawer(position="bottom_right", size=80, margin=30)
+    if USE_OPENCL:
+        cv2.ocl.setUseOpenCL(True)
+        print("⚡ OpenCL disponible: superposiciones en GPU (cv2.UMat)")
     
-    # Cargar modelo
-    detector.load_model()
-    print("✅ Modelo YOLO cargado")
+    # Inicializar componentes (detector, calculadores y sistema de coordenadas)
+    pipeline = RealtimePipeline("config/config.yaml")
+    detector = pipeline.detector
+    coord_drawer = pipeline.coord_drawer
+    
+    if not pipeline.model_loaded:
+        print("❌ Error: No se pudo cargar el modelo YOLO")
+        return
     
     # Configurar captura de video
-    cap = cv2.VideoCapture(0)  # Usar cámara por defecto
+    cap, _ = open_camera(0)  # Usar cámara por defecto (buffer de 1 frame)
     
     if not cap.isOpened():
         print("❌ Error: No se pudo abrir la cámara")
@@ -47,62 +72,63 @@ def main():
     positions = ["bottom_right", "bottom_left", "top_right", "top_left"]
     current_pos_idx = 0
     
+    # Textos prerenderizados (solo se regeneran cuando cambia su contenido)
+    info_banner = TextBanner(font_scale=0.7, color=(255, 255, 255), thickness=2)
+    instructions_banner = TextBanner(font_scale=0.5, color=(200, 200, 200), thickness=1)
+    instructions_banner.set_text("Presiona 'q': salir | 'p': cambiar posición ejes")
+    last_info = None
+    
+    def draw_frame(frame, detections):
+        """Aplica el postprocesamiento y muestra el frame; devuelve False para salir."""
+        nonlocal current_pos_idx, last_info
+        
+        # Distancias y sistema de coordenadas (sobre UMat si OpenCL está disponible). El
+        # frame capturado ya no se usa en ninguna otra etapa, así que se dibuja in-place
+        processed_frame = pipeline.process(frame, detections, use_opencl=USE_OPENCL)
+        
+        # Añadir información en pantalla
+        info = (len(detections), coord_drawer.position)
+        if info != last_info:
+            info_banner.set_text(f"Detecciones: {info[0]} | Posición ejes: {info[1]}")
+            last_info = info
+        info_banner.draw(processed_frame, (10, 30))
+        
+        # Instrucciones
+        instructions_banner.draw(processed_frame, (10, processed_frame.shape[0] - 10))
+        
+        # Mostrar frame
+        display.show(processed_frame)
+        
+        # Manejar teclas
+        key = display.poll_key()
+        if key == ord('q'):
+            return False
+        elif key == ord('p'):
+            # Cambiar posición del sistema de coordenadas
+            current_pos_idx = (current_pos_idx + 1) % len(positions)
+            new_position = positions[current_pos_idx]
+            coord_drawer.set_position(new_position)
+            print(f"🔄 Sistema de coordenadas movido a: {new_position}")
+        return True
+    
+    # Ventana OpenGL (o HighGUI con --highgui); se usa siempre desde el hilo principal
+    display = create_display("Postprocesamiento con Sistema de Coordenadas", args.highgui)
+    
     try:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("❌ Error al capturar frame")
-                break
-            
-            # Realizar detección
-            detections = detector.get_detections_data(frame)
-            
-            # Aplicar postprocesamiento
-            processed_frame = frame.copy()
-            
-            # 1. Dibujar distancias pulsador-pórtico
-            processed_frame = distance_calc.draw_distance_on_frame(
-                processed_frame, detections, show_distance=True, show_line=True
-            )
-            
-            # 2. Dibujar distancias del marcador
-            processed_frame = marker_calc.draw_distance_on_frame(
-                processed_frame, detections, show_distance=True, show_line=True
-            )
-            
-            # 3. Añadir sistema de coordenadas
-            processed_frame = coord_drawer.draw_coordinate_system(processed_frame)
-            
-            # Añadir información en pantalla
-            info_text = f"Detecciones: {len(detections)} | Posición ejes: {coord_drawer.position}"
-            cv2.putText(processed_frame, info_text, (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            
-            # Instrucciones
-            instructions = "Presiona 'q': salir | 'p': cambiar posición ejes"
-            cv2.putText(processed_frame, instructions, (10, processed_frame.shape[0] - 10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-            
-            # Mostrar frame
-            cv2.imshow("Postprocesamiento con Sistema de Coordenadas", processed_frame)
-            
-            # Manejar teclas
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                break
-            elif key == ord('p'):
-                # Cambiar posición del sistema de coordenadas
-                current_pos_idx = (current_pos_idx + 1) % len(positions)
-                new_position = positions[current_pos_idx]
-                coord_drawer.set_position(new_position)
-                print(f"🔄 Sistema de coordenadas movido a: {new_position}")
+        # Captura, detección y dibujo solapados en un pipeline asyncio
+        detect_fn = KeypointFlowTracker(detector.get_detections_data, skip=args.skip)
+        grabber = FrameGrabber(cap).start()
+        run_async_pipeline(grabber.get_latest, detect_fn, draw_frame)
     
     except KeyboardInterrupt:
         print("\n⏹️ Interrumpido por el usuario")
     
     finally:
         # Limpiar recursos
+        if 'grabber' in locals():
+            grabber.stop()
         cap.release()
+        display.close()
         cv2.destroyAllWindows()
         print("🧹 Recursos liberados")
 
@@ -7,27 +7,424 @@ from PIL import Image, ImageTk
 import numpy as np
 import threading
 import time
+import queue
+import math
+from functools import partial, lru_cache
 from pathlib import Path
 import sys
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-import collections
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
 from datetime import datetime
 
 # Agregar el directorio src al path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from vision.detector import YOLOPoseDetector
-from utils.helpers import ConfigManager, Logger
-from utils.i18n import get_i18n, t
+from vision.camera import configure_low_latency_capture, create_capture, FrameGrabber, limit_opencv_threads
+from vision.tracker import FrameDiffGate
+from utils.helpers import ConfigManager, Logger, RingBuffer
+from utils.i18n import get_i18n
 from postprocess.distance_calculator import DistanceCalculator
 from postprocess.marker_distance_calculator import MarkerDistanceCalculator
 from postprocess.coordinate_axis_drawer import CoordinateAxisDrawer
+from postprocess._fastfilters import warmup as warmup_fast_filters
+
+# Lado mayor del frame que recibe YOLO (tamaño de entrada del modelo)
+INFERENCE_SIZE = 640
+
+# Frames máximos por llamada al modelo (también el lote de los modelos exportados)
+INFER_BATCH = 4
+
+# Frames por segundo máximos que se envían a cada canvas de video
+DISPLAY_FPS = 30
+
+# Actualizaciones por segundo del texto de información de detecciones
+INFO_UPDATE_HZ = 3
+
+# Geometría de la vista de posición virtual (cm): línea de referencia y pórtico (keypoint D)
+VIRTUAL_LINE_LENGTH_CM = 30
+VIRTUAL_PORTICO_X_CM = 15
+
+# Intervalo mínimo entre redibujados de la posición virtual (~30 FPS)
+VIRTUAL_REDRAW_MS = 33
+
+
+class _InferWorker(threading.Thread):
+    """Hilo único de inferencia compartido por detección y postprocesamiento.
+    
+    Agrupa los frames que llegan casi a la vez desde los distintos bucles en
+    una sola llamada al modelo, en lugar de repartir la GPU entre llamadas de
+    lote 1 que compiten entre sí.
+    """
+    
+    def __init__(self, detector, max_batch=INFER_BATCH, max_wait=0.002, max_size=INFERENCE_SIZE):
+        """
+        Args:
+            detector: YOLOPoseDetector con el modelo cargado
+            max_batch: Número máximo de frames por llamada al modelo
+            max_wait: Segundos a esperar más frames tras recibir el primero
+            max_size: Lado mayor del frame que recibe YOLO
+        """
+        super().__init__(name="InferWorker", daemon=True)
+        self.detector = detector
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_size = max_size
+        self._requests = queue.Queue()
+    
+    def submit(self, frame):
+        """Encola un frame y espera a sus detecciones (llamar desde los hilos de trabajo)."""
+        done = threading.Event()
+        slot = []
+        self._requests.put((frame, done, slot))
+        done.wait()
+        return slot[0]
+    
+    def run(self):
+        """Bucle del hilo: junta hasta max_batch peticiones y las resuelve en un lote."""
+        running = True
+        while running:
+            request = self._requests.get()
+            if request is None:
+                return
+            
+            batch = [request]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    running = False
+                    break
+                batch.append(request)
+            
+            results = self.detector.get_detections_data_batch([frame for frame, _, _ in batch],
+                                                              max_size=self.max_size)
+            for (_, done, slot), detections in zip(batch, results):
+                slot.append(detections)
+                done.set()
+    
+    def stop(self):
+        """Termina el hilo tras resolver las peticiones pendientes."""
+        self._requests.put(None)
+
+
+class _FilePacer:
+    """Reproduce archivos de video a su FPS nominal aunque la inferencia vaya más lenta.
+    
+    Mide con una media móvil exponencial el tiempo de cada iteración y, si supera
+    el intervalo entre frames, pide al FrameGrabber saltar (sin decodificar) los
+    frames necesarios; si va adelantado, espera lo que sobra.
+    """
+    
+    def __init__(self, grabber, fps, alpha=0.2):
+        """
+        Args:
+            grabber: FrameGrabber en modo keep_all
+            fps: FPS nominal del archivo
+            alpha: Peso de la última medida en la media móvil
+        """
+        self.grabber = grabber
+        self.frame_interval = 1.0 / fps
+        self.alpha = alpha
+        self.process_time = 0.0
+        self.last_tick = time.perf_counter()
+    
+    def tick(self):
+        """Llamar una vez por frame procesado, al final de la iteración."""
+        elapsed = time.perf_counter() - self.last_tick
+        self.process_time += self.alpha * (elapsed - self.process_time)
+        
+        # Avanzar tantos frames como intervalos ocupa el procesamiento
+        advance = max(1, math.ceil(self.process_time / self.frame_interval))
+        self.grabber.skip_frames = advance - 1
+        
+        remaining = advance * self.frame_interval - elapsed
+        if remaining > 0:
+            time.sleep(remaining)
+        self.last_tick = time.perf_counter()
+
+
+class _SingleSlot:
+    """Hueco de un elemento entre dos etapas del pipeline.
+    
+    put() sustituye el elemento pendiente, de modo que la etapa siguiente
+    recibe siempre el más reciente y una etapa lenta no acumula retraso.
+    """
+    
+    def __init__(self):
+        self._item = None
+        self._has_item = False
+        self._closed = False
+        self._cond = threading.Condition()
+    
+    def put(self, item):
+        """Deja un elemento (descartando el pendiente); False si el hueco está cerrado."""
+        with self._cond:
+            if self._closed:
+                return False
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+            return True
+    
+    def get(self):
+        """Espera el siguiente elemento; devuelve None si el hueco se cerró."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._has_item or self._closed)
+            if not self._has_item:
+                return None
+            item = self._item
+            self._item = None
+            self._has_item = False
+            return item
+    
+    def close(self):
+        """Cierra el hueco y despierta a la etapa que espera en get()."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class _UiBatcher:
+    """Agrupa las actualizaciones de Tk pedidas desde otros hilos en un solo callback.
+    
+    Cada post() guarda la última llamada pendiente para esa función (las
+    anteriores sin ejecutar se descartan) y solo se programa un after_idle
+    mientras haya un lote pendiente, así el bucle de Tk aplica como mucho un lote
+    por vuelta y nunca procesa actualizaciones obsoletas acumuladas.
+    """
+    
+    def __init__(self, root):
+        self.root = root
+        self._pending = {}
+        self._scheduled = False
+        self._lock = threading.Lock()
+    
+    def post(self, func, *args):
+        """Programa func(*args) en el hilo de Tk, sustituyendo la llamada pendiente a func."""
+        with self._lock:
+            self._pending[func] = args
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.root.after_idle(self._flush)
+    
+    def _flush(self):
+        """Ejecuta el lote pendiente (hilo de Tk)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        for func, args in pending.items():
+            func(*args)
+
+
+class _PhotoDoubleBuffer:
+    """Dos PhotoImage reutilizables para mostrar video en un canvas.
+    
+    En lugar de crear un PhotoImage nuevo por frame (y liberar el anterior),
+    cada frame se pega en el PhotoImage que no está en pantalla y se alterna
+    entre los dos. Solo se recrean si cambia el tamaño del frame.
+    """
+    
+    def __init__(self, canvas, display_fps=DISPLAY_FPS):
+        """
+        Args:
+            canvas: Canvas de Tk donde se muestra el video
+            display_fps: Frames por segundo máximos a mostrar
+        """
+        self.canvas = canvas
+        self.photos = None
+        self.index = 0
+        self.item = None
+        self.display_interval = 1.0 / display_fps
+        self.last_display_time = 0.0
+        
+        # Buffer de salida del redimensionado, reutilizado mientras no cambie el tamaño
+        self._scratch = None
+        
+        # Tamaño del canvas medido en <Configure>, no con winfo_* en cada frame
+        self.size = (0, 0)
+        canvas.bind("<Configure>", self._on_configure, add="+")
+    
+    def _on_configure(self, event):
+        """Guarda el nuevo tamaño del canvas."""
+        self.size = (event.width, event.height)
+    
+    def due(self):
+        """Indica si toca mostrar un frame nuevo (limita la tasa de refresco).
+        
+        Si la inferencia va más rápido que DISPLAY_FPS, los frames intermedios se
+        descartan para no saturar el hilo de Tk con actualizaciones de imagen.
+        """
+        now = time.monotonic()
+        if now - self.last_display_time < self.display_interval:
+            return False
+        self.last_display_time = now
+        return True
+    
+    def fit(self, frame):
+        """Redimensiona el frame al tamaño del canvas (si ya se conoce)."""
+        width, height = self.size
+        if width <= 1 or height <= 1:
+            return frame
+        if frame.shape[1] == width and frame.shape[0] == height:
+            return frame  # Ya tiene el tamaño del canvas
+        if self._scratch is None or self._scratch.shape != (height, width, 3):
+            self._scratch = np.empty((height, width, 3), dtype=np.uint8)
+        # INTER_AREA al reducir: sin aliasing y más barato que INTER_LINEAR en ese caso
+        interpolation = cv2.INTER_AREA if width < frame.shape[1] else cv2.INTER_LINEAR
+        # _frame_to_pil copia el resultado, así que el buffer puede reutilizarse en el siguiente frame
+        return cv2.resize(frame, (width, height), dst=self._scratch, interpolation=interpolation)
+    
+    def show(self, image):
+        """Muestra una imagen PIL RGB (llamar desde el hilo principal de Tk)."""
+        if self.photos is None or (self.photos[0].width(), self.photos[0].height()) != image.size:
+            self.photos = [ImageTk.PhotoImage("RGB", image.size) for _ in range(2)]
+            self.index = 0
+        
+        photo = self.photos[self.index]
+        photo.paste(image)
+        
+        # El canvas se limpia con delete("all") al detener: recrear el item si ya no existe
+        if self.item is None or not self.canvas.type(self.item):
+            self.canvas.delete("all")
+            self.item = self.canvas.create_image(0, 0, anchor=tk.NW, image=photo)
+        else:
+            self.canvas.itemconfig(self.item, image=photo)
+        self.index ^= 1
+
+
+class _BlitManager:
+    """Redibuja solo los artistas animados de un FigureCanvasTkAgg (blitting).
+    
+    El fondo (ejes, marcas, rejilla, títulos) se rasteriza una vez y se guarda;
+    en cada actualización se restaura y se dibujan encima únicamente las
+    líneas/barras que cambian. Cualquier redibujado completo (cambio de tamaño,
+    de idioma o de límites) vuelve a capturar el fondo vía 'draw_event'.
+    """
+    
+    def __init__(self, canvas, artists):
+        """
+        Args:
+            canvas: FigureCanvasTkAgg de la figura
+            artists: Artistas que cambian entre actualizaciones
+        """
+        self.canvas = canvas
+        self.artists = list(artists)
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def _on_draw(self, event):
+        """Captura el fondo tras un redibujado completo y pinta los artistas animados."""
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+    
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+    
+    def update(self, full=False):
+        """Muestra el estado actual de los artistas.
+        
+        Args:
+            full: Forzar un redibujado completo (p. ej. si han cambiado los límites)
+        """
+        if full or self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+def _fit_ylim(ax, values, margin=0.1):
+    """Amplía los límites Y si los valores se salen de ellos.
+    
+    Returns:
+        True si se cambiaron los límites (hace falta redibujar el fondo)
+    """
+    low, high = ax.get_ylim()
+    vmin, vmax = float(np.min(values)), float(np.max(values))
+    if low <= vmin and vmax <= high:
+        return False
+    span = max(vmax - vmin, abs(vmax) * 0.1, 1.0)
+    ax.set_ylim(vmin - span * margin, vmax + span * margin)
+    return True
+
+
+@lru_cache(maxsize=64)
+def _label_size(class_name):
+    """Tamaño de la etiqueta "<clase>: <confianza>" de una detección.
+    
+    En FONT_HERSHEY_SIMPLEX todas las cifras tienen el mismo ancho, así que el
+    tamaño solo depende de la clase y se calcula una vez por clase.
+    """
+    return cv2.getTextSize(f"{class_name}: 0.00", cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
+
+
+def _filter_by_confidence(detections, threshold):
+    """Devuelve las detecciones con confianza >= threshold (filtro vectorizado)."""
+    if not detections:
+        return detections
+    confidences = np.fromiter((d.get('confidence', 0) for d in detections),
+                              dtype=np.float32, count=len(detections))
+    return [detections[i] for i in np.flatnonzero(confidences >= threshold).tolist()]
+
+
+def _replace_changed_lines(text_widget, old_lines, new_lines):
+    """Reescribe en un tk.Text solo las líneas que han cambiado.
+    
+    Si cambia el número de líneas (o el widget no tiene las líneas esperadas)
+    el contenido se reescribe entero.
+    
+    Args:
+        text_widget: Widget Text a actualizar
+        old_lines: Líneas mostradas actualmente
+        new_lines: Líneas nuevas
+        
+    Returns:
+        new_lines, para guardarlas como las líneas mostradas
+    """
+    shown = int(text_widget.index("end-1c").split(".")[0])
+    if len(old_lines) != len(new_lines) or shown != len(old_lines):
+        text_widget.delete(1.0, tk.END)
+        text_widget.insert(1.0, "\n".join(new_lines))
+        return new_lines
+    
+    for number, (old, new) in enumerate(zip(old_lines, new_lines), start=1):
+        if old != new:
+            text_widget.delete(f"{number}.0", f"{number}.end")
+            text_widget.insert(f"{number}.0", new)
+    return new_lines
+
+
+def _frame_to_pil(frame):
+    """Convierte un frame BGR de OpenCV en imagen PIL RGB.
+    
+    El decodificador raw de PIL reordena los canales al copiar, sin el paso
+    adicional de cv2.cvtColor.
+    """
+    frame = np.ascontiguousarray(frame)
+    height, width = frame.shape[:2]
+    return Image.frombuffer("RGB", (width, height), frame, "raw", "BGR", 0, 1)
+
 
 class InteractiveDetectionInterface:
     """Interfaz interactiva para detección en tiempo real."""
     
+    # Colores para diferentes tipos de keypoints
+    KEYPOINT_COLORS = ((255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255))
+    
     def __init__(self, config_path: str = "config/config.yaml"):
         """Inicializa la interfaz.
         
@@ -37,8 +434,26 @@ class InteractiveDetectionInterface:
         self.config_manager = ConfigManager(config_path)
         self.logger = Logger("InteractiveInterface")
         
+        # Sin pool interno de OpenCV: captura, inferencia y dibujo ya van en hilos propios y
+        # el backend del detector tiene su propio pool (sin fijar núcleos para no limitarlo)
+        limit_opencv_threads()
+        
+        # Superposiciones sobre cv2.UMat (OpenCL) si la configuración lo permite y hay dispositivo
+        self.use_opencl = bool(self.config_manager.get('visualization.use_opencl', False)) and cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        
+        # Diferencia media (0-255) por bloque de la miniatura por debajo de la cual no se llama a YOLO
+        self.diff_gate_threshold = float(self.config_manager.get('vision.diff_gate_threshold', 8.0))
+        self.diff_gate_max_reuse = int(self.config_manager.get('vision.diff_gate_max_reuse', 5))
+        
+        # Transporte RTSP forzado ('tcp'/'udp'); sin valor FFmpeg elige y puede pasar a TCP
+        self.rtsp_transport = self.config_manager.get('vision.rtsp_transport', None)
+        
         # Inicializar sistema de internacionalización
         self.i18n = get_i18n()
+        self._t_cache = {}  # (idioma, clave) -> texto, para etiquetas sin parámetros
+        self._fmt_cache = {}  # clave -> str.format de la plantilla en el idioma actual
         
         # Componentes del sistema
         self.detector = YOLOPoseDetector(config_path)
@@ -80,9 +495,14 @@ class InteractiveDetectionInterface:
         self.postprocess_running = False
         self.video_capture = None
         self.postprocess_capture = None
+        # Hilos lectores de cámara (solo para fuentes en vivo)
+        self.video_grabber = None
+        self.postprocess_grabber = None
         self.current_frame = None
         self.detection_thread = None
+        self.detection_draw_thread = None
         self.postprocess_thread = None
+        self.postprocess_draw_thread = None
         
         # Crear interfaz primero
         self.setup_gui()
@@ -99,6 +519,7 @@ class InteractiveDetectionInterface:
         self.show_keypoints = tk.BooleanVar(value=True)
         self.show_bboxes = tk.BooleanVar(value=True)
         self.show_labels = tk.BooleanVar(value=True)
+        self.skip_static_frames = tk.BooleanVar(value=False)
         self.video_source = tk.StringVar(value="0")
         self.current_config = tk.StringVar(value="Por defecto")
         
@@ -137,15 +558,23 @@ class InteractiveDetectionInterface:
         self.temporal_window = tk.IntVar(value=3)
         
         # Variables para datos y estadísticas
-        self.distance_history = collections.deque(maxlen=100)
+        self.distance_history = RingBuffer(100)
         self.detection_stats = {'marcador': 0, 'portico': 0, 'pulsador': 0}
-        self.fps_history = collections.deque(maxlen=50)
-        self.confidence_history = collections.deque(maxlen=100)
+        self.fps_history = RingBuffer(50)
+        self.confidence_history = RingBuffer(100)
         
         # Variables para posición virtual
-        self.virtual_position_history = collections.deque(maxlen=100)
-        self.pulsador_position = {'x': 0, 'y': 0}
-        self.portico_position = {'x': 0, 'y': 0}
+        # Trayectoria: columnas x, y, timestamp (float64 para no perder precisión en el tiempo)
+        self.virtual_position_history = RingBuffer(100, width=3, dtype=np.float64)
+        # Posiciones (x, y) en cm relativas al pórtico; se actualizan in-place
+        self.pulsador_xy = np.zeros(2)
+        self.portico_xy = np.zeros(2)  # El pórtico es el origen
+        # Redibujado de la posición virtual: uno pendiente como mucho, con las últimas detecciones
+        self._virtual_redraw_pending = False
+        self._virtual_detections = []
+        self._virtual_distance_cm = None
+        # Líneas mostradas en el texto de información de posición virtual
+        self._virtual_info_lines = []
         self.virtual_position_enabled = tk.BooleanVar(value=True)
         self.show_trajectory = tk.BooleanVar(value=True)
         self.coordinate_system_calibrated = tk.BooleanVar(value=False)
@@ -153,14 +582,112 @@ class InteractiveDetectionInterface:
         self.coordinate_origin = (320, 240)  # Origen por defecto
         self.coordinate_scale = 10.0  # Escala por defecto
         
+        # Copias en atributos Python (self._<nombre>) de las variables que se leen en cada frame
+        for name in ('confidence_threshold', 'skip_static_frames', 'pixels_per_cm',
+                     'marker_pixels_per_cm', 'coordinate_position', 'coordinate_size',
+                     'virtual_position_enabled', 'show_trajectory', 'coordinate_system_calibrated'):
+            self._mirror_var(name)
+        
+        # Las casillas de superposiciones además regeneran las funciones de dibujo
+        for name in ('show_keypoints', 'show_bboxes', 'show_labels', 'show_distance',
+                     'show_distance_line', 'show_marker_distance', 'show_marker_distance_line',
+                     'show_coordinate_system'):
+            self._mirror_var(name, on_change=self._rebuild_overlay_steps)
+        self._rebuild_overlay_steps()
+        
+        # Etiquetas de los sliders: una actualización por vuelta de Tk (ver _trace_label)
+        self._dirty_label_callbacks = {}
+        self._label_flush_scheduled = False
+        self._label_traces = []
+        
         # Configurar controles después de crear variables
         self.setup_controls()
         
-        # Cargar modelo
-        self.detector.load_model()
+        # Cargar modelo (exportado a TensorRT/OpenVINO según vision.accel_backend)
+        self.detector.load_model(batch=INFER_BATCH)
+        
+        # Inferencia compartida por las pestañas de detección y postprocesamiento
+        self.infer_worker = _InferWorker(self.detector)
+        self.infer_worker.start()
+        
+        # Compilar los filtros de movimiento ahora y no en el primer frame procesado
+        warmup_fast_filters()
         
         self.logger.info("Interfaz interactiva inicializada")
     
+    def _mirror_var(self, name, on_change=None):
+        """Mantiene self._<name> igual al valor de la variable Tk self.<name>.
+        
+        Los bucles por frame leen el atributo en lugar de llamar a var.get(), que
+        pasa por el intérprete Tcl; el atributo solo se actualiza al escribir la variable.
+        
+        Args:
+            name: Nombre del atributo que contiene la variable Tk
+            on_change: Función sin argumentos a llamar tras actualizar el atributo
+        """
+        var = getattr(self, name)
+        attr = '_' + name
+        setattr(self, attr, var.get())
+        
+        def update(*args):
+            setattr(self, attr, var.get())
+            if on_change is not None:
+                on_change()
+        
+        var.trace_add('write', update)
+    
+    def _trace_label(self, var, callback):
+        """Llama a callback tras escribir var, como mucho una vez por vuelta del bucle de Tk.
+        
+        Al arrastrar un Scale la variable se escribe en cada paso; las escrituras se
+        marcan como pendientes y un único after_idle ejecuta cada callback una vez.
+        
+        Args:
+            var: Variable Tk a vigilar
+            callback: Función que actualiza la etiqueta (recibe *args como un trace)
+        """
+        def mark_dirty(*args):
+            self._dirty_label_callbacks[callback] = None
+            if not self._label_flush_scheduled:
+                self._label_flush_scheduled = True
+                self.root.after_idle(self._flush_label_updates)
+        
+        # Se guarda el id para poder soltar el trace al cerrar
+        self._label_traces.append((var, var.trace_add('write', mark_dirty)))
+    
+    def _flush_label_updates(self):
+        """Ejecuta una vez cada callback de etiqueta pendiente."""
+        callbacks, self._dirty_label_callbacks = self._dirty_label_callbacks, {}
+        self._label_flush_scheduled = False
+        for callback in callbacks:
+            callback()
+    
+    def _rebuild_overlay_steps(self):
+        """Especializa el dibujo por frame para las superposiciones activas.
+        
+        Guarda en tuplas solo los pasos habilitados (con sus opciones ya fijadas),
+        de modo que draw_detections y process_frame_with_options no evalúan
+        casillas en cada frame y, sin superposiciones, ni siquiera copian el frame.
+        Se vuelve a llamar cada vez que cambia una de las casillas.
+        """
+        detection_steps = []
+        if self._show_bboxes:
+            detection_steps.append(partial(self._draw_detection_box, show_label=self._show_labels))
+        if self._show_keypoints:
+            detection_steps.append(self._draw_detection_keypoints)
+        self._detection_steps = tuple(detection_steps)
+        
+        frame_steps = []
+        if self._show_distance or self._show_distance_line:
+            frame_steps.append(partial(self.distance_calculator.draw_distance_on_frame,
+                                       show_distance=self._show_distance,
+                                       show_line=self._show_distance_line, inplace=True))
+        if self._show_marker_distance or self._show_marker_distance_line:
+            frame_steps.append(partial(self.marker_distance_calculator.draw_distance_on_frame,
+                                       show_distance=self._show_marker_distance,
+                                       show_line=self._show_marker_distance_line, inplace=True))
+        self._frame_steps = tuple(frame_steps)
+    
     def t(self, key, **kwargs):
         """Método de traducción que usa el sistema de internacionalización.
         
@@ -171,11 +698,40 @@ class InteractiveDetectionInterface:
         Returns:
             Texto traducido
         """
-        return self.i18n.t(key, **kwargs)
+        if kwargs:
+            # Textos con parámetros (p. ej. valores de sliders): no se cachean
+            return self.i18n.t(key, **kwargs)
+        
+        cache_key = (self.i18n.get_language(), key)
+        text = self._t_cache.get(cache_key)
+        if text is None:
+            text = self.i18n.t(key)
+            self._t_cache[cache_key] = text
+        return text
+    
+    def fmt(self, key):
+        """Devuelve el método format de la plantilla traducida de una clave.
+        
+        Para etiquetas que se reformatean muy a menudo (sliders): la plantilla se
+        busca una vez por idioma y después solo se llama a format(value=...).
+        
+        Args:
+            key: Clave de traducción
+            
+        Returns:
+            Método str.format ligado a la plantilla
+        """
+        formatter = self._fmt_cache.get(key)
+        if formatter is None:
+            formatter = self.t(key).format
+            self._fmt_cache[key] = formatter
+        return formatter
     
     def setup_gui(self):
         """Configura la interfaz gráfica básica."""
         self.root = tk.Tk()
+        # Actualizaciones de la interfaz desde los hilos de video, agrupadas por vuelta de Tk
+        self.ui_batcher = _UiBatcher(self.root)
         self.root.title(self.t('app_title'))
         self.root.geometry("1400x900")
         self.root.configure(bg='#f0f0f0')
@@ -244,6 +800,8 @@ class InteractiveDetectionInterface:
             language_code: Código del idioma ('es' o 'en')
         """
         self.i18n.set_language(language_code)
+        self._t_cache.clear()
+        self._fmt_cache.clear()
         self.current_language.set(language_code)
         self.update_interface_texts()
         self.logger.info(f"Idioma cambiado a: {language_code}")
@@ -312,6 +870,8 @@ class InteractiveDetectionInterface:
             self.show_keypoints_check.config(text=self.t('detection.show_keypoints'))
         if hasattr(self, 'show_labels_check'):
             self.show_labels_check.config(text=self.t('detection.show_labels'))
+        if hasattr(self, 'skip_static_frames_check'):
+            self.skip_static_frames_check.config(text=self.t('detection.skip_static_frames'))
         
         # Actualizar botones de control
         if hasattr(self, 'start_button'):
@@ -479,6 +1039,9 @@ class InteractiveDetectionInterface:
             self.virtual_ax.set_title(self.t('virtual_position.graph_title'))
             self.virtual_ax.set_xlabel(self.t('virtual_position.x_axis'))
             self.virtual_ax.set_ylabel(self.t('virtual_position.y_axis'))
+            self._reference_line.set_label(self.t('virtual_position.reference_line'))
+            self._pulsador_marker.set_label(self.t('virtual_position.button'))
+            self._build_virtual_legend()
             if hasattr(self, 'virtual_canvas'):
                 self.virtual_canvas.draw()
     
@@ -544,14 +1107,20 @@ class InteractiveDetectionInterface:
         # Configurar pestaña de detección
         self.setup_detection_tab()
         
-        # Configurar pestaña de postprocesamiento
-        self.setup_postprocess_tab()
-        
-        # Configurar pestaña de posición virtual
-        self.setup_virtual_position_tab()
-        
-        # Configurar pestaña de datos
-        self.setup_data_tab()
+        # El resto de pestañas (postprocesamiento y las que tienen figuras de
+        # matplotlib) se construyen la primera vez que se seleccionan
+        self._lazy_tabs = {
+            str(self.postprocess_frame): self.setup_postprocess_tab,
+            str(self.virtual_position_frame): self.setup_virtual_position_tab,
+            str(self.data_frame): self.setup_data_tab,
+        }
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed, add="+")
+        
+    def _on_tab_changed(self, event):
+        """Construye la pestaña seleccionada si todavía no se había creado."""
+        setup = self._lazy_tabs.pop(self.notebook.select(), None)
+        if setup is not None:
+            setup()
         
     def setup_detection_tab(self):
         """Configura la pestaña de detección."""
@@ -648,9 +1217,14 @@ class InteractiveDetectionInterface:
                        variable=self.show_labels)
         self.show_labels_check.grid(row=14, column=0, sticky="w", pady=2)
         
+        # Reutilizar las detecciones mientras la escena no cambia
+        self.skip_static_frames_check = ttk.Checkbutton(self.detection_control_frame, text=self.t('detection.skip_static_frames'), 
+                       variable=self.skip_static_frames)
+        self.skip_static_frames_check.grid(row=15, column=0, sticky="w", pady=2)
+        
         # Botones de control
         button_frame = ttk.Frame(self.detection_control_frame)
-        button_frame.grid(row=15, column=0, columnspan=2, pady=(20, 0))
+        button_frame.grid(row=16, column=0, columnspan=2, pady=(20, 0))
         
         self.start_button = ttk.Button(button_frame, text=self.t('detection.start_detection'), 
                                       command=self.start_detection)
@@ -665,8 +1239,8 @@ class InteractiveDetectionInterface:
         self.capture_button.pack(side=tk.LEFT)
         
         # Configurar callbacks para actualizar etiquetas
-        self.confidence_threshold.trace('w', self.update_conf_label)
-        self.iou_threshold.trace('w', self.update_iou_label)
+        self._trace_label(self.confidence_threshold, self.update_conf_label)
+        self._trace_label(self.iou_threshold, self.update_iou_label)
     
     def setup_video_panel(self, parent):
         """Configura el panel de video."""
@@ -676,6 +1250,7 @@ class InteractiveDetectionInterface:
         # Canvas para mostrar video
         self.video_canvas = tk.Canvas(self.video_frame, width=800, height=600, bg='black')
         self.video_canvas.pack(expand=True, fill=tk.BOTH)
+        self.video_photo_buffer = _PhotoDoubleBuffer(self.video_canvas)
         
         # Texto de estado
         self.status_text = tk.StringVar(value=self.t('detection.status_start'))
@@ -714,11 +1289,11 @@ class InteractiveDetectionInterface:
     
     def update_conf_label(self, *args):
         """Actualiza la etiqueta del umbral de confianza."""
-        self.conf_label.config(text=self.t('detection.confidence_label', value=self.confidence_threshold.get()))
+        self.conf_label.config(text=self.fmt('detection.confidence_label')(value=self.confidence_threshold.get()))
     
     def update_iou_label(self, *args):
         """Actualiza la etiqueta del umbral de IoU."""
-        self.iou_label.config(text=self.t('detection.iou_label', value=self.iou_threshold.get()))
+        self.iou_label.config(text=self.fmt('detection.iou_label')(value=self.iou_threshold.get()))
     
     def start_detection(self):
         """Inicia la detección en tiempo real."""
@@ -732,21 +1307,26 @@ class InteractiveDetectionInterface:
                 source = int(source)
             
             # Inicializar captura de video
-            self.video_capture = cv2.VideoCapture(source)
+            self.video_capture = create_capture(source, self.rtsp_transport)
             
             if not self.video_capture.isOpened():
                 messagebox.showerror(self.t('messages.error'), self.t('messages.video_error', source=source))
                 return
             
             # Configurar captura
-            self.video_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.video_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            self._configure_capture(self.video_capture, source)
+            self.video_grabber = self._start_grabber(self.video_capture, source)
             
             self.running = True
             
-            # Iniciar hilo de detección
-            self.detection_thread = threading.Thread(target=self.detection_loop, daemon=True)
+            # Captura (FrameGrabber) -> inferencia -> dibujo, en hilos solapados
+            draw_slot = _SingleSlot()
+            self.detection_thread = threading.Thread(target=self.detection_loop, args=(draw_slot,),
+                                                     daemon=True)
+            self.detection_draw_thread = threading.Thread(target=self.detection_draw_loop,
+                                                          args=(draw_slot,), daemon=True)
             self.detection_thread.start()
+            self.detection_draw_thread.start()
             
             # Actualizar interfaz
             self.start_button.config(state="disabled")
@@ -759,10 +1339,77 @@ class InteractiveDetectionInterface:
             messagebox.showerror(self.t('messages.error'), self.t('messages.detection_error', error=str(e)))
             self.logger.error(f"Error al iniciar detección: {e}")
     
+    @staticmethod
+    def _is_live_source(source):
+        """Indica si la fuente es una cámara o un stream (no un archivo de video)."""
+        return isinstance(source, int) or "://" in str(source)
+    
+    def _start_grabber(self, capture, source):
+        """Arranca un hilo lector que decodifica en paralelo con la inferencia.
+        
+        En fuentes en vivo la inferencia consume siempre el último frame y los
+        frames que llegan mientras YOLO trabaja se descartan (sin decodificar)
+        en lugar de acumularse en el driver. Los archivos se entregan todos y
+        en orden, con el siguiente ya decodificado.
+        
+        Args:
+            capture: Captura de OpenCV ya configurada
+            source: Índice de cámara, URL o ruta de archivo
+            
+        Returns:
+            FrameGrabber arrancado
+        """
+        if not self._is_live_source(source):
+            return FrameGrabber(capture, keep_all=True).start()
+        # grab() continuo y retrieve() solo del frame que va a recibir la inferencia
+        return FrameGrabber(capture, decode_on_demand=True).start()
+    
+    @staticmethod
+    def _file_pacer(capture, grabber):
+        """_FilePacer para archivos de video con FPS conocido; None en fuentes en vivo."""
+        if grabber is None or not grabber.keep_all:
+            return None
+        fps = capture.get(cv2.CAP_PROP_FPS)
+        if not fps or fps != fps:  # 0 o NaN: el backend no informa del FPS
+            return None
+        return _FilePacer(grabber, fps)
+    
+    @staticmethod
+    def _read_frame(capture, grabber):
+        """Lee el siguiente frame, del hilo lector si existe."""
+        if grabber is not None:
+            return grabber.get_latest()
+        return capture.read()
+    
+    def _configure_capture(self, capture, source):
+        """Configura la captura a 640x480; en cámaras y streams, con baja latencia.
+        
+        Args:
+            capture: Captura de OpenCV ya abierta
+            source: Índice de cámara, URL o ruta de archivo
+            
+        Returns:
+            True si el backend aceptó el buffer de 1 frame (siempre False en archivos)
+        """
+        if self._is_live_source(source):
+            # Buffer de 1 frame y MJPEG: YOLO recibe siempre el frame más reciente
+            buffer_ok = configure_low_latency_capture(capture, width=640, height=480)
+            self.logger.info(f"CAP_PROP_BUFFERSIZE=1 aceptado por el backend: {buffer_ok}")
+            return buffer_ok
+        
+        # Los archivos de video se leen en orden, sin descartar frames
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        return False
+    
     def stop_detection(self):
         """Detiene la detección."""
         self.running = False
         
+        if self.video_grabber:
+            self.video_grabber.stop()
+            self.video_grabber = None
+        
         if self.video_capture:
             self.video_capture.release()
             self.video_capture = None
@@ -777,117 +1424,175 @@ class InteractiveDetectionInterface:
         
         self.logger.info("Detección detenida")
     
-    def detection_loop(self):
-        """Bucle principal de detección."""
-        fps_counter = 0
-        fps_start_time = time.time()
+    def detection_loop(self, draw_slot):
+        """Etapa de inferencia de la detección: lee frames y los pasa al dibujo con sus detecciones.
+        
+        Args:
+            draw_slot: _SingleSlot hacia detection_draw_loop
+        """
+        detect = FrameDiffGate(self.infer_worker.submit, self.diff_gate_threshold,
+                               max_reuse=self.diff_gate_max_reuse)
+        pacer = self._file_pacer(self.video_capture, self.video_grabber)
         
         while self.running:
             try:
-                ret, frame = self.video_capture.read()
+                ret, frame = self._read_frame(self.video_capture, self.video_grabber)
                 
                 if not ret:
                     self.logger.warning("No se pudo leer frame")
                     break
                 
-                self.current_frame = frame.copy()
+                # Realizar detección (YOLO solo si la escena cambió)
+                detect.enabled = self._skip_static_frames
+                detections = detect(frame)
+                
+                # El dibujo va en su propio hilo; si aún no terminó el anterior, se reemplaza
+                if not draw_slot.put((frame, detections)):
+                    break
+                
+                # Archivos: mantener el ritmo de reproducción saltando o esperando
+                if pacer is not None:
+                    pacer.tick()
+                
+            except Exception as e:
+                self.logger.error(f"Error en bucle de detección: {e}")
+                break
+        
+        draw_slot.close()
+        
+        # Limpiar al salir
+        if self.video_grabber:
+            self.video_grabber.stop()
+        if self.video_capture:
+            self.video_capture.release()
+    
+    def detection_draw_loop(self, draw_slot):
+        """Etapa de dibujo de la detección: superpone las detecciones y muestra el frame.
+        
+        Args:
+            draw_slot: _SingleSlot desde detection_loop
+        """
+        fps_counter = 0
+        fps_start_time = time.perf_counter()
+        info_interval = 1.0 / INFO_UPDATE_HZ
+        last_info_time = 0.0
+        
+        while True:
+            item = draw_slot.get()
+            if item is None:
+                break
+            frame, detections = item
+            
+            try:
+                # Filtrar por umbral de confianza una sola vez para dibujo, texto y estado
+                detections = _filter_by_confidence(detections, self._confidence_threshold)
                 
-                # Realizar detección
-                detections = self.detector.get_detections_data(frame)
+                # Dibujar detecciones (in-place: el frame no se usa en ninguna otra etapa)
+                frame = self.draw_detections(frame, detections)
                 
-                # Dibujar detecciones
-                annotated_frame = self.draw_detections(frame, detections)
+                # Referencia para capture_frame; ya no se modifica después de dibujar
+                self.current_frame = frame
                 
                 # Mostrar frame en la interfaz
-                self.display_frame(annotated_frame)
+                self.display_frame(frame)
                 
-                # Actualizar información de detecciones
-                self.update_detection_info(detections)
+                # Actualizar información de detecciones (reescribir el Text de Tk es caro
+                # y nadie lee 30 actualizaciones por segundo)
+                now = time.monotonic()
+                if now - last_info_time >= info_interval:
+                    self.update_detection_info(detections)
+                    last_info_time = now
                 
                 # Calcular FPS
                 fps_counter += 1
-                if time.time() - fps_start_time >= 1.0:
-                    fps = fps_counter / (time.time() - fps_start_time)
-                    self.root.after(0, lambda: self.status_text.set(f"FPS: {fps:.1f} | Detecciones: {len(detections)}"))
+                now = time.perf_counter()
+                elapsed = now - fps_start_time
+                if elapsed >= 1.0:
+                    fps = fps_counter / elapsed
+                    # Texto formateado aquí: el callback no depende de variables que cambian
+                    self.ui_batcher.post(self.status_text.set, f"FPS: {fps:.1f} | Detecciones: {len(detections)}")
                     fps_counter = 0
-                    fps_start_time = time.time()
-                
-                time.sleep(0.01)  # Pequeña pausa para no saturar la CPU
+                    fps_start_time = now
                 
             except Exception as e:
-                self.logger.error(f"Error en bucle de detección: {e}")
+                self.logger.error(f"Error en dibujo de detección: {e}")
                 break
         
-        # Limpiar al salir
-        if self.video_capture:
-            self.video_capture.release()
+        # Detener también la etapa de inferencia
+        draw_slot.close()
     
     def draw_detections(self, frame, detections):
         """Dibuja las detecciones en el frame.
         
         Args:
             frame: Frame de video
-            detections: Lista de detecciones
+            detections: Lista de detecciones ya filtradas por confianza
             
         Returns:
-            Frame con detecciones dibujadas
+            Frame con detecciones dibujadas; sin OpenCL es el propio frame, modificado in-place
         """
-        annotated_frame = frame.copy()
+        steps = self._detection_steps
+        if not steps:
+            return frame
+        
+        # Con OpenCL el frame se sube una vez al dispositivo y se dibuja allí
+        if self.use_opencl:
+            frame = cv2.UMat(frame)
         
         for detection in detections:
-            confidence = detection.get('confidence', 0)
-            
-            # Filtrar por umbral de confianza
-            if confidence < self.confidence_threshold.get():
-                continue
-            
-            bbox = detection.get('bbox', [])
-            class_name = detection.get('class_name', 'unknown')
-            keypoints = detection.get('keypoints', [])
-            
-            # Dibujar bounding box
-            if self.show_bboxes.get() and len(bbox) >= 4:
-                x1, y1, x2, y2 = map(int, bbox[:4])
-                cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                
-                # Dibujar etiqueta
-                if self.show_labels.get():
-                    label = f"{class_name}: {confidence:.2f}"
-                    label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
-                    cv2.rectangle(annotated_frame, (x1, y1 - label_size[1] - 10), 
-                                (x1 + label_size[0], y1), (0, 255, 0), -1)
-                    cv2.putText(annotated_frame, label, (x1, y1 - 5), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2)
-            
-            # Dibujar keypoints
-            if self.show_keypoints.get() and keypoints is not None and len(keypoints) > 0:
-                self.draw_keypoints(annotated_frame, keypoints)
+            for step in steps:
+                step(frame, detection)
         
-        return annotated_frame
+        if isinstance(frame, cv2.UMat):
+            frame = frame.get()
+        return frame
+    
+    def _draw_detection_box(self, frame, detection, show_label=True):
+        """Dibuja la bounding box de una detección y, opcionalmente, su etiqueta."""
+        bbox = detection.get('bbox', [])
+        if len(bbox) < 4:
+            return
+        
+        x1, y1, x2, y2 = map(int, bbox[:4])
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        
+        # Dibujar etiqueta
+        if show_label:
+            class_name = detection.get('class_name', 'unknown')
+            label = f"{class_name}: {detection.get('confidence', 0):.2f}"
+            label_size = _label_size(class_name)
+            cv2.rectangle(frame, (x1, y1 - label_size[1] - 10), 
+                        (x1 + label_size[0], y1), (0, 255, 0), -1)
+            cv2.putText(frame, label, (x1, y1 - 5), 
+                      cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2)
+    
+    def _draw_detection_keypoints(self, frame, detection):
+        """Dibuja los keypoints de una detección, si tiene."""
+        keypoints = detection.get('keypoints', [])
+        if keypoints is not None and len(keypoints) > 0:
+            self.draw_keypoints(frame, keypoints)
     
     def draw_keypoints(self, frame, keypoints):
         """Dibuja keypoints en el frame.
         
         Args:
-            frame: Frame donde dibujar
+            frame: Frame donde dibujar (numpy o cv2.UMat)
             keypoints: Array numpy de keypoints
         """
-        # Colores para diferentes tipos de keypoints
-        colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255)]
+        colors = self.KEYPOINT_COLORS
         
         try:
-            # Convertir a numpy array si no lo es
-            if not isinstance(keypoints, np.ndarray):
-                keypoints = np.array(keypoints)
-            
-            # Iterar sobre los keypoints
-            for i in range(len(keypoints)):
-                if len(keypoints[i]) >= 3:
-                    x, y, visibility = keypoints[i][:3]
-                    if float(visibility) > 0.5:  # Solo dibujar si es visible
-                        color = colors[i % len(colors)]
-                        cv2.circle(frame, (int(float(x)), int(float(y))), 3, color, -1)
-                        cv2.circle(frame, (int(float(x)), int(float(y))), 5, color, 1)
+            keypoints = np.asarray(keypoints, dtype=np.float32)
+            if keypoints.ndim != 2 or keypoints.shape[1] < 3:
+                return
+            
+            # Filtrar los visibles de una vez y recorrer solo esos
+            visible = np.flatnonzero(keypoints[:, 2] > 0.5)
+            points = keypoints[visible, :2].astype(np.int32).tolist()
+            for i, (x, y) in zip(visible.tolist(), points):
+                color = colors[i % len(colors)]
+                cv2.circle(frame, (x, y), 3, color, -1)
+                cv2.circle(frame, (x, y), 5, color, 1)
         except Exception as e:
             print(f"Error dibujando keypoints: {e}")
     
@@ -897,63 +1602,52 @@ class InteractiveDetectionInterface:
         Args:
             frame: Frame a mostrar
         """
-        # Redimensionar frame para ajustarse al canvas
-        canvas_width = self.video_canvas.winfo_width()
-        canvas_height = self.video_canvas.winfo_height()
-        
-        if canvas_width > 1 and canvas_height > 1:
-            frame_resized = cv2.resize(frame, (canvas_width, canvas_height))
-        else:
-            frame_resized = frame
+        # Limitar la tasa de refresco del canvas
+        if not self.video_photo_buffer.due():
+            return
         
-        # Convertir de BGR a RGB
-        frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
+        # Redimensionar frame para ajustarse al canvas
+        frame_resized = self.video_photo_buffer.fit(frame)
         
-        # Convertir a formato PIL
-        image_pil = Image.fromarray(frame_rgb)
-        image_tk = ImageTk.PhotoImage(image_pil)
+        # Convertir a formato PIL (BGR -> RGB)
+        image_pil = _frame_to_pil(frame_resized)
         
-        # Actualizar canvas en el hilo principal
-        self.root.after(0, self._update_canvas, image_tk)
-    
-    def _update_canvas(self, image_tk):
-        """Actualiza el canvas con la nueva imagen."""
-        self.video_canvas.delete("all")
-        self.video_canvas.create_image(0, 0, anchor=tk.NW, image=image_tk)
-        self.video_canvas.image = image_tk  # Mantener referencia
+        # Actualizar canvas en el hilo principal, junto con el resto de la interfaz
+        self.ui_batcher.post(self.video_photo_buffer.show, image_pil)
     
     def update_detection_info(self, detections):
         """Actualiza la información de detecciones.
         
         Args:
-            detections: Lista de detecciones
+            detections: Lista de detecciones ya filtradas por confianza
         """
-        info_text = f"Timestamp: {time.strftime('%H:%M:%S')}\n"
-        info_text += f"Detecciones encontradas: {len(detections)}\n\n"
+        # Líneas en una lista y un único join (sin concatenaciones repetidas)
+        lines = [f"Timestamp: {time.strftime('%H:%M:%S')}",
+                 f"Detecciones encontradas: {len(detections)}",
+                 ""]
         
         for i, detection in enumerate(detections):
             confidence = detection.get('confidence', 0)
-            if confidence < self.confidence_threshold.get():
-                continue
-                
             class_name = detection.get('class_name', 'unknown')
             bbox = detection.get('bbox', [])
             
-            info_text += f"Detección {i+1}:\n"
-            info_text += f"  Clase: {class_name}\n"
-            info_text += f"  Confianza: {confidence:.3f}\n"
+            lines.append(f"Detección {i+1}:")
+            lines.append(f"  Clase: {class_name}")
+            lines.append(f"  Confianza: {confidence:.3f}")
             
             if len(bbox) >= 4:
-                info_text += f"  BBox: ({bbox[0]:.1f}, {bbox[1]:.1f}, {bbox[2]:.1f}, {bbox[3]:.1f})\n"
+                lines.append(f"  BBox: ({bbox[0]:.1f}, {bbox[1]:.1f}, {bbox[2]:.1f}, {bbox[3]:.1f})")
             
             keypoints = detection.get('keypoints', [])
             if keypoints is not None and len(keypoints) > 0:
-                info_text += f"  Keypoints: {len(keypoints)} puntos\n"
+                lines.append(f"  Keypoints: {len(keypoints)} puntos")
             
-            info_text += "\n"
+            lines.append("")
+        
+        info_text = "\n".join(lines) + "\n"
         
         # Actualizar texto en el hilo principal
-        self.root.after(0, self._update_info_text, info_text)
+        self.ui_batcher.post(self._update_info_text, info_text)
     
     def _update_info_text(self, text):
         """Actualiza el texto de información."""
@@ -963,18 +1657,33 @@ class InteractiveDetectionInterface:
     
     def capture_frame(self):
         """Captura el frame actual."""
-        if self.current_frame is not None:
+        # current_frame no se modifica tras asignarse, así que basta con la referencia
+        frame = self.current_frame
+        if frame is not None:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"data/processed/capture_{timestamp}.jpg"
             
+            # Codificar y escribir en otro hilo para no bloquear la interfaz
+            threading.Thread(target=self._save_capture, args=(frame, filename),
+                             name="CaptureWriter", daemon=True).start()
+        else:
+            messagebox.showwarning("Advertencia", "No hay frame disponible para capturar")
+    
+    def _save_capture(self, frame, filename):
+        """Guarda una captura en disco y avisa en el hilo de Tk al terminar."""
+        try:
             # Crear directorio si no existe
             Path(filename).parent.mkdir(parents=True, exist_ok=True)
-            
-            cv2.imwrite(filename, self.current_frame)
-            messagebox.showinfo("Captura", f"Frame guardado como: {filename}")
+            ok = cv2.imwrite(filename, frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        except Exception as e:
+            self.logger.error(f"Error guardando captura: {e}")
+            ok = False
+        
+        if ok:
             self.logger.info(f"Frame capturado: {filename}")
+            self.root.after(0, messagebox.showinfo, "Captura", f"Frame guardado como: {filename}")
         else:
-            messagebox.showwarning("Advertencia", "No hay frame disponible para capturar")
+            self.root.after(0, messagebox.showerror, "Captura", f"No se pudo guardar: {filename}")
             
     # ===== MÉTODOS PARA POSTPROCESAMIENTO =====
     
@@ -1201,12 +1910,12 @@ class InteractiveDetectionInterface:
         self.calibrate_marker_btn.pack(side=tk.LEFT)
         
         # Configurar callbacks para actualizar etiquetas
-        self.pixels_per_cm.trace('w', self.update_cal_label)
-        self.marker_pixels_per_cm.trace('w', self.update_marker_cal_label)
-        self.distance_threshold.trace('w', self.update_dist_threshold_label)
-        self.velocity_threshold.trace('w', self.update_vel_threshold_label)
-        self.temporal_window.trace('w', self.update_temp_window_label)
-        self.coordinate_size.trace('w', self.update_coord_size_label)
+        self._trace_label(self.pixels_per_cm, self.update_cal_label)
+        self._trace_label(self.marker_pixels_per_cm, self.update_marker_cal_label)
+        self._trace_label(self.distance_threshold, self.update_dist_threshold_label)
+        self._trace_label(self.velocity_threshold, self.update_vel_threshold_label)
+        self._trace_label(self.temporal_window, self.update_temp_window_label)
+        self._trace_label(self.coordinate_size, self.update_coord_size_label)
         
         # Actualizar estado MQTT inicial
         self.update_mqtt_status()
@@ -1219,6 +1928,7 @@ class InteractiveDetectionInterface:
         # Canvas para mostrar video
         self.postprocess_canvas = tk.Canvas(self.postprocess_video_frame, width=800, height=600, bg='black')
         self.postprocess_canvas.pack(expand=True, fill=tk.BOTH)
+        self.postprocess_photo_buffer = _PhotoDoubleBuffer(self.postprocess_canvas)
         
         # Texto de estado
         self.postprocess_status_text = tk.StringVar(value=self.t("postprocess.postprocess_status_start"))
@@ -1332,38 +2042,112 @@ class InteractiveDetectionInterface:
         self.virtual_fig = Figure(figsize=(10, 8), dpi=100, facecolor='white')
         self.virtual_ax = self.virtual_fig.add_subplot(111)
         
-        # Configurar estilo profesional del gráfico
-        self.virtual_ax.set_facecolor('#f8f9fa')
-        self.virtual_ax.set_title(self.t('virtual_position.graph_title'), 
-                                 fontsize=14, fontweight='bold', pad=20)
-        self.virtual_ax.set_xlabel('Posición X (cm)', fontsize=12, fontweight='bold')
-        self.virtual_ax.set_ylabel('Posición Y (cm)', fontsize=12, fontweight='bold')
-        
-        # Grid profesional
-        self.virtual_ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
-        self.virtual_ax.set_aspect('equal')
-        
-        # Configurar límites iniciales
-        self.virtual_ax.set_xlim(-50, 50)
-        self.virtual_ax.set_ylim(-50, 50)
-        
-        # Añadir círculos concéntricos para referencia
-        for radius in [10, 20, 30, 40]:
-            circle = plt.Circle((0, 0), radius, fill=False, color='lightgray', 
-                              alpha=0.5, linestyle='--', linewidth=1)
-            self.virtual_ax.add_patch(circle)
-        
-        # Añadir ejes de referencia
-        self.virtual_ax.axhline(y=0, color='gray', linestyle='-', alpha=0.3, linewidth=1)
-        self.virtual_ax.axvline(x=0, color='gray', linestyle='-', alpha=0.3, linewidth=1)
+        # Elementos del gráfico, creados una sola vez y actualizados en cada frame
+        self._setup_virtual_position_artists()
         
         self.virtual_canvas = FigureCanvasTkAgg(self.virtual_fig, display_frame)
+        # Solo el pulsador y la trayectoria se redibujan; el resto queda en el fondo guardado
+        self.virtual_blit = _BlitManager(self.virtual_canvas,
+                                         [self._trajectory_lines, self._trajectory_points,
+                                          self._pulsador_stem, self._pulsador_marker,
+                                          self._pulsador_label, self._origin_distance_label])
         self.virtual_canvas.draw()
         self.virtual_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # Configurar redimensionamiento
         parent.grid_columnconfigure(1, weight=1)
         parent.grid_rowconfigure(0, weight=1)
+    
+    def _setup_virtual_position_artists(self):
+        """Crea los elementos fijos y móviles del gráfico de posición virtual.
+        
+        Línea de 30 cm con origen en el extremo izquierdo, marcas cada 5 cm,
+        origen y pórtico son fijos; el pulsador, sus etiquetas y la trayectoria
+        se actualizan en update_virtual_position_display sin recrear nada.
+        """
+        ax = self.virtual_ax
+        line_start, line_end, line_y = 0, VIRTUAL_LINE_LENGTH_CM, 0
+        
+        # Estilo profesional
+        ax.set_facecolor('#f8f9fa')
+        ax.set_title(self.t('virtual_position.graph_title'), 
+                     fontsize=14, fontweight='bold', pad=20)
+        ax.set_xlabel(self.t('virtual_position.position_x_label'), fontsize=12, fontweight='bold')
+        ax.set_ylabel(self.t('virtual_position.position_y_label'), fontsize=12, fontweight='bold')
+        ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
+        ax.set_aspect('equal')
+        
+        # Límites para mostrar la línea de 0 a 30 cm
+        ax.set_xlim(-5, 35)
+        ax.set_ylim(-10, 10)
+        
+        # Línea principal de 30 cm
+        self._reference_line, = ax.plot([line_start, line_end], [line_y, line_y], 
+                                        color='#2c3e50', linewidth=8, alpha=0.8, 
+                                        label=self.t('virtual_position.reference_line'), zorder=2)
+        
+        # Marcas de medición cada 5 cm
+        for x in range(line_start, line_end + 1, 5):
+            ax.plot([x, x], [line_y - 0.5, line_y + 0.5], 
+                    color='#34495e', linewidth=2, alpha=0.7)
+            ax.text(x, line_y - 1.5, f'{x}', 
+                    ha='center', va='top', fontsize=9, 
+                    fontweight='bold', color='#2c3e50')
+        
+        # Origen (extremo izquierdo) y pórtico
+        ax.plot(0, line_y, 's', color='#d32f2f', markersize=12, 
+                markeredgecolor='darkred', markeredgewidth=2, 
+                label='Origen (0,0)', zorder=5)
+        ax.plot(VIRTUAL_PORTICO_X_CM, line_y, '^', color='#ff9800', markersize=12, 
+                markeredgecolor='darkorange', markeredgewidth=2, 
+                label='Pórtico (Keypoint D)', zorder=5)
+        
+        # Etiquetas de los extremos de la línea
+        for x, text in ((line_start, '0 cm (Origen)'), (line_end, f'{line_end} cm')):
+            ax.text(x, line_y + 4, text, 
+                    ha='center', va='bottom', fontsize=10, 
+                    fontweight='bold', color='#2c3e50',
+                    bbox=dict(boxstyle="round,pad=0.3", 
+                              facecolor="white", alpha=0.8))
+        
+        # Pulsador: círculo, unión con la línea y etiquetas (ocultos hasta la primera posición)
+        self._pulsador_marker, = ax.plot([], [], 'o', color='#1976d2', 
+                                         markersize=16, markeredgecolor='darkblue', 
+                                         markeredgewidth=3, label=self.t('virtual_position.button'), zorder=4)
+        self._pulsador_stem, = ax.plot([], [], color='#4caf50', linestyle='--', 
+                                       alpha=0.8, linewidth=2, zorder=2)
+        self._pulsador_label = ax.text(0, 0, '', 
+                                       bbox=dict(boxstyle="round,pad=0.5", 
+                                                 facecolor="#fff3e0", 
+                                                 edgecolor="#ff9800", 
+                                                 alpha=0.9),
+                                       fontsize=11, fontweight='bold',
+                                       ha='center', va='bottom', zorder=6, visible=False)
+        self._origin_distance_label = ax.text(0, 0, '', 
+                                              bbox=dict(boxstyle="round,pad=0.3", 
+                                                        facecolor="#e8f5e8", 
+                                                        edgecolor="#4caf50", 
+                                                        alpha=0.9),
+                                              fontsize=10, fontweight='bold',
+                                              ha='center', va='top', zorder=6, visible=False)
+        
+        # Trayectoria: segmentos y puntos con gradiente viridis de la más antigua a la más reciente
+        trajectory_norm = Normalize(0.0, 1.0)
+        self._trajectory_lines = LineCollection([], cmap='viridis', norm=trajectory_norm,
+                                                alpha=0.7, linewidths=3, zorder=2)
+        ax.add_collection(self._trajectory_lines)
+        self._trajectory_points = ax.scatter([], [], s=30, alpha=0.6, zorder=3)
+        self._trajectory_points.set_cmap('viridis')
+        self._trajectory_points.set_norm(trajectory_norm)
+        
+        self._build_virtual_legend()
+    
+    def _build_virtual_legend(self):
+        """(Re)crea la leyenda del gráfico de posición virtual."""
+        legend = self.virtual_ax.legend(loc='upper right', frameon=True, 
+                                        fancybox=True, shadow=True)
+        legend.get_frame().set_facecolor('white')
+        legend.get_frame().set_alpha(0.9)
         
     def setup_virtual_position_info_panel(self, parent):
         """Configura el panel de información para posición virtual."""
@@ -1511,135 +2295,53 @@ class InteractiveDetectionInterface:
         
     def update_virtual_position_display(self):
         """Actualiza la visualización de posición virtual con línea horizontal de 30 cm con origen en el extremo izquierdo."""
-        if not self.virtual_position_enabled.get():
+        if not self._virtual_position_enabled:
             return
-            
-        # Limpiar el gráfico manteniendo el estilo
-        self.virtual_ax.clear()
-        
-        # Reconfigurar estilo profesional
-        self.virtual_ax.set_facecolor('#f8f9fa')
-        self.virtual_ax.set_title(self.t('virtual_position.graph_title'), 
-                                 fontsize=14, fontweight='bold', pad=20)
-        self.virtual_ax.set_xlabel(self.t('virtual_position.position_x_label'), fontsize=12, fontweight='bold')
-        self.virtual_ax.set_ylabel(self.t('virtual_position.position_y_label'), fontsize=12, fontweight='bold')
-        self.virtual_ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
-        self.virtual_ax.set_aspect('equal')
-        
-        # Configurar límites para mostrar la línea de 0 a 30 cm con origen en el extremo izquierdo
-        self.virtual_ax.set_xlim(-5, 35)
-        self.virtual_ax.set_ylim(-10, 10)
         
-        # Dibujar línea horizontal de 30 cm (de 0 a 30 cm)
-        line_start = 0
-        line_end = 30
-        line_y = 0
-        
-        # Línea principal de 30 cm
-        self.virtual_ax.plot([line_start, line_end], [line_y, line_y], 
-                           color='#2c3e50', linewidth=8, alpha=0.8, 
-                           label=self.t('virtual_position.reference_line'), zorder=2)
-        
-        # Marcas de medición cada 5 cm
-        for x in range(line_start, line_end + 1, 5):
-            self.virtual_ax.plot([x, x], [line_y - 0.5, line_y + 0.5], 
-                               color='#34495e', linewidth=2, alpha=0.7)
-            # Etiquetas de medición
-            self.virtual_ax.text(x, line_y - 1.5, f'{x}', 
-                               ha='center', va='top', fontsize=9, 
-                               fontweight='bold', color='#2c3e50')
-        
-        # Marcar el origen (extremo izquierdo)
-        self.virtual_ax.plot(0, line_y, 's', color='#d32f2f', markersize=12, 
-                           markeredgecolor='darkred', markeredgewidth=2, 
-                           label='Origen (0,0)', zorder=5)
-        
-        # Marcar la posición del pórtico (keypoint D) - asumiendo que está a 15 cm del origen
-        portico_x = 15  # Posición del pórtico en el nuevo sistema de coordenadas
-        self.virtual_ax.plot(portico_x, line_y, '^', color='#ff9800', markersize=12, 
-                           markeredgecolor='darkorange', markeredgewidth=2, 
-                           label='Pórtico (Keypoint D)', zorder=5)
+        ax = self.virtual_ax
+        line_start, line_end, line_y = 0, VIRTUAL_LINE_LENGTH_CM, 0
         
         # Dibujar trayectoria del círculo si está habilitada
-        if self.show_trajectory.get() and len(self.virtual_position_history) > 1:
-            trajectory_x = [pos['x'] for pos in self.virtual_position_history]
-            trajectory_y = [line_y + 2] * len(trajectory_x)  # Mantener altura constante
-            
-            # Crear gradiente de color para la trayectoria
-            colors = plt.cm.viridis(np.linspace(0, 1, len(trajectory_x)))
-            
-            for i in range(len(trajectory_x) - 1):
-                self.virtual_ax.plot([trajectory_x[i], trajectory_x[i+1]], 
-                                   [trajectory_y[i], trajectory_y[i+1]], 
-                                   color=colors[i], alpha=0.7, linewidth=3)
-            
-            # Marcar puntos de la trayectoria
-            self.virtual_ax.scatter(trajectory_x[:-1], trajectory_y[:-1], 
-                                  c=colors[:-1], s=30, alpha=0.6, zorder=3)
-        
-        # Dibujar círculo del pulsador encima de la línea
-        if hasattr(self, 'pulsador_position'):
-            # La distancia calculada es la posición directa del pulsador desde el keypoint D del pórtico
-            # En nuestro sistema: pórtico está a 15 cm del origen, pulsador se mueve hacia la izquierda
-            distance_from_portico = self.pulsador_position['x']
-            
-            # Calcular posición absoluta: pórtico a 15 cm - distancia del pulsador al pórtico
-            px = portico_x - distance_from_portico  # El pulsador se mueve hacia el origen (izquierda)
-            
-            # Limitar la posición X del círculo a los límites de la línea
-            circle_x = max(line_start, min(line_end, px))
-            circle_y = line_y + 2  # 2 cm encima de la línea
-            
-            # Círculo del pulsador
-            self.virtual_ax.plot(circle_x, circle_y, 'o', color='#1976d2', 
-                               markersize=16, markeredgecolor='darkblue', 
-                               markeredgewidth=3, label=self.t('virtual_position.button'), zorder=4)
-            
-            # Línea vertical conectando el círculo con la línea
-            self.virtual_ax.plot([circle_x, circle_x], [line_y, circle_y], 
-                               color='#4caf50', linestyle='--', 
-                               alpha=0.8, linewidth=2, zorder=2)
-            
-            # Mostrar posición X del pulsador (absoluta desde el origen)
-            self.virtual_ax.text(circle_x, circle_y + 1.5, f'{circle_x:.1f} cm', 
-                               bbox=dict(boxstyle="round,pad=0.5", 
-                                       facecolor="#fff3e0", 
-                                       edgecolor="#ff9800", 
-                                       alpha=0.9),
-                               fontsize=11, fontweight='bold',
-                               ha='center', va='bottom', zorder=6)
-            
-            # Mostrar distancia desde el origen
-            distance_from_origin = circle_x
-            if distance_from_origin > 0.1:  # Solo mostrar si hay distancia significativa
-                mid_x = distance_from_origin / 2
-                self.virtual_ax.text(mid_x, line_y - 2.5, f'{self.t("virtual_position.distance_label")}: {distance_from_origin:.1f} cm', 
-                                   bbox=dict(boxstyle="round,pad=0.3", 
-                                           facecolor="#e8f5e8", 
-                                           edgecolor="#4caf50", 
-                                           alpha=0.9),
-                                   fontsize=10, fontweight='bold',
-                                   ha='center', va='top', zorder=6)
-        
-        # Añadir etiquetas de los extremos de la línea
-        self.virtual_ax.text(line_start, line_y + 4, '0 cm (Origen)', 
-                           ha='center', va='bottom', fontsize=10, 
-                           fontweight='bold', color='#2c3e50',
-                           bbox=dict(boxstyle="round,pad=0.3", 
-                                   facecolor="white", alpha=0.8))
-        self.virtual_ax.text(line_end, line_y + 4, '30 cm', 
-                           ha='center', va='bottom', fontsize=10, 
-                           fontweight='bold', color='#2c3e50',
-                           bbox=dict(boxstyle="round,pad=0.3", 
-                                   facecolor="white", alpha=0.8))
-        
-        # Leyenda con estilo
-        legend = self.virtual_ax.legend(loc='upper right', frameon=True, 
-                                      fancybox=True, shadow=True)
-        legend.get_frame().set_facecolor('white')
-        legend.get_frame().set_alpha(0.9)
-        
-        self.virtual_canvas.draw()
+        if self._show_trajectory and len(self.virtual_position_history) > 1:
+            trajectory_x = self.virtual_position_history.view()[:, 0]
+            points = np.column_stack((trajectory_x, np.full_like(trajectory_x, line_y + 2)))  # Altura constante
+            
+            # Gradiente de color: un valor por segmento/punto (el último punto es el pulsador)
+            shades = np.linspace(0, 1, len(points))[:-1]
+            self._trajectory_lines.set_segments(np.stack((points[:-1], points[1:]), axis=1))
+            self._trajectory_lines.set_array(shades)
+            self._trajectory_points.set_offsets(points[:-1])
+            self._trajectory_points.set_array(shades)
+        else:
+            self._trajectory_lines.set_segments([])
+            self._trajectory_points.set_offsets(np.empty((0, 2)))
+        
+        # La distancia calculada es la posición del pulsador respecto al keypoint D del pórtico;
+        # el pulsador se mueve hacia el origen (izquierda)
+        px = VIRTUAL_PORTICO_X_CM - self.pulsador_xy[0]
+        
+        # Limitar la posición X del círculo a los límites de la línea
+        circle_x = max(line_start, min(line_end, px))
+        circle_y = line_y + 2  # 2 cm encima de la línea
+        
+        self._pulsador_marker.set_data([circle_x], [circle_y])
+        self._pulsador_stem.set_data([circle_x, circle_x], [line_y, circle_y])
+        
+        # Posición X del pulsador (absoluta desde el origen)
+        self._pulsador_label.set_text(f'{circle_x:.1f} cm')
+        self._pulsador_label.set_position((circle_x, circle_y + 1.5))
+        self._pulsador_label.set_visible(True)
+        
+        # Distancia desde el origen, solo si es significativa
+        distance_from_origin = circle_x
+        self._origin_distance_label.set_visible(distance_from_origin > 0.1)
+        if distance_from_origin > 0.1:
+            self._origin_distance_label.set_text(
+                f'{self.t("virtual_position.distance_label")}: {distance_from_origin:.1f} cm')
+            self._origin_distance_label.set_position((distance_from_origin / 2, line_y - 2.5))
+        
+        # Restaurar el fondo y dibujar solo los elementos móviles
+        self.virtual_blit.update()
          
     def update_virtual_position(self, detections):
         """Actualiza la posición virtual basada en la distancia calculada por distance_calculator."""
@@ -1653,26 +2355,19 @@ class InteractiveDetectionInterface:
                 relative_x = distance_cm
                 relative_y = 0.0
                 
-                # Actualizar posiciones
-                self.pulsador_position = {'x': relative_x, 'y': relative_y}
-                self.portico_position = {'x': 0, 'y': 0}  # El pórtico es el origen
+                # Actualizar posición (el pórtico sigue en el origen)
+                self.pulsador_xy[0] = relative_x
+                self.pulsador_xy[1] = relative_y
                 
                 # Agregar a historial de trayectoria
-                if self.show_trajectory.get():
-                    self.virtual_position_history.append({
-                        'x': relative_x, 
-                        'y': relative_y,
-                        'timestamp': time.time()
-                    })
-                
-                # Actualizar etiquetas de posición
-                self.root.after(0, self.update_position_labels)
+                if self._show_trajectory:
+                    self.virtual_position_history.push((relative_x, relative_y, time.time()))
                 
-                # Actualizar visualización
-                self.root.after(0, self.update_virtual_position_display)
-                
-                # Actualizar información de posición virtual
-                self.root.after(0, self.update_virtual_info, detections)
+                # Etiquetas, gráfico e información se redibujan a ~30 FPS como mucho,
+                # siempre con la última posición
+                self._virtual_detections = detections
+                self._virtual_distance_cm = distance_cm
+                self.ui_batcher.post(self._schedule_virtual_redraw)
             else:
                 # Si no se puede calcular la distancia, mantener la última posición conocida
                 self.logger.debug("No se pudo calcular la distancia para la posición virtual")
@@ -1680,14 +2375,26 @@ class InteractiveDetectionInterface:
         except Exception as e:
             self.logger.error(f"Error actualizando posición virtual: {e}")
             
+    def _schedule_virtual_redraw(self):
+        """Programa un redibujado de la posición virtual si no hay ya uno pendiente (hilo de Tk)."""
+        if not self._virtual_redraw_pending:
+            self._virtual_redraw_pending = True
+            self.root.after(VIRTUAL_REDRAW_MS, self._redraw_virtual_position)
+    
+    def _redraw_virtual_position(self):
+        """Actualiza etiquetas, gráfico e información de la posición virtual."""
+        self._virtual_redraw_pending = False
+        self.update_position_labels()
+        self.update_virtual_position_display()
+        self.update_virtual_info(self._virtual_detections, self._virtual_distance_cm)
+    
     def update_position_labels(self):
         """Actualiza las etiquetas de posición en la interfaz."""
         try:
             # Calcular la posición absoluta del pulsador en el nuevo sistema de coordenadas
-            distance_from_portico = self.pulsador_position['x']  # Distancia calculada relativa al pórtico
+            distance_from_portico, py = self.pulsador_xy  # Posición relativa al pórtico
             portico_x = 15  # Posición del pórtico en el nuevo sistema de coordenadas
             px_absolute = portico_x - distance_from_portico  # Posición absoluta desde el origen (pórtico - distancia)
-            py = self.pulsador_position['y']
             
             # Distancia desde el origen (extremo izquierdo)
             distance_from_origin = px_absolute
@@ -1699,23 +2406,25 @@ class InteractiveDetectionInterface:
         except Exception as e:
             self.logger.error(f"Error actualizando etiquetas de posición: {e}")
             
-    def update_virtual_info(self, detections):
-        """Actualiza la información de posición virtual."""
+    def update_virtual_info(self, detections, distance_cm):
+        """Actualiza la información de posición virtual.
+        
+        Args:
+            detections: Detecciones del último frame
+            distance_cm: Distancia pulsador-pórtico ya calculada en update_virtual_position
+                (no se vuelve a calcular para no alimentar dos veces los filtros de movimiento)
+        """
         try:
             info_text = f"Timestamp: {time.strftime('%H:%M:%S')}\n"
             info_text += f"Fuente de datos: Distance Calculator (Postprocess)\n"
             info_text += f"Calibración automática: {'✅ Activa' if self.distance_calculator.auto_calibrated else '❌ Inactiva'}\n"
             info_text += f"Píxeles por cm: {self.distance_calculator.pixels_per_cm:.2f}\n\n"
             
-            # Calcular distancia usando el distance_calculator
-            distance_cm = self.distance_calculator.calculate_pulsador_portico_distance(detections)
-            
             if distance_cm is not None:
                 # Convertir posiciones al nuevo sistema de coordenadas
-                distance_from_portico = self.pulsador_position['x']  # Distancia relativa al pórtico
+                distance_from_portico, py = self.pulsador_xy  # Posición relativa al pórtico
                 portico_x = 15  # Posición del pórtico en el nuevo sistema
                 px_absolute = portico_x - distance_from_portico  # Posición absoluta desde el origen (pórtico - distancia)
-                py = self.pulsador_position['y']
                 
                 info_text += "=== POSICIÓN VIRTUAL (ORIGEN EN EXTREMO IZQUIERDO) ===\n"
                 info_text += f"Pulsador (posición absoluta desde origen):\n"
@@ -1730,15 +2439,15 @@ class InteractiveDetectionInterface:
                 info_text += f"Distancia pulsador-pórtico: {distance_cm:.3f} cm\n\n"
                 
                 # Información de trayectoria
-                if self.show_trajectory.get():
+                if self._show_trajectory:
                     info_text += f"Puntos en trayectoria: {len(self.virtual_position_history)}\n"
                     if len(self.virtual_position_history) > 1:
                         # Calcular velocidad aproximada
-                        recent_points = list(self.virtual_position_history)[-5:]
+                        recent_points = self.virtual_position_history.view()[-5:]
                         if len(recent_points) >= 2:
-                            dt = recent_points[-1]['timestamp'] - recent_points[0]['timestamp']
+                            dt = recent_points[-1, 2] - recent_points[0, 2]
                             if dt > 0:
-                                dx = recent_points[-1]['x'] - recent_points[0]['x']
+                                dx = recent_points[-1, 0] - recent_points[0, 0]
                                 velocity = abs(dx) / dt  # Velocidad en X (horizontal)
                                 info_text += f"Velocidad horizontal: {velocity:.2f} cm/s\n"
                 
@@ -1762,9 +2471,9 @@ class InteractiveDetectionInterface:
                 info_text += "- Keypoints visibles\n"
                 info_text += "- Calibración automática\n"
             
-            # Actualizar texto
-            self.virtual_info.delete(1.0, tk.END)
-            self.virtual_info.insert(1.0, info_text)
+            # Actualizar texto (solo las líneas que han cambiado)
+            self._virtual_info_lines = _replace_changed_lines(self.virtual_info, self._virtual_info_lines,
+                                                              info_text.split("\n"))
             self.virtual_info.see(tk.END)
             
         except Exception as e:
@@ -1781,27 +2490,27 @@ class InteractiveDetectionInterface:
             
     def update_cal_label(self, *args):
         """Actualiza la etiqueta de calibración."""
-        self.cal_label.config(text=self.t('calibration_label', value=self.pixels_per_cm.get()))
+        self.cal_label.config(text=self.fmt('postprocess.calibration_label')(value=self.pixels_per_cm.get()))
         self.distance_calculator.set_calibration(self.pixels_per_cm.get())
         
     def update_marker_cal_label(self, *args):
         """Actualiza la etiqueta de calibración del marcador."""
-        self.marker_cal_label.config(text=self.t('marker_calibration_label', value=self.marker_pixels_per_cm.get()))
+        self.marker_cal_label.config(text=self.fmt('postprocess.marker_calibration_label')(value=self.marker_pixels_per_cm.get()))
         self.marker_distance_calculator.set_calibration(self.marker_pixels_per_cm.get())
         
     def update_dist_threshold_label(self, *args):
         """Actualiza la etiqueta del umbral de distancia."""
-        self.dist_threshold_label.config(text=self.t('distance_threshold_label', value=self.distance_threshold.get()))
+        self.dist_threshold_label.config(text=self.fmt('postprocess.distance_threshold_label')(value=self.distance_threshold.get()))
         self.update_movement_filters()
         
     def update_vel_threshold_label(self, *args):
         """Actualiza la etiqueta del umbral de velocidad."""
-        self.vel_threshold_label.config(text=self.t('velocity_threshold_label', value=self.velocity_threshold.get()))
+        self.vel_threshold_label.config(text=self.fmt('postprocess.velocity_threshold_label')(value=self.velocity_threshold.get()))
         self.update_movement_filters()
         
     def update_temp_window_label(self, *args):
         """Actualiza la etiqueta de la ventana temporal."""
-        self.temp_window_label.config(text=self.t('temporal_window_label', value=self.temporal_window.get()))
+        self.temp_window_label.config(text=self.fmt('postprocess.temporal_window_label')(value=self.temporal_window.get()))
         self.update_movement_filters()
         
     def update_coord_size_label(self, *args):
@@ -1850,21 +2559,26 @@ class InteractiveDetectionInterface:
                 source = int(source)
             
             # Inicializar captura de video
-            self.postprocess_capture = cv2.VideoCapture(source)
+            self.postprocess_capture = create_capture(source, self.rtsp_transport)
             
             if not self.postprocess_capture.isOpened():
                 messagebox.showerror("Error", f"No se pudo abrir la fuente de video: {source}")
                 return
             
             # Configurar captura
-            self.postprocess_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.postprocess_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            self._configure_capture(self.postprocess_capture, source)
+            self.postprocess_grabber = self._start_grabber(self.postprocess_capture, source)
             
             self.postprocess_running = True
             
-            # Iniciar hilo de postprocesamiento
-            self.postprocess_thread = threading.Thread(target=self.postprocess_loop, daemon=True)
+            # Captura (FrameGrabber) -> inferencia -> postprocesamiento y dibujo, en hilos solapados
+            draw_slot = _SingleSlot()
+            self.postprocess_thread = threading.Thread(target=self.postprocess_loop, args=(draw_slot,),
+                                                       daemon=True)
+            self.postprocess_draw_thread = threading.Thread(target=self.postprocess_draw_loop,
+                                                            args=(draw_slot,), daemon=True)
             self.postprocess_thread.start()
+            self.postprocess_draw_thread.start()
             
             # Actualizar interfaz
             self.start_postprocess_button.config(state="disabled")
@@ -1881,6 +2595,10 @@ class InteractiveDetectionInterface:
         """Detiene el postprocesamiento."""
         self.postprocess_running = False
         
+        if self.postprocess_grabber:
+            self.postprocess_grabber.stop()
+            self.postprocess_grabber = None
+        
         if self.postprocess_capture:
             self.postprocess_capture.release()
             self.postprocess_capture = None
@@ -1895,22 +2613,64 @@ class InteractiveDetectionInterface:
         
         self.logger.info("Postprocesamiento detenido")
         
-    def postprocess_loop(self):
-        """Bucle principal de postprocesamiento."""
-        fps_counter = 0
-        fps_start_time = time.time()
+    def postprocess_loop(self, draw_slot):
+        """Etapa de inferencia del postprocesamiento: lee frames y los pasa al dibujo con sus detecciones.
+        
+        Args:
+            draw_slot: _SingleSlot hacia postprocess_draw_loop
+        """
+        detect = FrameDiffGate(self.infer_worker.submit, self.diff_gate_threshold,
+                               max_reuse=self.diff_gate_max_reuse)
+        pacer = self._file_pacer(self.postprocess_capture, self.postprocess_grabber)
         
         while self.postprocess_running:
             try:
-                ret, frame = self.postprocess_capture.read()
+                ret, frame = self._read_frame(self.postprocess_capture, self.postprocess_grabber)
                 
                 if not ret:
                     self.logger.warning("No se pudo leer frame en postprocesamiento")
                     break
                 
-                # Realizar detección
-                detections = self.detector.get_detections_data(frame)
+                # Realizar detección (YOLO solo si la escena cambió)
+                detect.enabled = self._skip_static_frames
+                detections = detect(frame)
+                
+                # El postprocesamiento va en su propio hilo; si aún no terminó el anterior, se reemplaza
+                if not draw_slot.put((frame, detections)):
+                    break
+                
+                # Archivos: mantener el ritmo de reproducción saltando o esperando
+                if pacer is not None:
+                    pacer.tick()
                 
+            except Exception as e:
+                self.logger.error(f"Error en bucle de postprocesamiento: {e}")
+                break
+        
+        draw_slot.close()
+        
+        # Limpiar al salir
+        if self.postprocess_grabber:
+            self.postprocess_grabber.stop()
+        if self.postprocess_capture:
+            self.postprocess_capture.release()
+    
+    def postprocess_draw_loop(self, draw_slot):
+        """Etapa de dibujo del postprocesamiento: distancias, superposiciones, gráficos y canvas.
+        
+        Args:
+            draw_slot: _SingleSlot desde postprocess_loop
+        """
+        fps_counter = 0
+        fps_start_time = time.perf_counter()
+        
+        while True:
+            item = draw_slot.get()
+            if item is None:
+                break
+            frame, detections = item
+            
+            try:
                 # Procesar frame con distancias
                 processed_frame = self.process_frame_with_options(frame, detections)
                 
@@ -1921,13 +2681,15 @@ class InteractiveDetectionInterface:
                 self.update_distance_info(detections)
                 
                 # Actualizar posición virtual si está habilitada
-                if self.virtual_position_running and self.coordinate_system_calibrated.get():
+                if self.virtual_position_running and self._coordinate_system_calibrated:
                     self.update_virtual_position(detections)
                 
                 # Calcular FPS y actualizar estadísticas
                 fps_counter += 1
-                if time.time() - fps_start_time >= 1.0:
-                    fps = fps_counter / (time.time() - fps_start_time)
+                now = time.perf_counter()
+                elapsed = now - fps_start_time
+                if elapsed >= 1.0:
+                    fps = fps_counter / elapsed
                     distance_cm = self.distance_calculator.calculate_pulsador_portico_distance(detections)
                     marker_distance_cm = self.marker_distance_calculator.calculate_marker_distance(detections)
                     
@@ -1937,47 +2699,32 @@ class InteractiveDetectionInterface:
                     # Actualizar estadísticas para gráficos
                     self.update_statistics(detections, distance_cm, fps)
                     
-                    self.root.after(0, lambda: self.postprocess_status_text.set(
-                        f"FPS: {fps:.1f} | Pulsador-Pórtico: {distance_text} | Marcador: {marker_distance_text}"))
+                    self.ui_batcher.post(self.postprocess_status_text.set,
+                                         f"FPS: {fps:.1f} | Pulsador-Pórtico: {distance_text} | Marcador: {marker_distance_text}")
                     fps_counter = 0
-                    fps_start_time = time.time()
-                
-                time.sleep(0.01)  # Pequeña pausa para no saturar la CPU
+                    fps_start_time = now
                 
             except Exception as e:
-                self.logger.error(f"Error en bucle de postprocesamiento: {e}")
+                self.logger.error(f"Error en dibujo de postprocesamiento: {e}")
                 break
         
-        # Limpiar al salir
-        if self.postprocess_capture:
-            self.postprocess_capture.release()
+        # Detener también la etapa de inferencia
+        draw_slot.close()
             
     def display_postprocess_frame(self, frame):
         """Muestra el frame procesado en el canvas de postprocesamiento."""
-        # Redimensionar frame para ajustarse al canvas
-        canvas_width = self.postprocess_canvas.winfo_width()
-        canvas_height = self.postprocess_canvas.winfo_height()
-        
-        if canvas_width > 1 and canvas_height > 1:
-            frame_resized = cv2.resize(frame, (canvas_width, canvas_height))
-        else:
-            frame_resized = frame
-        
-        # Convertir de BGR a RGB
-        frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
+        # Limitar la tasa de refresco del canvas
+        if not self.postprocess_photo_buffer.due():
+            return
         
-        # Convertir a formato PIL
-        image_pil = Image.fromarray(frame_rgb)
-        image_tk = ImageTk.PhotoImage(image_pil)
+        # Redimensionar frame para ajustarse al canvas
+        frame_resized = self.postprocess_photo_buffer.fit(frame)
         
-        # Actualizar canvas en el hilo principal
-        self.root.after(0, self._update_postprocess_canvas, image_tk)
+        # Convertir a formato PIL (BGR -> RGB)
+        image_pil = _frame_to_pil(frame_resized)
         
-    def _update_postprocess_canvas(self, image_tk):
-        """Actualiza el canvas de postprocesamiento con la nueva imagen."""
-        self.postprocess_canvas.delete("all")
-        self.postprocess_canvas.create_image(0, 0, anchor=tk.NW, image=image_tk)
-        self.postprocess_canvas.image = image_tk  # Mantener referencia
+        # Actualizar canvas en el hilo principal, junto con el resto del trabajo ocioso
+        self.ui_batcher.post(self.postprocess_photo_buffer.show, image_pil)
         
     def update_distance_info(self, detections):
         """Actualiza la información de distancias."""
@@ -1985,8 +2732,8 @@ class InteractiveDetectionInterface:
         marker_distance_info = self.marker_distance_calculator.get_distance_info(detections)
         
         info_text = f"Timestamp: {time.strftime('%H:%M:%S')}\n"
-        info_text += f"Factor calibración pulsador-pórtico: {self.pixels_per_cm.get():.1f} px/cm\n"
-        info_text += f"Factor calibración marcador: {self.marker_pixels_per_cm.get():.1f} px/cm\n\n"
+        info_text += f"Factor calibración pulsador-pórtico: {self._pixels_per_cm:.1f} px/cm\n"
+        info_text += f"Factor calibración marcador: {self._marker_pixels_per_cm:.1f} px/cm\n\n"
         
         # Información distancia pulsador-pórtico
         info_text += "=== DISTANCIA PULSADOR-PÓRTICO ===\n"
@@ -2057,7 +2804,7 @@ class InteractiveDetectionInterface:
                 info_text += f"\nError obteniendo estadísticas de filtros: {e}\n"
         
         # Actualizar texto en el hilo principal
-        self.root.after(0, self._update_distance_text, info_text)
+        self.ui_batcher.post(self._update_distance_text, info_text)
         
     def _update_distance_text(self, text):
         """Actualiza el texto de información de distancias."""
@@ -2163,31 +2910,31 @@ class InteractiveDetectionInterface:
     
     def process_frame_with_options(self, frame, detections):
         """Procesa el frame aplicando las opciones de visualización seleccionadas."""
-        processed_frame = frame.copy()
-        
-        # Aplicar opciones de visualización para distancia pulsador-pórtico
-        if self.show_distance.get() or self.show_distance_line.get():
-            processed_frame = self.distance_calculator.draw_distance_on_frame(
-                processed_frame, detections, 
-                show_distance=self.show_distance.get(),
-                show_line=self.show_distance_line.get()
-            )
+        steps = self._frame_steps
+        if not steps and not self._show_coordinate_system:
+            return frame
         
-        # Aplicar opciones de visualización para distancia marcador
-        if self.show_marker_distance.get() or self.show_marker_distance_line.get():
-            processed_frame = self.marker_distance_calculator.draw_distance_on_frame(
-                processed_frame, detections, 
-                show_distance=self.show_marker_distance.get(),
-                show_line=self.show_marker_distance_line.get()
-            )
+        # Se dibuja in-place sobre el frame capturado, que no se usa en ninguna otra etapa
+        # (con OpenCL se sube una vez al dispositivo); los calculadores dibujan in-place
+        processed_frame = cv2.UMat(frame) if self.use_opencl and steps else frame
+        
+        # Distancias pulsador-pórtico y del marcador, según las opciones activas (el alto se
+        # pasa explícitamente porque cv2.UMat no expone su tamaño)
+        frame_height = frame.shape[0]
+        for step in steps:
+            processed_frame = step(processed_frame, detections, frame_height=frame_height)
+        
+        # Volver a memoria de CPU para las copias por ROI de los ejes y para PIL
+        if isinstance(processed_frame, cv2.UMat):
+            processed_frame = processed_frame.get()
         
         # Aplicar sistema de coordenadas si está habilitado
-        if self.show_coordinate_system.get():
+        if self._show_coordinate_system:
             # Actualizar configuración del dibujador si ha cambiado
-            if (self.coordinate_drawer.position != self.coordinate_position.get() or 
-                self.coordinate_drawer.size != self.coordinate_size.get()):
-                self.coordinate_drawer.set_position(self.coordinate_position.get())
-                self.coordinate_drawer.set_size(self.coordinate_size.get())
+            if (self.coordinate_drawer.position != self._coordinate_position or 
+                self.coordinate_drawer.size != self._coordinate_size):
+                self.coordinate_drawer.set_position(self._coordinate_position)
+                self.coordinate_drawer.set_size(self._coordinate_size)
             
             processed_frame = self.coordinate_drawer.draw_coordinate_system(processed_frame)
         
@@ -2197,7 +2944,7 @@ class InteractiveDetectionInterface:
         """Actualiza las estadísticas para los gráficos."""
         # Actualizar historial de distancias
         if distance_cm is not None:
-            self.distance_history.append(distance_cm)
+            self.distance_history.push(distance_cm)
         
         # Actualizar estadísticas de detección
         for detection in detections:
@@ -2206,15 +2953,13 @@ class InteractiveDetectionInterface:
                 self.detection_stats[class_name] += 1
         
         # Actualizar historial de FPS
-        self.fps_history.append(fps)
+        self.fps_history.push(fps)
         
         # Actualizar historial de confianza
-        for detection in detections:
-            confidence = detection.get('confidence', 0)
-            self.confidence_history.append(confidence)
+        self.confidence_history.extend(detection.get('confidence', 0) for detection in detections)
         
         # Actualizar gráficos en la pestaña de datos
-        self.root.after(0, self.update_data_plots)
+        self.ui_batcher.post(self.update_data_plots)
     
     def setup_data_tab(self):
         """Configura la pestaña de datos con gráficos."""
@@ -2242,6 +2987,9 @@ class InteractiveDetectionInterface:
         
         # Configurar gráficos de rendimiento
         self.setup_performance_plots(performance_frame)
+        
+        # Mostrar lo acumulado mientras la pestaña no existía
+        self.update_data_plots()
     
     def setup_distance_plots(self, parent):
         """Configura los gráficos de distancias."""
@@ -2256,8 +3004,18 @@ class InteractiveDetectionInterface:
         self.distance_ax.set_xlabel(self.t("data.time_samples"))
         self.distance_ax.set_ylabel(self.t("data.distance_cm"))
         self.distance_ax.grid(True, alpha=0.3)
+        self.distance_ax.set_xlim(0, self.distance_history.capacity - 1)
+        
+        # Artistas persistentes: se actualizan sus datos y se redibujan con blitting
+        self.distance_line, = self.distance_ax.plot([], [], 'b-', linewidth=2)
+        self.distance_avg_line = self.distance_ax.axhline(y=0, color='r', linestyle='--',
+                                                          label=self.t("data.average"), visible=False)
+        self.distance_legend = self.distance_ax.legend()
+        self.distance_legend.set_visible(False)
         
         self.distance_canvas = FigureCanvasTkAgg(self.distance_fig, top_frame)
+        self.distance_blit = _BlitManager(self.distance_canvas,
+                                          [self.distance_line, self.distance_avg_line, self.distance_legend])
         self.distance_canvas.draw()
         self.distance_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
@@ -2290,6 +3048,15 @@ class InteractiveDetectionInterface:
         self.detection_ax1 = self.detection_fig.add_subplot(121)
         self.detection_ax1.set_title(self.t("data.detection_count_title"))
         self.detection_ax1.set_ylabel(self.t("data.detection_number"))
+        self.detection_ax1.set_ylim(0, 10)
+        
+        classes = list(self.detection_stats.keys())
+        self.detection_bars = self.detection_ax1.bar(classes, [0] * len(classes),
+                                                     color=['red', 'green', 'blue'])
+        self.detection_bar_labels = [
+            self.detection_ax1.text(bar.get_x() + bar.get_width() / 2., 0.1, '0', ha='center', va='bottom')
+            for bar in self.detection_bars
+        ]
         
         # Gráfico de confianza promedio
         self.detection_ax2 = self.detection_fig.add_subplot(122)
@@ -2297,8 +3064,14 @@ class InteractiveDetectionInterface:
         self.detection_ax2.set_xlabel(self.t("data.time_samples"))
         self.detection_ax2.set_ylabel(self.t("data.confidence"))
         self.detection_ax2.grid(True, alpha=0.3)
+        self.detection_ax2.set_xlim(0, self.confidence_history.capacity - 1)
+        self.detection_ax2.set_ylim(0, 1)
+        self.confidence_line, = self.detection_ax2.plot([], [], 'g-', alpha=0.7)
         
         self.detection_canvas = FigureCanvasTkAgg(self.detection_fig, stats_frame)
+        self.detection_blit = _BlitManager(self.detection_canvas,
+                                           list(self.detection_bars) + self.detection_bar_labels
+                                           + [self.confidence_line])
         self.detection_canvas.draw()
         self.detection_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
     
@@ -2316,6 +3089,12 @@ class InteractiveDetectionInterface:
         self.fps_ax.set_title(self.t("data.system_performance_fps"))
         self.fps_ax.set_ylabel(self.t("data.fps"))
         self.fps_ax.grid(True, alpha=0.3)
+        self.fps_ax.set_xlim(0, self.fps_history.capacity - 1)
+        self.fps_line, = self.fps_ax.plot([], [], 'r-', linewidth=2)
+        self.fps_avg_line = self.fps_ax.axhline(y=0, color='orange', linestyle='--',
+                                                label='FPS Promedio', visible=False)
+        self.fps_legend = self.fps_ax.legend()
+        self.fps_legend.set_visible(False)
         
         # Gráfico de estadísticas en tiempo real
         self.stats_ax = self.performance_fig.add_subplot(212)
@@ -2325,6 +3104,8 @@ class InteractiveDetectionInterface:
         self.stats_ax.grid(True, alpha=0.3)
         
         self.performance_canvas = FigureCanvasTkAgg(self.performance_fig, perf_frame)
+        self.performance_blit = _BlitManager(self.performance_canvas,
+                                             [self.fps_line, self.fps_avg_line, self.fps_legend])
         self.performance_canvas.draw()
         self.performance_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
@@ -2338,6 +3119,10 @@ class InteractiveDetectionInterface:
     
     def update_data_plots(self):
         """Actualiza todos los gráficos de datos."""
+        # Pestaña de datos aún sin construir: los historiales se siguen acumulando
+        if not hasattr(self, 'performance_blit'):
+            return
+        
         try:
             self.update_distance_plots()
             self.update_detection_plots()
@@ -2348,99 +3133,90 @@ class InteractiveDetectionInterface:
     def update_distance_plots(self):
         """Actualiza los gráficos de distancias."""
         if len(self.distance_history) > 0:
-            # Actualizar gráfico de historial
-            self.distance_ax.clear()
-            self.distance_ax.plot(list(self.distance_history), 'b-', linewidth=2)
-            self.distance_ax.set_title(self.t("data.distance_realtime_title"))
-            self.distance_ax.set_xlabel(self.t("data.time_samples"))
-            self.distance_ax.set_ylabel(self.t("data.distance_cm"))
-            self.distance_ax.grid(True, alpha=0.3)
+            distances = self.distance_history.view()
+            
+            # Actualizar gráfico de historial (solo línea, media y leyenda)
+            self.distance_line.set_data(np.arange(len(distances)), distances)
             
             # Agregar líneas de referencia
-            if len(self.distance_history) > 0:
-                avg_distance = np.mean(self.distance_history)
-                self.distance_ax.axhline(y=avg_distance, color='r', linestyle='--', 
-                                       label=f'{self.t("data.average")}: {avg_distance:.2f} cm')
-                self.distance_ax.legend()
+            avg_distance = np.mean(distances)
+            self.distance_avg_line.set_ydata([avg_distance, avg_distance])
+            self.distance_avg_line.set_visible(True)
+            self.distance_legend.get_texts()[0].set_text(f'{self.t("data.average")}: {avg_distance:.2f} cm')
+            self.distance_legend.set_visible(True)
+            
+            self.distance_blit.update(full=_fit_ylim(self.distance_ax, distances))
             
             # Actualizar histograma
             self.distance_hist_ax.clear()
-            self.distance_hist_ax.hist(list(self.distance_history), bins=20, 
+            self.distance_hist_ax.hist(distances, bins=20, 
                                      alpha=0.7, color='skyblue', edgecolor='black')
             self.distance_hist_ax.set_title(self.t("data.distance_distribution"))
             self.distance_hist_ax.set_xlabel(self.t("data.distance_cm"))
             self.distance_hist_ax.set_ylabel(self.t("data.frequency"))
             self.distance_hist_ax.grid(True, alpha=0.3)
             
-            # Redibujar
-            self.distance_canvas.draw()
+            # Redibujar (el histograma cambia de bins y límites: redibujado completo)
             self.distance_hist_canvas.draw()
     
     def update_detection_plots(self):
         """Actualiza los gráficos de detecciones."""
         # Actualizar gráfico de barras
-        self.detection_ax1.clear()
-        classes = list(self.detection_stats.keys())
         counts = list(self.detection_stats.values())
-        colors = ['red', 'green', 'blue']
-        
-        bars = self.detection_ax1.bar(classes, counts, color=colors)
-        self.detection_ax1.set_title(self.t("data.detection_count_title"))
-        self.detection_ax1.set_ylabel(self.t("data.detection_number"))
+        for bar, label, count in zip(self.detection_bars, self.detection_bar_labels, counts):
+            bar.set_height(count)
+            
+            # Agregar valores en las barras
+            label.set_y(count + 0.1)
+            label.set_text(f'{count}')
         
-        # Agregar valores en las barras
-        for bar, count in zip(bars, counts):
-            height = bar.get_height()
-            self.detection_ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                                  f'{count}', ha='center', va='bottom')
+        # Ampliar el eje Y (y redibujar el fondo) solo cuando las barras no caben
+        full = max(counts) * 1.1 > self.detection_ax1.get_ylim()[1]
+        if full:
+            self.detection_ax1.set_ylim(0, max(counts) * 1.5)
         
         # Actualizar gráfico de confianza
-        if len(self.confidence_history) > 0:
-            self.detection_ax2.clear()
-            self.detection_ax2.plot(list(self.confidence_history), 'g-', alpha=0.7)
-            self.detection_ax2.set_title(self.t("data.confidence_history"))
-            self.detection_ax2.set_xlabel(self.t("data.time_samples"))
-            self.detection_ax2.set_ylabel(self.t("data.confidence"))
-            self.detection_ax2.grid(True, alpha=0.3)
-            self.detection_ax2.set_ylim(0, 1)
+        confidences = self.confidence_history.view()
+        self.confidence_line.set_data(np.arange(len(confidences)), confidences)
         
         # Redibujar
-        self.detection_canvas.draw()
+        self.detection_blit.update(full)
     
     def update_performance_plots(self):
         """Actualiza los gráficos de rendimiento."""
         # Actualizar gráfico de FPS
-        if len(self.fps_history) > 0:
-            self.fps_ax.clear()
-            self.fps_ax.plot(list(self.fps_history), 'r-', linewidth=2)
-            self.fps_ax.set_title(self.t("data.system_performance_fps"))
-            self.fps_ax.set_ylabel('FPS')
-            self.fps_ax.grid(True, alpha=0.3)
+        fps_values = self.fps_history.view()
+        full = False
+        if len(fps_values) > 0:
+            self.fps_line.set_data(np.arange(len(fps_values)), fps_values)
             
             # Agregar línea de FPS promedio
-            avg_fps = np.mean(self.fps_history)
-            self.fps_ax.axhline(y=avg_fps, color='orange', linestyle='--', 
-                              label=f'FPS Promedio: {avg_fps:.1f}')
-            self.fps_ax.legend()
+            avg_fps = np.mean(fps_values)
+            self.fps_avg_line.set_ydata([avg_fps, avg_fps])
+            self.fps_avg_line.set_visible(True)
+            self.fps_legend.get_texts()[0].set_text(f'FPS Promedio: {avg_fps:.1f}')
+            self.fps_legend.set_visible(True)
+            full = _fit_ylim(self.fps_ax, fps_values)
         
         # Actualizar información del sistema
         current_time = datetime.now().strftime("%H:%M:%S")
         info_text = f"Última actualización: {current_time}\n"
         info_text += f"Total de muestras de distancia: {len(self.distance_history)}\n"
-        info_text += f"FPS promedio: {np.mean(self.fps_history):.2f}\n" if self.fps_history else "FPS promedio: N/A\n"
-        info_text += f"Confianza promedio: {np.mean(self.confidence_history):.3f}\n" if self.confidence_history else "Confianza promedio: N/A\n"
+        info_text += f"FPS promedio: {np.mean(fps_values):.2f}\n" if len(fps_values) else "FPS promedio: N/A\n"
+        info_text += f"Confianza promedio: {np.mean(self.confidence_history.view()):.3f}\n" if len(self.confidence_history) else "Confianza promedio: N/A\n"
         
         if len(self.distance_history) > 0:
-            info_text += f"Distancia actual: {self.distance_history[-1]:.2f} cm\n"
-            info_text += f"Distancia promedio: {np.mean(self.distance_history):.2f} cm\n"
-            info_text += f"Distancia mínima: {np.min(self.distance_history):.2f} cm\n"
-            info_text += f"Distancia máxima: {np.max(self.distance_history):.2f} cm\n"
+            distances = self.distance_history.view()
+            info_text += f"Distancia actual: {self.distance_history.last():.2f} cm\n"
+            info_text += f"Distancia promedio: {np.mean(distances):.2f} cm\n"
+            info_text += f"Distancia mínima: {np.min(distances):.2f} cm\n"
+            info_text += f"Distancia máxima: {np.max(distances):.2f} cm\n"
         
         self.system_info.delete(1.0, tk.END)
         self.system_info.insert(1.0, info_text)
         
         # Redibujar
-        self.performance_canvas.draw()
+        self.performance_blit.update(full)
     
     def toggle_mqtt(self):
         """Habilita o deshabilita MQTT."""
@@ -2533,6 +3309,13 @@ class InteractiveDetectionInterface:
         if self.postprocess_running:
             self.stop_postprocessing()
         
+        self.infer_worker.stop()
+        
+        # Soltar los traces de las etiquetas (retienen sus callbacks y, con ellos, la interfaz)
+        for var, trace_id in self._label_traces:
+            var.trace_remove('write', trace_id)
+        self._label_traces = []
+        
         # Limpiar recursos MQTT
         try:
             if hasattr(self, 'distance_calculator'):
@@ -3,7 +3,7 @@ import json
 import time
 import logging
 import threading
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from paho.mqtt import client as mqtt_client
 from .config.config import Config
 
@@ -51,6 +51,9 @@ class DicapuaPublisher:
         self.reconnect_thread: Optional[threading.Thread] = None
         self.connection_lock = threading.Lock()
         
+        # Callback opcional notificado en cada cambio de conexión DicapuaIoT
+        self.on_connection_change: Optional[Callable[[bool], None]] = None
+        
     def on_dicapua_message(self, client, userdata, msg):
         """Callback para mensajes recibidos de DicapuaIoT"""
         try:
@@ -95,6 +98,15 @@ class DicapuaPublisher:
         except Exception as e:
             print(f"❌ Error procesando mensaje local: {e}")
     
+    def _notify_connection_change(self, connected: bool) -> None:
+        """Notifica al callback registrado un cambio de estado de la conexión DicapuaIoT"""
+        if self.on_connection_change is None:
+            return
+        try:
+            self.on_connection_change(connected)
+        except Exception as e:
+            self.logger.error(f"❌ Error en callback de conexión: {e}")
+    
     def connect_dicapua_mqtt(self) -> mqtt_client.Client:
         """Conecta al broker DicapuaIoT externo"""
         def on_dicapua_connect(client, userdata, flags, rc):
@@ -106,10 +118,12 @@ class DicapuaPublisher:
                 self.logger.error(f"❌ Error conectando a DicapuaIoT, código: {rc}")
                 self.dicapua_connected = False
                 self.dicapuaiot_connected = False
+            self._notify_connection_change(self.dicapua_connected)
         
         def on_dicapua_disconnect(client, userdata, rc):
             self.dicapua_connected = False
             self.dicapuaiot_connected = False
+            self._notify_connection_change(False)
             if rc != 0:
                 disconnect_codes = {
                     1: "Versión de protocolo no aceptable",
@@ -367,6 +381,7 @@ class DicapuaPublisher:
             self.dicapua_client.loop_stop()
             self.dicapua_client.disconnect()
             self.dicapua_connected = False
+            self._notify_connection_change(False)
             self.logger.info("🔌 Cliente DicapuaIoT detenido")
         
         if self.local_client:
@@ -0,0 +1,114 @@
+"""Componentes compartidos por los scripts de postprocesamiento en tiempo real.
+
+RealtimePipeline agrupa el detector YOLO, los calculadores de distancia y el
+dibujador de ejes que construían por separado run_coordinate_axis_demo.py y
+run_postprocess_with_coordinates.py, y aplica el postprocesamiento a cada frame.
+"""
+
+import sys
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import cv2
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.append(str(Path(__file__).parent))
+
+from vision.detector import YOLOPoseDetector
+from postprocess.distance_calculator import DistanceCalculator
+from postprocess.marker_distance_calculator import MarkerDistanceCalculator
+from postprocess.coordinate_axis_drawer import CoordinateAxisDrawer
+
+
+class RealtimePipeline:
+    """Detector, calculadores de distancia y sistema de coordenadas de los demos.
+
+    Los componentes se construyen la primera vez que se usan; los pesos YOLO se
+    cargan una sola vez por proceso (ver YOLOPoseDetector.load_model).
+    """
+
+    def __init__(self, config_path: str = "config/config.yaml", pixels_per_cm: float = 10.0,
+                 position: str = "bottom_right", size: int = 80, margin: int = 30):
+        """
+        Guarda la configuración de los componentes (se construyen bajo demanda).
+
+        Args:
+            config_path: Ruta al archivo de configuración
+            pixels_per_cm: Relación píxeles/cm inicial de los calculadores
+            position: Posición del sistema de coordenadas
+            size: Tamaño de los ejes en píxeles
+            margin: Margen desde el borde del frame
+        """
+        self.config_path = config_path
+        self.pixels_per_cm = pixels_per_cm
+        self.position = position
+        self.size = size
+        self.margin = margin
+        self.model_loaded = False
+
+    @cached_property
+    def detector(self) -> YOLOPoseDetector:
+        """Detector YOLO con el modelo ya cargado (model_loaded indica si se pudo cargar)."""
+        detector = YOLOPoseDetector(self.config_path)
+        self.model_loaded = detector.load_model()
+        return detector
+
+    @cached_property
+    def distance_calculator(self) -> DistanceCalculator:
+        """Calculador de distancia pulsador-pórtico."""
+        return DistanceCalculator(pixels_per_cm=self.pixels_per_cm)
+
+    @cached_property
+    def marker_calculator(self) -> MarkerDistanceCalculator:
+        """Calculador de distancia del marcador."""
+        return MarkerDistanceCalculator(pixels_per_cm=self.pixels_per_cm)
+
+    @cached_property
+    def coord_drawer(self) -> CoordinateAxisDrawer:
+        """Dibujador del sistema de coordenadas."""
+        return CoordinateAxisDrawer(position=self.position, size=self.size, margin=self.margin)
+
+    def process(self, frame: Union[np.ndarray, cv2.UMat], detections: Optional[List[Dict]] = None,
+                draw_detections: bool = False, use_opencl: bool = False) -> np.ndarray:
+        """
+        Dibuja detecciones, distancias y sistema de coordenadas sobre el frame (in-place).
+
+        Args:
+            frame: Frame de video (numpy, o cv2.UMat ya subido)
+            detections: Detecciones del frame; si es None se ejecuta el detector
+            draw_detections: Si dibujar también cajas y keypoints
+            use_opencl: Subir el frame a un cv2.UMat y dibujar las superposiciones con OpenCL
+
+        Returns:
+            Frame procesado en memoria de CPU
+        """
+        if detections is None:
+            detections = self.detector.get_detections_data(frame)
+
+        # cv2.UMat no expone su tamaño: tomarlo del array antes de subirlo
+        frame_height = frame.shape[0] if isinstance(frame, np.ndarray) else None
+        if use_opencl and isinstance(frame, np.ndarray):
+            frame = cv2.UMat(frame)
+
+        if draw_detections:
+            frame = self.detector.draw_detections(frame, detections, inplace=True)
+
+        if detections:
+            # Distancia pulsador-pórtico
+            frame = self.distance_calculator.draw_distance_on_frame(
+                frame, detections, show_distance=True, show_line=True, inplace=True,
+                frame_height=frame_height
+            )
+
+            # Distancia del marcador
+            frame = self.marker_calculator.draw_distance_on_frame(
+                frame, detections, show_distance=True, show_line=True, inplace=True
+            )
+
+        # Volver a memoria de CPU para las copias por ROI de los ejes
+        if isinstance(frame, cv2.UMat):
+            frame = frame.get()
+
+        return self.coord_drawer.draw_coordinate_system(frame)
@@ -0,0 +1,79 @@
+"""Núcleos numéricos de los filtros de movimiento.
+
+Se compilan con numba (opcional) y se ejecutan en cada frame procesado desde
+MovementDetector. Sin numba se usan las mismas funciones vectorizadas en NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba es opcional: mismas funciones sin compilar
+    njit = None
+
+
+def _jit(func):
+    """Compila la función con numba si está disponible."""
+    if njit is None:
+        return func
+    return njit(cache=True, fastmath=True)(func)
+
+
+@_jit
+def windowed_mean_speed(xs: np.ndarray, ys: np.ndarray, ts: np.ndarray,
+                        now: float, window: float) -> float:
+    """
+    Velocidad media entre muestras consecutivas dentro de la ventana temporal.
+
+    Args:
+        xs: Coordenada X de cada muestra
+        ys: Coordenada Y de cada muestra (ceros para magnitudes escalares)
+        ts: Timestamp de cada muestra en segundos
+        now: Instante actual
+        window: Ventana temporal en segundos
+
+    Returns:
+        Velocidad media (unidades de xs por segundo), 0.0 si no hay datos suficientes
+    """
+    recent = now - ts <= window
+    if np.sum(recent) < 2:
+        return 0.0
+
+    dt = np.diff(ts[recent])
+    step = np.hypot(np.diff(xs[recent]), np.diff(ys[recent]))
+    valid = dt > 0
+    if not np.any(valid):
+        return 0.0
+    return float(np.mean(step[valid] / dt[valid]))
+
+
+@_jit
+def is_stable(xs: np.ndarray, ys: np.ndarray, frames: int, noise_threshold: float) -> bool:
+    """
+    Indica si las últimas posiciones varían menos que el umbral de ruido.
+
+    Args:
+        xs: Coordenada X de cada muestra
+        ys: Coordenada Y de cada muestra
+        frames: Número de muestras recientes a considerar
+        noise_threshold: Desviación máxima (píxeles) para considerar la posición estable
+
+    Returns:
+        True si la varianza en X e Y es menor que noise_threshold²
+    """
+    if len(xs) < frames:
+        return False
+    limit = noise_threshold * noise_threshold
+    return bool(np.var(xs[-frames:]) < limit and np.var(ys[-frames:]) < limit)
+
+
+def warmup() -> None:
+    """Fuerza la compilación JIT con datos de prueba para no pagarla en el primer frame.
+
+    Usa las mismas disposiciones de memoria que MovementDetector: columnas
+    (no contiguas) de una matriz de muestras y, para la distancia, ceros contiguos.
+    """
+    samples = np.arange(96, dtype=np.float64).reshape(32, 3)
+    windowed_mean_speed(samples[:, 0], samples[:, 1], samples[:, 2], 96.0, 2.0)
+    windowed_mean_speed(samples[:, 0], np.zeros(len(samples)), samples[:, 1], 96.0, 2.0)
+    is_stable(samples[:, 0], samples[:, 1], 5, 2.0)
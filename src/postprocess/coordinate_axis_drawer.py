@@ -6,7 +6,20 @@ mostrando los ejes X (positivo hacia la derecha) y Z (positivo hacia abajo).
 
 import cv2
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, List, Dict, Tuple, Optional
+
+from .text_banner import blit_sprite
+
+# Esquemas de colores predefinidos (inmutables, compartibles entre hilos).
+# Uso: drawer.set_colors(**COLOR_SCHEMES[i]); para una copia mutable, dict(COLOR_SCHEMES[i])
+COLOR_SCHEMES = (
+    MappingProxyType({"x_color": (0, 0, 255), "z_color": (0, 255, 0), "origin_color": (255, 255, 255)}),    # Rojo/Verde
+    MappingProxyType({"x_color": (255, 0, 0), "z_color": (0, 255, 255), "origin_color": (255, 255, 255)}),  # Azul/Amarillo
+    MappingProxyType({"x_color": (255, 0, 255), "z_color": (0, 255, 255), "origin_color": (255, 255, 255)}),  # Magenta/Cian
+    MappingProxyType({"x_color": (128, 0, 255), "z_color": (0, 255, 128), "origin_color": (255, 255, 255)}),  # Púrpura/Verde lima
+)
 
 class CoordinateAxisDrawer:
     """
@@ -36,6 +49,15 @@ class CoordinateAxisDrawer:
         self.line_thickness = 2
         self.text_thickness = 1
         
+        # Geometría precalculada (se invalida en set_position/set_size)
+        self._geometry_shape = None
+        self._geometry = None
+        
+        # Sprite de los ejes ya renderizados y función de dibujo especializada
+        # (se invalidan también en set_colors)
+        self._sprite = None
+        self._compiled = None
+        
     def _calculate_origin_position(self, frame_shape: Tuple[int, int]) -> Tuple[int, int]:
         """
         Calcula la posición del origen del sistema de coordenadas.
@@ -63,21 +85,18 @@ class CoordinateAxisDrawer:
             
         return (origin_x, origin_y)
     
-    def _draw_axis_arrow(self, frame: np.ndarray, start: Tuple[int, int], 
-                        end: Tuple[int, int], color: Tuple[int, int, int]) -> None:
+    def _calculate_arrow_tips(self, start: Tuple[int, int], 
+                              end: Tuple[int, int]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """
-        Dibuja una flecha para representar un eje.
+        Calcula las dos puntas de la flecha de un eje.
         
         Args:
-            frame: Frame donde dibujar
             start: Punto de inicio de la flecha
             end: Punto final de la flecha
-            color: Color de la flecha (B, G, R)
+            
+        Returns:
+            Tupla con los dos puntos (x, y) de las puntas
         """
-        # Dibujar línea principal
-        cv2.line(frame, start, end, color, self.line_thickness)
-        
-        # Calcular puntas de la flecha
         arrow_length = 8
         angle = np.arctan2(end[1] - start[1], end[0] - start[0])
         
@@ -87,100 +106,245 @@ class CoordinateAxisDrawer:
         # Primera punta
         x1 = int(end[0] - arrow_length * np.cos(angle - arrow_angle))
         y1 = int(end[1] - arrow_length * np.sin(angle - arrow_angle))
-        cv2.line(frame, end, (x1, y1), color, self.line_thickness)
         
         # Segunda punta
         x2 = int(end[0] - arrow_length * np.cos(angle + arrow_angle))
         y2 = int(end[1] - arrow_length * np.sin(angle + arrow_angle))
-        cv2.line(frame, end, (x2, y2), color, self.line_thickness)
+        
+        return (x1, y1), (x2, y2)
     
-    def draw_coordinate_system(self, frame: np.ndarray) -> np.ndarray:
+    def _calculate_background_rect(self, frame_shape: Tuple[int, int]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """
-        Dibuja el sistema de coordenadas en el frame.
+        Calcula el rectángulo de fondo del sistema de coordenadas.
         
         Args:
-            frame: Frame de video donde dibujar el sistema de coordenadas
+            frame_shape: Forma del frame (height, width)
             
         Returns:
-            Frame con el sistema de coordenadas dibujado
+            Esquinas (inicio, fin) del rectángulo
+        """
+        height, width = frame_shape[:2]
+        
+        if self.position == "top_left":
+            rect_start = (self.margin, self.margin)
+            rect_end = (self.margin + self.size + 20, self.margin + self.size + 20)
+        elif self.position == "top_right":
+            rect_start = (width - self.margin - self.size - 20, self.margin)
+            rect_end = (width - self.margin, self.margin + self.size + 20)
+        elif self.position == "bottom_left":
+            rect_start = (self.margin, height - self.margin - self.size - 20)
+            rect_end = (self.margin + self.size + 20, height - self.margin)
+        else:  # bottom_right
+            rect_start = (width - self.margin - self.size - 20, 
+                         height - self.margin - self.size - 20)
+            rect_end = (width - self.margin, height - self.margin)
+            
+        return rect_start, rect_end
+    
+    def _get_geometry(self, frame_shape: Tuple[int, int]) -> Dict:
         """
-        frame_copy = frame.copy()
+        Obtiene la geometría del sistema de coordenadas para un tamaño de frame.
         
-        # Calcular posición del origen
-        origin_x, origin_y = self._calculate_origin_position(frame_copy.shape)
+        La geometría (origen, extremos de los ejes, puntas de flecha, etiquetas y
+        fondo) solo depende de la posición, el tamaño y la forma del frame, por lo
+        que se calcula una vez y se reutiliza hasta que cambie alguno de ellos.
         
-        # Calcular puntos finales de los ejes
+        Args:
+            frame_shape: Forma del frame (height, width)
+            
+        Returns:
+            Diccionario con los puntos precalculados en enteros
+        """
+        shape = tuple(frame_shape[:2])
+        if self._geometry is not None and self._geometry_shape == shape:
+            return self._geometry
+        
+        origin = self._calculate_origin_position(shape)
+        origin_x, origin_y = origin
         axis_length = self.size // 2
         
-        # Eje X (positivo hacia la derecha)
+        # Eje X (positivo hacia la derecha) y eje Z (positivo hacia abajo)
         x_end = (origin_x + axis_length, origin_y)
-        
-        # Eje Z (positivo hacia abajo)
         z_end = (origin_x, origin_y + axis_length)
         
-        # Dibujar origen
-        cv2.circle(frame_copy, (origin_x, origin_y), 3, self.origin_color, -1)
+        self._geometry = {
+            'origin': origin,
+            'x_end': x_end,
+            'z_end': z_end,
+            'x_tips': self._calculate_arrow_tips(origin, x_end),
+            'z_tips': self._calculate_arrow_tips(origin, z_end),
+            'x_label_pos': (x_end[0] + 5, x_end[1] + 5),
+            'z_label_pos': (z_end[0] - 15, z_end[1] + 15),
+            'rect': self._calculate_background_rect(shape),
+        }
+        self._geometry_shape = shape
+        self._sprite = None
+        self._compiled = None
+        return self._geometry
+    
+    def _invalidate_geometry(self) -> None:
+        """Descarta la geometría precalculada para que se recalcule en el siguiente frame."""
+        self._geometry_shape = None
+        self._geometry = None
+        self._sprite = None
+        self._compiled = None
+    
+    def _get_sprite(self, frame_shape: Tuple[int, int], geometry: Dict) -> Tuple:
+        """
+        Obtiene los ejes renderizados como sprite (BGR + máscara) recortado.
+        
+        Los ejes se dibujan una sola vez sobre un lienzo del tamaño del frame y se
+        recortan al rectángulo que ocupan, de modo que cada frame solo necesita
+        copiar esa región con cv2.copyTo.
+        
+        Args:
+            frame_shape: Forma del frame (height, width)
+            geometry: Geometría devuelta por _get_geometry
+            
+        Returns:
+            Tupla (x, y, sprite_bgr, sprite_mask, inv_alpha). inv_alpha es None si la
+            máscara es binaria; si hay bordes suavizados (texto antialiasing) contiene
+            255 - alpha en 3 canales para mezclar en lugar de copiar
+        """
+        if self._sprite is not None:
+            return self._sprite
+        
+        height, width = frame_shape[:2]
+        canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        self._draw_axes(canvas, geometry)
+        
+        # Máscara con los píxeles cubiertos por los ejes y las etiquetas
+        mask = np.zeros((height, width), dtype=np.uint8)
+        white = (255, 255, 255)
+        self._draw_axes(mask, geometry, colors=(white, white, white))
+        
+        x, y, w, h = cv2.boundingRect(mask)
+        sprite_bgr = np.ascontiguousarray(canvas[y:y + h, x:x + w])
+        sprite_mask = np.ascontiguousarray(mask[y:y + h, x:x + w])
         
-        # Dibujar ejes con flechas
-        self._draw_axis_arrow(frame_copy, (origin_x, origin_y), x_end, self.x_color)
-        self._draw_axis_arrow(frame_copy, (origin_x, origin_y), z_end, self.z_color)
+        inv_alpha = None
+        if np.any((sprite_mask > 0) & (sprite_mask < 255)):
+            inv_alpha = cv2.cvtColor(255 - sprite_mask, cv2.COLOR_GRAY2BGR)
         
-        # Añadir etiquetas de los ejes
+        self._sprite = (x, y, sprite_bgr, sprite_mask, inv_alpha)
+        return self._sprite
+    
+    def _draw_axis_arrow(self, frame: np.ndarray, start: Tuple[int, int], 
+                        end: Tuple[int, int], color: Tuple[int, int, int],
+                        tips: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None) -> None:
+        """
+        Dibuja una flecha para representar un eje.
+        
+        Args:
+            frame: Frame donde dibujar
+            start: Punto de inicio de la flecha
+            end: Punto final de la flecha
+            color: Color de la flecha (B, G, R)
+            tips: Puntas de la flecha precalculadas (opcional)
+        """
+        # Dibujar línea principal
+        cv2.line(frame, start, end, color, self.line_thickness)
+        
+        # Puntas de la flecha
+        if tips is None:
+            tips = self._calculate_arrow_tips(start, end)
+        cv2.line(frame, end, tips[0], color, self.line_thickness)
+        cv2.line(frame, end, tips[1], color, self.line_thickness)
+    
+    def _draw_axes(self, frame: np.ndarray, geometry: Dict,
+                   colors: Optional[Tuple[Tuple[int, int, int], ...]] = None) -> None:
+        """
+        Dibuja origen, ejes y etiquetas usando la geometría precalculada.
+        
+        Args:
+            frame: Frame donde dibujar
+            geometry: Geometría devuelta por _get_geometry
+            colors: Colores (x, z, origen) a usar en lugar de los del dibujador (opcional)
+        """
+        x_color, z_color, origin_color = colors or (self.x_color, self.z_color, self.origin_color)
+        origin = geometry['origin']
         font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = 0.5
         
-        # Etiqueta X
-        x_label_pos = (x_end[0] + 5, x_end[1] + 5)
-        cv2.putText(frame_copy, "X+", x_label_pos, font, font_scale, self.x_color, self.text_thickness)
-        
-        # Etiqueta Z
-        z_label_pos = (z_end[0] - 15, z_end[1] + 15)
-        cv2.putText(frame_copy, "Z+", z_label_pos, font, font_scale, self.z_color, self.text_thickness)
+        cv2.circle(frame, origin, 3, origin_color, -1)
+        self._draw_axis_arrow(frame, origin, geometry['x_end'], x_color, geometry['x_tips'])
+        self._draw_axis_arrow(frame, origin, geometry['z_end'], z_color, geometry['z_tips'])
+        cv2.putText(frame, "X+", geometry['x_label_pos'], font, font_scale, x_color, self.text_thickness)
+        cv2.putText(frame, "Z+", geometry['z_label_pos'], font, font_scale, z_color, self.text_thickness)
+    
+    def compile(self, frame_shape: Tuple[int, int]) -> Callable[[np.ndarray], np.ndarray]:
+        """
+        Especializa el dibujador para un tamaño de frame fijo.
         
-        # Añadir fondo semitransparente para mejor visibilidad
-        overlay = frame_copy.copy()
+        Devuelve una función que dibuja el sistema de coordenadas con todas las
+        coordenadas ya resueltas (región del fondo y sprite), sin consultar la
+        posición ni la geometría en cada frame. Debe volver a compilarse si cambian
+        la posición, el tamaño, los colores o la resolución.
         
-        # Calcular área del sistema de coordenadas
-        if self.position == "top_left":
-            rect_start = (self.margin, self.margin)
-            rect_end = (self.margin + self.size + 20, self.margin + self.size + 20)
-        elif self.position == "top_right":
-            rect_start = (frame_copy.shape[1] - self.margin - self.size - 20, self.margin)
-            rect_end = (frame_copy.shape[1] - self.margin, self.margin + self.size + 20)
-        elif self.position == "bottom_left":
-            rect_start = (self.margin, frame_copy.shape[0] - self.margin - self.size - 20)
-            rect_end = (self.margin + self.size + 20, frame_copy.shape[0] - self.margin)
-        else:  # bottom_right
-            rect_start = (frame_copy.shape[1] - self.margin - self.size - 20, 
-                         frame_copy.shape[0] - self.margin - self.size - 20)
-            rect_end = (frame_copy.shape[1] - self.margin, frame_copy.shape[0] - self.margin)
+        Args:
+            frame_shape: Forma de los frames que se van a dibujar (height, width)
+            
+        Returns:
+            Función draw(frame) -> frame que dibuja in-place
+        """
+        shape = tuple(frame_shape[:2])
+        geometry = self._get_geometry(shape)
+        if self._compiled is not None:
+            return self._compiled
         
-        # Dibujar rectángulo semitransparente
-        cv2.rectangle(overlay, rect_start, rect_end, (0, 0, 0), -1)
+        # Región del fondo semitransparente, recortada al frame
+        (x0, y0), (x1, y1) = geometry['rect']
+        height, width = shape
+        rows = slice(max(y0, 0), min(y1 + 1, height))
+        cols = slice(max(x0, 0), min(x1 + 1, width))
+        has_background = rows.start < rows.stop and cols.start < cols.stop
         alpha = 0.3  # Transparencia
-        cv2.addWeighted(overlay, alpha, frame_copy, 1 - alpha, 0, frame_copy)
+        sprite = self._get_sprite(shape, geometry)
         
-        # Redibujar ejes y etiquetas sobre el fondo
-        cv2.circle(frame_copy, (origin_x, origin_y), 3, self.origin_color, -1)
-        self._draw_axis_arrow(frame_copy, (origin_x, origin_y), x_end, self.x_color)
-        self._draw_axis_arrow(frame_copy, (origin_x, origin_y), z_end, self.z_color)
-        cv2.putText(frame_copy, "X+", x_label_pos, font, font_scale, self.x_color, self.text_thickness)
-        cv2.putText(frame_copy, "Z+", z_label_pos, font, font_scale, self.z_color, self.text_thickness)
+        def draw(frame: np.ndarray) -> np.ndarray:
+            # Oscurecer solo la región del rectángulo en lugar del frame completo
+            if has_background:
+                roi = frame[rows, cols]
+                cv2.addWeighted(roi, 1 - alpha, roi, 0, 0, roi)
+            # Copiar los ejes y etiquetas prerenderizados sobre el fondo
+            blit_sprite(frame, *sprite)
+            return frame
         
-        return frame_copy
+        self._compiled = draw
+        return draw
     
-    def process_frame_with_coordinates(self, frame: np.ndarray, detections: List[Dict] = None) -> np.ndarray:
+    def draw_coordinate_system(self, frame: np.ndarray, inplace: bool = True) -> np.ndarray:
+        """
+        Dibuja el sistema de coordenadas en el frame.
+        
+        Por defecto dibuja directamente sobre el buffer recibido (el llamador es
+        dueño del frame); si se necesita conservar el original sin anotar, usar
+        inplace=False o copiar antes de llamar.
+        
+        Args:
+            frame: Frame de video donde dibujar el sistema de coordenadas
+            inplace: Si es True dibuja sobre el propio frame, si es False sobre una copia
+            
+        Returns:
+            Frame con el sistema de coordenadas dibujado
+        """
+        target = frame if inplace else frame.copy()
+        return self.compile(target.shape)(target)
+    
+    def process_frame_with_coordinates(self, frame: np.ndarray, detections: List[Dict] = None,
+                                       inplace: bool = True) -> np.ndarray:
         """
         Procesa un frame añadiendo el sistema de coordenadas.
         
         Args:
             frame: Frame de video a procesar
             detections: Lista de detecciones (opcional, para compatibilidad)
+            inplace: Si es True dibuja sobre el propio frame
             
         Returns:
             Frame procesado con el sistema de coordenadas
         """
-        return self.draw_coordinate_system(frame)
+        return self.draw_coordinate_system(frame, inplace=inplace)
     
     def set_position(self, position: str) -> None:
         """
@@ -192,6 +356,7 @@ class CoordinateAxisDrawer:
         valid_positions = ["top_left", "top_right", "bottom_left", "bottom_right"]
         if position in valid_positions:
             self.position = position
+            self._invalidate_geometry()
         else:
             raise ValueError(f"Posición inválida. Debe ser una de: {valid_positions}")
     
@@ -204,6 +369,7 @@ class CoordinateAxisDrawer:
         """
         if size > 0:
             self.size = size
+            self._invalidate_geometry()
         else:
             raise ValueError("El tamaño debe ser mayor que 0")
     
@@ -224,13 +390,27 @@ class CoordinateAxisDrawer:
             self.z_color = z_color
         if origin_color is not None:
             self.origin_color = origin_color
+        self._sprite = None
+        self._compiled = None
+
+
+@lru_cache(maxsize=8)
+def _get_shared_drawer(position: str, size: int, margin: int) -> CoordinateAxisDrawer:
+    """
+    Devuelve un dibujador compartido para la configuración dada.
+    
+    Reutilizar la instancia evita reconstruir el dibujador en cada frame y
+    conserva su geometría precalculada entre llamadas.
+    """
+    return CoordinateAxisDrawer(position, size, margin)
 
 
 # Función de conveniencia para uso directo
 def add_coordinate_system_to_frame(frame: np.ndarray, 
                                   position: str = "bottom_right",
                                   size: int = 60,
-                                  margin: int = 20) -> np.ndarray:
+                                  margin: int = 20,
+                                  inplace: bool = True) -> np.ndarray:
     """
     Función de conveniencia para añadir un sistema de coordenadas a un frame.
     
@@ -239,9 +419,10 @@ def add_coordinate_system_to_frame(frame: np.ndarray,
         position: Posición del sistema de coordenadas
         size: Tamaño de los ejes
         margin: Margen desde el borde
+        inplace: Si es True dibuja sobre el propio frame
         
     Returns:
         Frame con el sistema de coordenadas añadido
     """
-    drawer = CoordinateAxisDrawer(position, size, margin)
-    return drawer.draw_coordinate_system(frame)
\ No newline at end of file
+    drawer = _get_shared_drawer(position, size, margin)
+    return drawer.draw_coordinate_system(frame, inplace=inplace)
\ No newline at end of file
@@ -6,6 +6,7 @@ import datetime
 import os
 import sys
 from collections import deque
+from functools import lru_cache
 from scipy.optimize import least_squares
 from pathlib import Path
 
@@ -17,6 +18,28 @@ if src_path not in sys.path:
 # from mqtt.manager import MQTTManager  # Módulo no disponible
 from postprocess.movement_detector import MovementDetector
 
+
+@lru_cache(maxsize=32)
+def _decay_weights(length: int, start: float) -> np.ndarray:
+    """
+    Pesos exponenciales normalizados para promediar un historial.
+    
+    Solo dependen de la longitud del historial (acotada por su maxlen), así que
+    se calculan una vez y se reutilizan en cada frame.
+    
+    Args:
+        length: Número de elementos del historial
+        start: Exponente del elemento más antiguo (el más reciente tiene 0)
+        
+    Returns:
+        Array de solo lectura con los pesos (suman 1)
+    """
+    weights = np.exp(np.linspace(start, 0, length))
+    weights /= weights.sum()
+    weights.setflags(write=False)
+    return weights
+
+
 class DistanceCalculator:
     """
     Calculadora de distancias para análisis de detecciones.
@@ -127,11 +150,8 @@ class DistanceCalculator:
                                 
                                 # Promedio temporal
                                 if len(self.keypoint_history) > 1:
-                                    weights = np.exp(np.linspace(-0.5, 0, len(self.keypoint_history)))
-                                    weights /= weights.sum()
-                                    
-                                    avg_x = np.average([p[0] for p in self.keypoint_history], weights=weights)
-                                    avg_y = np.average([p[1] for p in self.keypoint_history], weights=weights)
+                                    weights = _decay_weights(len(self.keypoint_history), -0.5)
+                                    avg_x, avg_y = weights @ np.asarray(self.keypoint_history)
                                     
                                     return (avg_x, avg_y)
                                 else:
@@ -219,7 +239,7 @@ class DistanceCalculator:
         """
         x1, y1 = point1
         x2, y2 = point2
-        return np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        return math.hypot(x2 - x1, y2 - y1)
         
     def _init_kalman_filter(self, keypoint_id: str) -> cv2.KalmanFilter:
         """
@@ -255,7 +275,7 @@ class DistanceCalculator:
         measurement = np.array([[keypoint[0]], [keypoint[1]]], dtype=np.float32)
         kalman.correct(measurement)
         
-        return float(prediction[0]), float(prediction[1])
+        return float(prediction[0, 0]), float(prediction[1, 0])
     
     def _validate_rectangle_geometry(self, keypoints: List[Tuple[float, float, float]]) -> bool:
         """
@@ -369,10 +389,8 @@ class DistanceCalculator:
             self.calibration_history.append(new_pixels_per_cm)
             
             # Usar promedio ponderado (más peso a calibraciones recientes)
-            weights = np.exp(np.linspace(-1, 0, len(self.calibration_history)))
-            weights /= weights.sum()
-            
-            self.pixels_per_cm = np.average(list(self.calibration_history), weights=weights)
+            weights = _decay_weights(len(self.calibration_history), -1.0)
+            self.pixels_per_cm = float(weights @ np.asarray(self.calibration_history))
             self.auto_calibrated = True
             return True
             
@@ -498,20 +516,28 @@ class DistanceCalculator:
             print(f"❌ Error al enviar datos directamente: {e}")
         
     def draw_distance_on_frame(self, frame: np.ndarray, detections: List[Dict], 
-                              show_distance: bool = True, show_line: bool = True) -> np.ndarray:
+                              show_distance: bool = True, show_line: bool = True,
+                              inplace: bool = False, frame_height: Optional[int] = None) -> np.ndarray:
         """
         Dibuja la distancia calculada en el frame con calibración automática.
         
         Args:
-            frame: Frame de video
+            frame: Frame de video (numpy o cv2.UMat)
             detections: Lista de detecciones
             show_distance: Si mostrar el texto de distancia
             show_line: Si mostrar la línea de distancia
+            inplace: Si es True dibuja sobre el propio frame en lugar de sobre una copia
+            frame_height: Alto del frame; conviene pasarlo con cv2.UMat, que no expone su
+                tamaño (si no, se descarga el frame una vez para obtenerlo)
             
         Returns:
             Frame con la distancia dibujada
         """
-        frame_copy = frame.copy()
+        if frame_height is None:
+            frame_height = (frame.get() if isinstance(frame, cv2.UMat) else frame).shape[0]
+        
+        # cv2.copyTo admite tanto numpy como cv2.UMat (OpenCL)
+        frame_copy = frame if inplace else cv2.copyTo(frame, None)
         
         # Realizar calibración automática si no se ha hecho
         if not self.auto_calibrated:
@@ -595,10 +621,10 @@ class DistanceCalculator:
         # Mostrar información de calibración
         if self.auto_calibrated:
             calib_text = f"Calibration: {self.pixels_per_cm:.2f} px/cm"
-            cv2.putText(frame_copy, calib_text, (30, frame_copy.shape[0] - 30),
+            cv2.putText(frame_copy, calib_text, (30, frame_height - 30),
                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
         else:
-            cv2.putText(frame_copy, "Esperando calibracion automatica...", (30, frame_copy.shape[0] - 30),
+            cv2.putText(frame_copy, "Esperando calibracion automatica...", (30, frame_height - 30),
                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
                       
         if distance_cm is None:
@@ -97,22 +97,20 @@ class MarkerDistanceCalculator:
         for detection in detections:
             if detection.get('class_name') == 'marcador' and 'keypoints' in detection:
                 keypoints = detection['keypoints']
+                if keypoints is None:
+                    continue
                 
-                # Filtrar keypoints válidos (con confianza > 0.5)
-                valid_keypoints = []
-                for kp in keypoints:
-                    if len(kp) >= 3 and kp[2] > 0.5:  # x, y, confidence
-                        valid_keypoints.append((kp[0], kp[1]))
+                # Filtrar keypoints válidos (x, y, confianza > 0.5) de forma vectorizada
+                keypoints = np.asarray(keypoints, dtype=np.float64)
+                if keypoints.ndim != 2 or keypoints.shape[1] < 3:
+                    continue
+                valid_keypoints = keypoints[keypoints[:, 2] > 0.5, :2]
                 
-                if valid_keypoints:
+                if len(valid_keypoints):
                     # Calcular punto medio
-                    x_coords = [kp[0] for kp in valid_keypoints]
-                    y_coords = [kp[1] for kp in valid_keypoints]
+                    mid_x, mid_y = valid_keypoints.mean(axis=0)
                     
-                    mid_x = sum(x_coords) / len(x_coords)
-                    mid_y = sum(y_coords) / len(y_coords)
-                    
-                    return (mid_x, mid_y)
+                    return (float(mid_x), float(mid_y))
         return None
         
     def calculate_euclidean_distance(self, point1: Tuple[float, float], 
@@ -129,7 +127,7 @@ class MarkerDistanceCalculator:
         """
         x1, y1 = point1
         x2, y2 = point2
-        return np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        return math.hypot(x2 - x1, y2 - y1)
         
     def pixels_to_cm(self, distance_pixels: float) -> float:
         """
@@ -242,20 +240,25 @@ class MarkerDistanceCalculator:
                 print(f"❌ Error al enviar datos marcador por comunicación directa: {e}")
         
     def draw_distance_on_frame(self, frame: np.ndarray, detections: List[Dict], 
-                              show_distance: bool = True, show_line: bool = True) -> np.ndarray:
+                              show_distance: bool = True, show_line: bool = True,
+                              inplace: bool = False, frame_height: Optional[int] = None) -> np.ndarray:
         """
         Dibuja la distancia calculada del marcador en el frame.
         
         Args:
-            frame: Frame de video
+            frame: Frame de video (numpy o cv2.UMat)
             detections: Lista de detecciones
             show_distance: Si mostrar el texto de distancia
             show_line: Si mostrar la línea de distancia
+            inplace: Si es True dibuja sobre el propio frame en lugar de sobre una copia
+            frame_height: Alto del frame; no se usa (todo se dibuja en posiciones fijas),
+                se acepta para llamarlo igual que DistanceCalculator.draw_distance_on_frame
             
         Returns:
             Frame con la distancia dibujada
         """
-        frame_copy = frame.copy()
+        # cv2.copyTo admite tanto numpy como cv2.UMat (OpenCL)
+        frame_copy = frame if inplace else cv2.copyTo(frame, None)
         
         # Calcular distancia
         distance_cm = self.calculate_marker_distance(detections)
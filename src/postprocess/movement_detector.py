@@ -4,9 +4,13 @@ import json
 import os
 from typing import List, Dict, Tuple, Optional, Deque, Any
 from collections import deque
-import math
 import logging
 
+try:
+    from ._fastfilters import windowed_mean_speed, is_stable
+except ImportError:
+    from _fastfilters import windowed_mean_speed, is_stable
+
 class MovementDetector:
     """
     Detector de movimiento inteligente para evitar envío de datos MQTT
@@ -178,31 +182,10 @@ class MovementDetector:
         if len(positions) < 2:
             return 0.0
         
-        # Filtrar posiciones dentro de la ventana temporal
-        current_time = time.time()
-        recent_positions = [
-            pos for pos in positions 
-            if current_time - pos[2] <= self.temporal_window_seconds
-        ]
-        
-        if len(recent_positions) < 2:
-            return 0.0
-        
-        # Calcular velocidades entre puntos consecutivos
-        velocities = []
-        for i in range(1, len(recent_positions)):
-            pos1 = recent_positions[i-1]
-            pos2 = recent_positions[i]
-            
-            # Distancia euclidiana
-            distance = math.sqrt((pos2[0] - pos1[0])**2 + (pos2[1] - pos1[1])**2)
-            time_diff = pos2[2] - pos1[2]
-            
-            if time_diff > 0:
-                velocity = distance / time_diff
-                velocities.append(velocity)
-        
-        return np.mean(velocities) if velocities else 0.0
+        # Ventana temporal y velocidades entre puntos consecutivos en _fastfilters
+        samples = np.array(positions, dtype=np.float64)
+        return windowed_mean_speed(samples[:, 0], samples[:, 1], samples[:, 2],
+                                   time.time(), self.temporal_window_seconds)
     
     def calculate_distance_velocity(self) -> float:
         """
@@ -214,29 +197,10 @@ class MovementDetector:
         if len(self.distance_history) < 2:
             return 0.0
         
-        current_time = time.time()
-        recent_distances = [
-            dist for dist in self.distance_history 
-            if current_time - dist[1] <= self.temporal_window_seconds
-        ]
-        
-        if len(recent_distances) < 2:
-            return 0.0
-        
-        # Calcular velocidades de cambio de distancia
-        velocities = []
-        for i in range(1, len(recent_distances)):
-            dist1 = recent_distances[i-1]
-            dist2 = recent_distances[i]
-            
-            distance_change = abs(dist2[0] - dist1[0])
-            time_diff = dist2[1] - dist1[1]
-            
-            if time_diff > 0:
-                velocity = distance_change / time_diff
-                velocities.append(velocity)
-        
-        return np.mean(velocities) if velocities else 0.0
+        # Con Y a cero la distancia euclidiana entre muestras es |Δd|
+        samples = np.array(self.distance_history, dtype=np.float64)
+        return windowed_mean_speed(samples[:, 0], np.zeros(len(samples)), samples[:, 1],
+                                   time.time(), self.temporal_window_seconds)
     
     def is_position_stable(self, positions: Deque[Tuple[float, float, float]]) -> bool:
         """
@@ -251,19 +215,10 @@ class MovementDetector:
         if len(positions) < self.position_stability_frames:
             return False
         
-        # Tomar las últimas posiciones
-        recent_positions = list(positions)[-self.position_stability_frames:]
-        
-        # Calcular varianza de posiciones
-        x_coords = [pos[0] for pos in recent_positions]
-        y_coords = [pos[1] for pos in recent_positions]
-        
-        x_variance = np.var(x_coords)
-        y_variance = np.var(y_coords)
-        
-        # Considerar estable si la varianza es baja
-        return (x_variance < self.position_noise_threshold**2 and 
-                y_variance < self.position_noise_threshold**2)
+        # Varianza baja de las últimas posiciones = posición estable
+        samples = np.array(positions, dtype=np.float64)
+        return is_stable(samples[:, 0], samples[:, 1], self.position_stability_frames,
+                         self.position_noise_threshold)
     
     def detect_relative_movement(self) -> bool:
         """
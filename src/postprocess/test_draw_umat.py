@@ -0,0 +1,88 @@
+"""
+Pruebas del dibujo de distancias sobre cv2.UMat (superposiciones con OpenCL).
+Comprueba que ambos calculadores aceptan un UMat y dibujan lo mismo que sobre numpy.
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from postprocess.distance_calculator import DistanceCalculator
+from postprocess.marker_distance_calculator import MarkerDistanceCalculator
+
+
+# Detecciones sintéticas: pórtico de 30x21 cm a 10 px/cm, pulsador a su izquierda
+# y marcador con dos keypoints visibles y uno oculto
+PORTICO = {'class_name': 'portico', 'bbox': [300, 100, 510, 310],
+           'keypoints': [[300, 100, 0.9], [300, 310, 0.9], [510, 310, 0.9], [510, 100, 0.9]]}
+PULSADOR = {'class_name': 'pulsador', 'bbox': [200, 80, 260, 140],
+            'keypoints': [[200, 80, 0.9], [260, 80, 0.9], [260, 140, 0.9], [200, 140, 0.9]]}
+MARCADOR = {'class_name': 'marcador', 'bbox': [100, 300, 160, 420],
+            'keypoints': [[110, 400, 0.9], [150, 400, 0.9], [130, 380, 0.2]]}
+
+
+def check_calculator(calculator_cls, detections, frame_height=None, frames=3):
+    """
+    Dibuja las mismas detecciones sobre numpy y sobre UMat y compara el resultado.
+    
+    Cada camino usa su propio calculador, ya que los filtros Kalman y la calibración
+    guardan estado entre frames. Se dibujan varios frames para que los filtros converjan.
+    """
+    numpy_calculator = calculator_cls()
+    umat_calculator = calculator_cls()
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    
+    for _ in range(frames):
+        expected = numpy_calculator.draw_distance_on_frame(image.copy(), detections, inplace=True)
+        result = umat_calculator.draw_distance_on_frame(cv2.UMat(image), detections, inplace=True,
+                                                        frame_height=frame_height)
+        
+        assert isinstance(result, cv2.UMat), "El resultado debe seguir siendo un UMat"
+        assert np.array_equal(result.get(), expected), "UMat y numpy deben dibujar lo mismo"
+    
+    return expected
+
+
+def test_distance_calculator_umat():
+    """DistanceCalculator con UMat, con y sin frame_height."""
+    check_calculator(DistanceCalculator, [])
+    check_calculator(DistanceCalculator, [], frame_height=480)
+
+
+def test_marker_distance_calculator_umat():
+    """MarkerDistanceCalculator con UMat, con y sin frame_height."""
+    check_calculator(MarkerDistanceCalculator, [])
+    check_calculator(MarkerDistanceCalculator, [], frame_height=480)
+
+
+def test_distance_calculator_umat_with_detections():
+    """Línea, puntos y textos de pulsador y pórtico iguales sobre UMat y numpy."""
+    detections = [PORTICO, PULSADOR]
+    assert DistanceCalculator().calculate_pulsador_portico_distance(detections) is not None
+    
+    for frame_height in (None, 480):
+        drawn = check_calculator(DistanceCalculator, detections, frame_height=frame_height)
+        assert drawn.any(), "Debe haberse dibujado algo en el frame"
+
+
+def test_marker_distance_calculator_umat_with_detections():
+    """Línea, puntos y textos del marcador iguales sobre UMat y numpy."""
+    detections = [MARCADOR]
+    assert MarkerDistanceCalculator().calculate_marker_distance(detections) is not None
+    
+    for frame_height in (None, 480):
+        drawn = check_calculator(MarkerDistanceCalculator, detections, frame_height=frame_height)
+        assert drawn.any(), "Debe haberse dibujado algo en el frame"
+
+
+if __name__ == "__main__":
+    test_distance_calculator_umat()
+    test_marker_distance_calculator_umat()
+    test_distance_calculator_umat_with_detections()
+    test_marker_distance_calculator_umat_with_detections()
+    print("✅ Dibujo de distancias sobre cv2.UMat correcto")
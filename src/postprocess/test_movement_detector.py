@@ -3,10 +3,23 @@ Script de prueba para el detector de movimiento inteligente.
 Demuestra cómo el sistema filtra datos MQTT cuando el pulsador no se mueve realmente.
 """
 
+import sys
 import time
 import random
 import json
-from movement_detector import MovementDetector
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from postprocess import _fastfilters
+from postprocess.movement_detector import MovementDetector
+
+# Núcleos sin compilar: si numba está instalado, py_func es la versión NumPy original
+windowed_mean_speed = getattr(_fastfilters.windowed_mean_speed, 'py_func', _fastfilters.windowed_mean_speed)
+is_stable = getattr(_fastfilters.is_stable, 'py_func', _fastfilters.is_stable)
 
 def simulate_detection_noise(base_position, noise_level=2.0):
     """
@@ -212,6 +225,80 @@ def test_config_file():
     os.remove(config_file)
     print(f"🗑️ Archivo de configuración de prueba eliminado")
 
+def test_windowed_mean_speed_temporal_window():
+    """
+    Solo cuentan las muestras dentro de la ventana temporal.
+    """
+    xs = np.array([0.0, 100.0, 103.0, 109.0])
+    ys = np.array([0.0, 0.0, 4.0, 12.0])
+    ts = np.array([0.0, 8.0, 9.0, 10.0])
+    
+    # Ventana de 2 s en t=10: quedan las tres últimas muestras (5 px/s y 10 px/s)
+    assert windowed_mean_speed(xs, ys, ts, 10.0, 2.0) == 7.5
+    # Ventana amplia: incluye el salto inicial de 100 px en 8 s
+    assert windowed_mean_speed(xs, ys, ts, 10.0, 20.0) == (12.5 + 5.0 + 10.0) / 3
+
+
+def test_windowed_mean_speed_skips_non_positive_dt():
+    """
+    Los pares con dt <= 0 (timestamps repetidos o desordenados) se ignoran.
+    """
+    xs = np.array([0.0, 50.0, 52.0, 40.0, 44.0])
+    ys = np.zeros(5)
+    ts = np.array([1.0, 1.0, 2.0, 1.5, 2.5])
+    
+    # Pares válidos: 50->52 en 1 s (2 px/s) y 40->44 en 1 s (4 px/s)
+    assert windowed_mean_speed(xs, ys, ts, 2.5, 5.0) == 3.0
+    # Todos los dt <= 0
+    assert windowed_mean_speed(xs[:2], ys[:2], ts[:2], 1.0, 5.0) == 0.0
+
+
+def test_windowed_mean_speed_needs_two_samples():
+    """
+    Con menos de dos muestras en la ventana la velocidad es 0.0.
+    """
+    xs = np.array([0.0, 10.0, 20.0])
+    ys = np.zeros(3)
+    ts = np.array([0.0, 1.0, 5.0])
+    
+    assert windowed_mean_speed(xs, ys, ts, 5.0, 1.0) == 0.0
+    assert windowed_mean_speed(xs[:1], ys[:1], ts[:1], 0.0, 1.0) == 0.0
+    assert windowed_mean_speed(xs[:0], ys[:0], ts[:0], 0.0, 1.0) == 0.0
+
+
+def test_is_stable_variance_threshold():
+    """
+    Estable si la varianza de las últimas muestras en X e Y es menor que el umbral².
+    """
+    # Varianza 1.0 en X, 0 en Y
+    xs = np.array([500.0, 9.0, 11.0, 9.0, 11.0])
+    ys = np.full(5, 20.0)
+    
+    assert is_stable(xs, ys, 4, 1.01)       # 1.0 < 1.0201
+    assert not is_stable(xs, ys, 4, 1.0)    # 1.0 no es < 1.0
+    assert not is_stable(xs, ys, 5, 2.0)    # la muestra antigua entra en la ventana
+    assert not is_stable(ys, xs, 4, 0.99)   # se comprueba también el eje Y
+    assert not is_stable(xs[:3], ys[:3], 4, 2.0)  # no hay muestras suficientes
+
+
+def test_compiled_filters_match_numpy():
+    """
+    Si numba está instalado, los núcleos compilados dan el mismo resultado que NumPy.
+    """
+    rng = np.random.default_rng(0)
+    xs = rng.normal(100.0, 3.0, 40)
+    ys = rng.normal(200.0, 3.0, 40)
+    ts = np.cumsum(rng.uniform(0.0, 0.1, 40))
+    ts[10] = ts[9]  # un dt = 0
+    now = float(ts[-1])
+    
+    for window in (0.3, 1.0, 10.0):
+        assert np.isclose(_fastfilters.windowed_mean_speed(xs, ys, ts, now, window),
+                          windowed_mean_speed(xs, ys, ts, now, window))
+    for threshold in (1.0, 3.0, 5.0):
+        assert _fastfilters.is_stable(xs, ys, 5, threshold) == is_stable(xs, ys, 5, threshold)
+
+
 if __name__ == "__main__":
     try:
         test_movement_detection()
@@ -0,0 +1,110 @@
+"""Textos prerenderizados para superponer en frames sin llamar a putText cada vez.
+
+cv2.putText con fuentes Hershey es relativamente costoso; un TextBanner
+renderiza el texto una sola vez y en cada frame solo copia la región con
+cv2.copyTo. El texto solo se vuelve a renderizar cuando cambia.
+"""
+
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+def blit_sprite(frame: np.ndarray, x: int, y: int, sprite_bgr: np.ndarray,
+                sprite_mask: np.ndarray, inv_alpha: Optional[np.ndarray] = None) -> None:
+    """
+    Copia un sprite prerenderizado sobre el frame, recortándolo a sus bordes.
+
+    Args:
+        frame: Frame destino (se modifica in-place)
+        x: Columna de la esquina superior izquierda del sprite
+        y: Fila de la esquina superior izquierda del sprite
+        sprite_bgr: Sprite premultiplicado (negro fuera de la máscara)
+        sprite_mask: Máscara/alpha del sprite (uint8)
+        inv_alpha: 255 - alpha en 3 canales si la máscara no es binaria, None si lo es
+    """
+    height, width = frame.shape[:2]
+    sprite_h, sprite_w = sprite_mask.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + sprite_w, width), min(y + sprite_h, height)
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    sx, sy = x0 - x, y0 - y
+    src = (slice(sy, sy + y1 - y0), slice(sx, sx + x1 - x0))
+    roi = frame[y0:y1, x0:x1]
+    if inv_alpha is None:
+        cv2.copyTo(sprite_bgr[src], sprite_mask[src], roi)
+    else:
+        # Sprite premultiplicado: roi * (1 - alpha) + sprite, sin buffers intermedios
+        cv2.multiply(roi, inv_alpha[src], roi, scale=1 / 255.0)
+        cv2.add(roi, sprite_bgr[src], roi)
+
+
+class TextBanner:
+    """
+    Texto renderizado una sola vez y copiado en cada frame.
+    """
+
+    def __init__(self, font_scale: float = 0.5, color: Tuple[int, int, int] = (255, 255, 255),
+                 thickness: int = 1, font: int = cv2.FONT_HERSHEY_SIMPLEX):
+        """
+        Inicializa el banner (vacío hasta la primera llamada a set_text).
+
+        Args:
+            font_scale: Escala de la fuente
+            color: Color del texto (B, G, R)
+            thickness: Grosor del texto
+            font: Fuente Hershey de OpenCV
+        """
+        self.font = font
+        self.font_scale = font_scale
+        self.color = color
+        self.thickness = thickness
+        self.text = None
+        self._sprite = None
+
+    def set_text(self, text: str) -> None:
+        """
+        Cambia el texto; solo se vuelve a renderizar si es distinto del actual.
+
+        Args:
+            text: Texto a mostrar
+        """
+        if text == self.text:
+            return
+        self.text = text
+
+        (text_w, text_h), baseline = cv2.getTextSize(text, self.font, self.font_scale, self.thickness)
+        pad = self.thickness + 1
+        width = text_w + 2 * pad
+        height = text_h + baseline + 2 * pad
+        origin = (pad, pad + text_h)
+
+        sprite_bgr = np.zeros((height, width, 3), dtype=np.uint8)
+        sprite_mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.putText(sprite_bgr, text, origin, self.font, self.font_scale, self.color, self.thickness)
+        cv2.putText(sprite_mask, text, origin, self.font, self.font_scale, 255, self.thickness)
+
+        inv_alpha = None
+        if np.any((sprite_mask > 0) & (sprite_mask < 255)):
+            inv_alpha = cv2.cvtColor(255 - sprite_mask, cv2.COLOR_GRAY2BGR)
+
+        # Desplazamiento desde el origen de putText (línea base) a la esquina del sprite
+        self._sprite = (-origin[0], -origin[1], sprite_bgr, sprite_mask, inv_alpha)
+
+    def draw(self, frame: np.ndarray, org: Tuple[int, int]) -> np.ndarray:
+        """
+        Dibuja el banner en el frame (in-place), igual que cv2.putText con ese origen.
+
+        Args:
+            frame: Frame donde dibujar
+            org: Esquina inferior izquierda del texto, como en cv2.putText
+
+        Returns:
+            El mismo frame
+        """
+        if self._sprite is not None:
+            dx, dy, sprite_bgr, sprite_mask, inv_alpha = self._sprite
+            blit_sprite(frame, org[0] + dx, org[1] + dy, sprite_bgr, sprite_mask, inv_alpha)
+        return frame
@@ -1,32 +1,37 @@
 import cv2
 import numpy as np
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 import threading
 import time
 
 from .distance_calculator import DistanceCalculator
 from ..vision.detector import YOLOPoseDetector
+from ..vision.camera import configure_low_latency_capture, create_capture, read_latest
 
 class VideoPostProcessor:
     """
     Procesador de video en tiempo real con cálculo de distancias.
     """
     
-    def __init__(self, model_path: str = "models/best.pt", pixels_per_cm: float = 10.0):
+    def __init__(self, model_path: str = "models/best.pt", pixels_per_cm: float = 10.0,
+                 batch_size: int = 1):
         """
         Inicializa el procesador de video.
         
         Args:
             model_path: Ruta al modelo YOLO
             pixels_per_cm: Factor de conversión píxeles a centímetros
+            batch_size: Frames acumulados por llamada al modelo (1 = sin lotes)
         """
-        self.detector = YOLOPoseDetector(model_path)
-        # Cargar el modelo YOLO
-        if not self.detector.load_model():
+        self.batch_size = max(1, batch_size)
+        self.detector = YOLOPoseDetector(model_path=model_path)
+        # Cargar el modelo YOLO (exportado para el tamaño de lote usado)
+        if not self.detector.load_model(batch=self.batch_size):
             print("⚠️ Advertencia: No se pudo cargar el modelo YOLO")
         
         self.distance_calculator = DistanceCalculator(pixels_per_cm)
         self.cap = None
+        self._buffer_ok = True
         self.is_running = False
         self.current_frame = None
         self.current_detections = []
@@ -55,15 +60,13 @@ class VideoPostProcessor:
             True si se inició correctamente, False en caso contrario
         """
         try:
-            self.cap = cv2.VideoCapture(camera_index)
+            self.cap = create_capture(camera_index)
             if not self.cap.isOpened():
                 print(f"Error: No se pudo abrir la cámara {camera_index}")
                 return False
                 
-            # Configurar resolución
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
+            # Configurar resolución, MJPEG y buffer de 1 frame
+            self._buffer_ok = configure_low_latency_capture(self.cap, fps=30, width=640, height=480)
             
             return True
         except Exception as e:
@@ -88,23 +91,73 @@ class VideoPostProcessor:
         Returns:
             Tupla (frame_procesado, detecciones, distancia_cm)
         """
-        # Detectar objetos y keypoints
-        detections = self.detector.get_detections_data(frame)
+        return self.process_batch([frame])[0]
         
-        # Calcular distancia
-        distance_cm = self.distance_calculator.calculate_pulsador_portico_distance(detections)
+    def process_batch(self, frames: List[np.ndarray]) -> List[tuple]:
+        """
+        Procesa un lote de frames con una sola inferencia del modelo.
+        
+        Args:
+            frames: Lista de frames de entrada
+            
+        Returns:
+            Lista de tuplas (frame_procesado, detecciones, distancia_cm), una por frame
+        """
+        outputs = []
         
-        # Dibujar detecciones en el frame
-        processed_frame = self.detector.detect(frame)
+        # Detectar objetos y keypoints y dibujarlos en cada frame (una inferencia por lote)
+        for processed_frame, detections in self.detector.detect_batch(frames):
+            # Calcular distancia
+            distance_cm = self.distance_calculator.calculate_pulsador_portico_distance(detections)
+            
+            # Dibujar distancia
+            processed_frame = self.distance_calculator.draw_distance_on_frame(processed_frame, detections)
+            
+            # Actualizar información de estado
+            self.current_detections = detections
+            self.current_distance = distance_cm
+            
+            outputs.append((processed_frame, detections, distance_cm))
+        
+        return outputs
+        
+    def _show_processed_frame(self, window_name: str, processed_frame: np.ndarray) -> bool:
+        """
+        Añade FPS y calibración al frame, lo muestra y gestiona el teclado.
         
-        # Dibujar distancia
-        processed_frame = self.distance_calculator.draw_distance_on_frame(processed_frame, detections)
+        Args:
+            window_name: Nombre de la ventana de visualización
+            processed_frame: Frame ya procesado
+            
+        Returns:
+            False si el usuario pidió salir, True en caso contrario
+        """
+        # Calcular FPS
+        self.frame_count += 1
+        elapsed_time = time.time() - self.start_time
+        if elapsed_time > 0:
+            self.fps = self.frame_count / elapsed_time
+            
+        # Agregar información de FPS
+        cv2.putText(processed_frame, f"FPS: {self.fps:.1f}", (10, 30),
+                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                  
+        # Agregar información de calibración
+        cv2.putText(processed_frame, f"Calibracion: {self.distance_calculator.pixels_per_cm:.1f} px/cm", 
+                  (10, processed_frame.shape[0] - 20),
+                  cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
-        # Actualizar información de estado
-        self.current_detections = detections
-        self.current_distance = distance_cm
+        # Mostrar frame
+        self.current_frame = processed_frame
+        cv2.imshow(window_name, processed_frame)
         
-        return processed_frame, detections, distance_cm
+        # Manejar teclas
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            return False
+        elif key == ord('c'):
+            self._calibrate_interactive()
+        return True
         
     def run_real_time_processing(self, window_name: str = "Postprocesamiento - Distancias"):
         """
@@ -123,41 +176,29 @@ class VideoPostProcessor:
         print("Iniciando procesamiento en tiempo real...")
         print("Presiona 'q' para salir")
         print("Presiona 'c' para calibrar (ajustar factor píxeles/cm)")
+        if self.batch_size > 1:
+            print(f"Inferencia por lotes de {self.batch_size} frames")
+        
+        batch = []
         
         try:
             while self.is_running:
-                ret, frame = self.cap.read()
+                ret, frame = read_latest(self.cap, self._buffer_ok)
                 if not ret:
                     print("Error: No se pudo leer el frame")
                     break
-                    
-                # Procesar frame
-                processed_frame, detections, distance_cm = self.process_frame(frame)
                 
-                # Calcular FPS
-                self.frame_count += 1
-                elapsed_time = time.time() - self.start_time
-                if elapsed_time > 0:
-                    self.fps = self.frame_count / elapsed_time
+                # Acumular frames hasta completar el lote
+                batch.append(frame)
+                if len(batch) < self.batch_size:
+                    continue
                     
-                # Agregar información de FPS
-                cv2.putText(processed_frame, f"FPS: {self.fps:.1f}", (10, 30),
-                          cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                          
-                # Agregar información de calibración
-                cv2.putText(processed_frame, f"Calibracion: {self.distance_calculator.pixels_per_cm:.1f} px/cm", 
-                          (10, processed_frame.shape[0] - 20),
-                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                
-                # Mostrar frame
-                cv2.imshow(window_name, processed_frame)
-                
-                # Manejar teclas
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    break
-                elif key == ord('c'):
-                    self._calibrate_interactive()
+                # Procesar lote y mostrar cada frame
+                for processed_frame, _, _ in self.process_batch(batch):
+                    if not self._show_processed_frame(window_name, processed_frame):
+                        self.is_running = False
+                        break
+                batch.clear()
                     
         except KeyboardInterrupt:
             print("\nInterrumpido por el usuario")
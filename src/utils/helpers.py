@@ -507,6 +507,61 @@ class PerformanceMonitor:
         """
         return {op: self.get_statistics(op) for op in self.execution_times.keys()}
 
+class RingBuffer:
+    """Buffer circular de tamaño fijo sobre un array de NumPy.
+    
+    Sustituye a collections.deque(maxlen=N) en los históricos que se grafican:
+    no crea objetos float de Python por muestra y view() entrega un array
+    listo para matplotlib/NumPy.
+    """
+    
+    def __init__(self, capacity: int, width: Optional[int] = None, dtype=np.float32):
+        """Inicializa el buffer vacío.
+        
+        Args:
+            capacity: Número máximo de muestras
+            width: Número de columnas por muestra (None para muestras escalares)
+            dtype: Tipo de los datos
+        """
+        shape = (capacity,) if width is None else (capacity, width)
+        self.buf = np.empty(shape, dtype=dtype)
+        self.capacity = capacity
+        self.head = 0
+        self.full = False
+    
+    def __len__(self) -> int:
+        return self.capacity if self.full else self.head
+    
+    def push(self, value):
+        """Añade una muestra, sobrescribiendo la más antigua si está lleno."""
+        self.buf[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.full |= self.head == 0
+    
+    def extend(self, values):
+        """Añade varias muestras en orden."""
+        for value in values:
+            self.push(value)
+    
+    def clear(self):
+        """Vacía el buffer (sin liberar memoria)."""
+        self.head = 0
+        self.full = False
+    
+    def last(self):
+        """Devuelve la muestra más reciente (el buffer no debe estar vacío)."""
+        return self.buf[self.head - 1]
+    
+    def view(self) -> np.ndarray:
+        """Devuelve las muestras de la más antigua a la más reciente.
+        
+        Returns:
+            Vista sin copia mientras el buffer no ha dado la vuelta; después, una copia ordenada
+        """
+        if not self.full:
+            return self.buf[:self.head]
+        return np.concatenate((self.buf[self.head:], self.buf[:self.head]))
+
 def create_hash(data: str) -> str:
     """Crea un hash MD5 de una cadena.
     
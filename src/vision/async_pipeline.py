@@ -0,0 +1,82 @@
+"""Pipeline asyncio captura → detección → dibujo para los scripts de demo.
+
+Cada etapa corre en su propia tarea y se comunican con colas pequeñas, de modo
+que el rendimiento queda limitado por la etapa más lenta y no por la suma.
+"""
+
+import asyncio
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Tuple
+
+import numpy as np
+
+
+def _put_latest(queue: asyncio.Queue, item: Any):
+    """Encola un elemento descartando el más antiguo si la cola está llena."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+async def _run_pipeline(read_fn: Callable[[], Tuple[bool, np.ndarray]],
+                        detect_fn: Callable[[np.ndarray], Any],
+                        draw_fn: Callable[[np.ndarray, Any], bool],
+                        queue_size: int):
+    """Lanza las tres etapas y espera a que alguna termine."""
+    loop = asyncio.get_running_loop()
+    frames = asyncio.Queue(maxsize=queue_size)
+    results = asyncio.Queue(maxsize=queue_size)
+
+    capture_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+    detect_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="detect")
+
+    async def capture_task():
+        while True:
+            ret, frame = await loop.run_in_executor(capture_pool, read_fn)
+            if not ret:
+                print("❌ Error: No se pudo leer el frame")
+                return
+            _put_latest(frames, frame)
+
+    async def detect_task():
+        while True:
+            frame = await frames.get()
+            detections = await loop.run_in_executor(detect_pool, detect_fn, frame)
+            _put_latest(results, (frame, detections))
+
+    async def draw_task():
+        # Se ejecuta en el hilo principal: imshow/waitKey deben llamarse desde aquí
+        while True:
+            frame, detections = await results.get()
+            if not draw_fn(frame, detections):
+                return
+
+    tasks = [asyncio.ensure_future(coro) for coro in (capture_task(), detect_task(), draw_task())]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            task.result()
+    finally:
+        capture_pool.shutdown(wait=True)
+        detect_pool.shutdown(wait=True)
+
+
+def run_async_pipeline(read_fn: Callable[[], Tuple[bool, np.ndarray]],
+                       detect_fn: Callable[[np.ndarray], Any],
+                       draw_fn: Callable[[np.ndarray, Any], bool],
+                       queue_size: int = 2):
+    """Ejecuta captura, detección y dibujo solapados en distintos hilos.
+
+    Args:
+        read_fn: Función de captura que devuelve (ret, frame)
+        detect_fn: Función de detección aplicada a cada frame
+        draw_fn: Dibuja y muestra (frame, detecciones); devuelve False para salir
+        queue_size: Tamaño de las colas entre etapas (pequeño para evitar lag)
+    """
+    # El paralelismo lo controla el pipeline, no el pool interno de OpenCV
+    cv2.setNumThreads(1)
+    asyncio.run(_run_pipeline(read_fn, detect_fn, draw_fn, queue_size))
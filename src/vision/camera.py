@@ -0,0 +1,273 @@
+"""Utilidades de captura de cámara y ventanas HighGUI con baja latencia."""
+
+import cv2
+import os
+import sys
+import threading
+from typing import Optional, Union
+
+
+def limit_opencv_threads(num_threads: int = 1, max_cores: Optional[int] = None) -> None:
+    """Desactiva el paralelismo interno de OpenCV y, si se pide, fija el proceso a pocos núcleos.
+
+    Las primitivas de dibujo por frame son tan pequeñas que la sincronización
+    del pool interno de OpenCV cuesta más que el trabajo y compite con los
+    hilos de captura/detección (se han medido bucles hasta 2× más lentos).
+
+    Args:
+        num_threads: Hilos internos de OpenCV
+        max_cores: Núcleos a los que fijar el proceso en Linux (None, por defecto, para no fijar)
+    """
+    cv2.setNumThreads(num_threads)
+
+    if max_cores and hasattr(os, "sched_setaffinity"):
+        # Conjunto de núcleos pequeño y estable para evitar migraciones entre CCX
+        allowed = sorted(os.sched_getaffinity(0))
+        try:
+            os.sched_setaffinity(0, allowed[:max_cores])
+        except OSError as e:
+            print(f"⚠️ No se pudo fijar la afinidad de CPU: {e}")
+
+
+# Opciones de libavformat para streams de red: sin buffer de lectura anticipada. El
+# transporte RTSP se deja a FFmpeg (UDP con paso a TCP) salvo que se pida uno concreto
+FFMPEG_LOW_LATENCY_OPTIONS = "fflags;nobuffer|flags;low_delay"
+
+# Si el usuario ya definió las opciones de FFMPEG, no se sobrescriben
+_USER_FFMPEG_OPTIONS = "OPENCV_FFMPEG_CAPTURE_OPTIONS" in os.environ
+
+NETWORK_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+
+
+def create_capture(source: Union[int, str] = 0, rtsp_transport: Optional[str] = None) -> cv2.VideoCapture:
+    """Abre una fuente de video con el backend de menor latencia disponible.
+
+    - Streams de red (RTSP/HTTP/UDP): FFMPEG sin buffering de entrada. Las
+      opciones solo se fijan si OPENCV_FFMPEG_CAPTURE_OPTIONS no estaba definida.
+    - Cámaras USB: V4L2 en Linux y DirectShow en Windows, que respetan
+      CAP_PROP_BUFFERSIZE; si no abren, se usa el backend por defecto.
+    - Archivos: backend por defecto.
+
+    Args:
+        source: Índice de cámara, URL del stream o ruta de archivo
+        rtsp_transport: Transporte RTSP forzado ('tcp' o 'udp'); None deja elegir a FFmpeg
+
+    Returns:
+        Captura de OpenCV (comprobar isOpened())
+    """
+    if isinstance(source, str) and source.lower().startswith(NETWORK_PREFIXES):
+        # OpenCV lee la variable al abrir cada captura FFMPEG
+        if not _USER_FFMPEG_OPTIONS:
+            options = FFMPEG_LOW_LATENCY_OPTIONS
+            if rtsp_transport:
+                options += f"|rtsp_transport;{rtsp_transport}"
+            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = options
+        return cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+
+    if isinstance(source, int):
+        if sys.platform.startswith("linux"):
+            backend = cv2.CAP_V4L2
+        elif sys.platform == "win32":
+            backend = cv2.CAP_DSHOW
+        else:
+            backend = None
+        if backend is not None:
+            cap = cv2.VideoCapture(source, backend)
+            if cap.isOpened():
+                return cap
+            cap.release()
+
+    return cv2.VideoCapture(source)
+
+
+def configure_low_latency_capture(cap: cv2.VideoCapture, fps: int = 30,
+                                  width: Optional[int] = None, height: Optional[int] = None) -> bool:
+    """Configura una captura para entregar siempre el frame más reciente.
+
+    Reduce el buffer del driver a 1 frame, fuerza MJPEG y fija los FPS.
+
+    Args:
+        cap: Captura de OpenCV ya abierta
+        fps: FPS solicitados a la cámara
+        width: Ancho solicitado (None para mantener el del driver)
+        height: Alto solicitado (None para mantener el del driver)
+
+    Returns:
+        True si el backend aceptó el tamaño de buffer, False en caso contrario
+    """
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    if width is not None:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    if height is not None:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+
+    buffer_ok = cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    if not buffer_ok:
+        print("⚠️ El backend de captura ignora CAP_PROP_BUFFERSIZE; se descartarán frames con grab()")
+    return buffer_ok
+
+
+def read_latest(cap: cv2.VideoCapture, buffer_ok: bool = True, stale_frames: int = 2):
+    """Lee el frame más reciente de la captura.
+
+    Si el backend no respeta CAP_PROP_BUFFERSIZE, descarta con grab() los
+    frames acumulados antes de leer.
+
+    Args:
+        cap: Captura de OpenCV
+        buffer_ok: Resultado de configure_low_latency_capture
+        stale_frames: Número de frames a descartar cuando el buffer no es de 1
+
+    Returns:
+        Tupla (ret, frame) como cv2.VideoCapture.read()
+    """
+    if not buffer_ok:
+        for _ in range(stale_frames):
+            cap.grab()
+    return cap.read()
+
+
+# cv2.pollKey no existe antes de OpenCV 4.5
+_poll_key = getattr(cv2, "pollKey", None) or (lambda: cv2.waitKey(1))
+
+
+def poll_key() -> int:
+    """Lee una tecla pulsada sin bloquear el bucle.
+
+    Usa cv2.pollKey (OpenCV 4.5+), que procesa los eventos de la ventana sin
+    esperar; en versiones anteriores recurre a cv2.waitKey(1).
+
+    Returns:
+        Código de la tecla (8 bits) o 255 si no hay ninguna pulsada
+    """
+    return _poll_key() & 0xFF
+
+
+def open_camera(source: Union[int, str] = 0, fps: int = 30,
+                width: Optional[int] = None, height: Optional[int] = None):
+    """Abre una cámara configurada para baja latencia.
+
+    Args:
+        source: Índice de cámara o URL del stream
+        fps: FPS solicitados a la cámara
+        width: Ancho solicitado (None para mantener el del driver)
+        height: Alto solicitado (None para mantener el del driver)
+
+    Returns:
+        Tupla (cap, buffer_ok); cap.isOpened() indica si se abrió correctamente
+    """
+    cap = create_capture(source)
+    buffer_ok = False
+    if cap.isOpened():
+        buffer_ok = configure_low_latency_capture(cap, fps=fps, width=width, height=height)
+    return cap, buffer_ok
+
+
+class FrameGrabber:
+    """Lee la cámara en un hilo propio y entrega siempre el último frame.
+
+    Con decode_on_demand el hilo vacía la cola del driver con grab() y solo
+    decodifica (retrieve()) el frame que llega mientras hay un consumidor
+    esperando: los frames descartados no pasan por la conversión a BGR.
+
+    Con keep_all (archivos de video) no se descarta ningún frame: el hilo
+    decodifica el siguiente mientras el consumidor procesa el actual y espera
+    a que lo recoja antes de leer otro.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, timeout: float = 1.0, decode_on_demand: bool = False,
+                 keep_all: bool = False):
+        """
+        Inicializa el lector (no arranca hasta llamar a start()).
+
+        Args:
+            cap: Captura de OpenCV ya abierta y configurada
+            timeout: Segundos entre comprobaciones de parada mientras se espera un frame
+            decode_on_demand: Decodificar solo los frames que se van a entregar
+            keep_all: Entregar todos los frames en orden (sin descartar ninguno)
+        """
+        self.cap = cap
+        self.timeout = timeout
+        self.decode_on_demand = decode_on_demand
+        self.keep_all = keep_all
+        self.skip_frames = 0  # keep_all: frames a saltar (solo grab()) antes del siguiente
+        self._frame = None
+        self._ret = True
+        self._wanted = False
+        self._new_frame = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "FrameGrabber":
+        """Arranca el hilo de lectura."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        """Bucle del hilo: lee frames en cuanto llegan y decodifica los que se van a usar."""
+        while not self._stop.is_set():
+            if self.keep_all:
+                # Esperar a que se recoja el frame anterior antes de leer el siguiente
+                with self._new_frame:
+                    if not self._new_frame.wait_for(lambda: self._frame is None, timeout=self.timeout):
+                        continue
+                # Saltos pedidos por el consumidor para no quedarse atrás: sin decodificar
+                skip, self.skip_frames = self.skip_frames, 0
+                for _ in range(skip):
+                    if not self.cap.grab():
+                        break
+            if self.decode_on_demand:
+                ret = self.cap.grab()
+                frame = None
+                if ret:
+                    with self._new_frame:
+                        wanted = self._wanted
+                    if not wanted:
+                        continue  # Nadie espera: descartar sin decodificar
+                    ret, frame = self.cap.retrieve()
+            else:
+                ret, frame = self.cap.read()
+            with self._new_frame:
+                self._ret, self._frame = ret, frame
+                self._wanted = False
+                self._new_frame.notify_all()
+            if not ret:
+                break
+
+    def get_latest(self):
+        """
+        Devuelve el frame más reciente que no se haya entregado todavía.
+
+        Returns:
+            Tupla (ret, frame) como cv2.VideoCapture.read(); ret solo es False si la
+            cámara dejó de entregar frames o el lector se detuvo. Un frame lento (p. ej.
+            la primera lectura de la cámara) no cuenta como fallo: se sigue esperando
+        """
+        with self._new_frame:
+            while self._frame is None and self._ret and self._is_running():
+                self._wanted = True
+                self._new_frame.wait_for(lambda: (self._frame is not None or not self._ret
+                                                  or self._stop.is_set()),
+                                         timeout=self.timeout)
+            ret, frame = self._ret and self._frame is not None, self._frame
+            # Consumir el frame para no entregarlo dos veces
+            self._frame = None
+            self._new_frame.notify_all()
+        return ret, frame
+
+    def _is_running(self) -> bool:
+        """True mientras el hilo de lectura siga vivo y no se haya pedido detenerlo."""
+        thread = self._thread
+        return thread is not None and thread.is_alive() and not self._stop.is_set()
+
+    def stop(self):
+        """Detiene el hilo de lectura (no libera la captura)."""
+        self._stop.set()
+        with self._new_frame:
+            self._new_frame.notify_all()  # Despertar a get_latest() si está esperando
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout)
+            self._thread = None
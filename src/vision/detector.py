@@ -2,24 +2,245 @@
 
 import cv2
 import numpy as np
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import yaml
 import os
+import torch
+from functools import lru_cache
 from ultralytics import YOLO
 
+try:
+    from .camera import open_camera, read_latest
+except ImportError:
+    from camera import open_camera, read_latest
+
+
+def engine_path_for(model_path: str, batch: int = 1, precision: str = "fp16") -> str:
+    """Ruta del engine TensorRT correspondiente a un modelo YOLO.
+    
+    El tamaño de lote y la precisión forman parte del nombre: un engine de lote
+    fijo 1 no sirve para llamadas por lotes, y uno FP16 no debe cargarse cuando
+    se pide FP32, así que cada combinación tiene su propio engine en caché.
+    
+    Args:
+        model_path: Ruta al modelo YOLO (.pt)
+        batch: Tamaño de lote máximo del engine
+        precision: 'fp32', 'fp16' o 'int8'
+        
+    Returns:
+        Ruta con sufijo _b<lote>_<precisión>.engine junto al modelo original
+    """
+    return f"{os.path.splitext(model_path)[0]}_b{batch}_{precision}.engine"
+
+
+def int8_engine_path_for(model_path: str, batch: int = 1) -> str:
+    """Ruta del engine TensorRT INT8 (el que genera calibrate_int8.py).
+    
+    Args:
+        model_path: Ruta al modelo YOLO (.pt)
+        batch: Tamaño de lote máximo del engine
+        
+    Returns:
+        Ruta con sufijo _b<lote>_int8.engine junto al modelo original
+    """
+    return engine_path_for(model_path, batch, "int8")
+
+
+def openvino_path_for(model_path: str, batch: int = 1, precision: str = "fp32") -> str:
+    """Carpeta del modelo OpenVINO exportado para un modelo YOLO.
+    
+    Args:
+        model_path: Ruta al modelo YOLO (.pt)
+        batch: Tamaño de lote máximo del modelo exportado
+        precision: 'fp32', 'fp16' o 'int8'
+        
+    Returns:
+        Ruta con sufijo _b<lote>_<precisión>_openvino_model junto al modelo original
+    """
+    return f"{os.path.splitext(model_path)[0]}_b{batch}_{precision}_openvino_model"
+
+
+def preferred_model_path(model_path: str, batch: int = 1) -> str:
+    """Elige el modelo más rápido disponible: engine INT8, engine FP16 o el .pt.
+    
+    Args:
+        model_path: Ruta al modelo YOLO (.pt)
+        batch: Tamaño de lote con el que se llamará al modelo
+        
+    Returns:
+        Ruta del primer modelo existente en ese orden (el .pt si no hay engines
+        exportados para ese lote)
+    """
+    for candidate in (int8_engine_path_for(model_path, batch), engine_path_for(model_path, batch)):
+        if os.path.exists(candidate):
+            return candidate
+    return model_path
+
+
+def _move_export(exported_path: str, cached_path: str) -> str:
+    """Mueve lo exportado por ultralytics (siempre junto al .pt con su mismo nombre)
+    a la ruta de caché que identifica su configuración.
+    
+    Args:
+        exported_path: Ruta devuelta por YOLO.export
+        cached_path: Ruta de caché destino
+        
+    Returns:
+        Ruta de caché
+    """
+    if os.path.abspath(exported_path) != os.path.abspath(cached_path):
+        os.replace(exported_path, cached_path)
+    return cached_path
+
+
+def export_tensorrt_engine(model_path: str, imgsz: int = 640, half: bool = True,
+                           batch: int = 1) -> Optional[str]:
+    """Exporta un modelo YOLO a un engine TensorRT (solo si no existe ya).
+    
+    Args:
+        model_path: Ruta al modelo YOLO (.pt)
+        imgsz: Tamaño de entrada fijo del engine
+        half: Si es True, genera el engine en FP16
+        batch: Tamaño de lote máximo; si es mayor que 1 el engine se exporta con lote dinámico
+        
+    Returns:
+        Ruta del engine, o None si la exportación falla
+    """
+    engine_path = engine_path_for(model_path, batch, "fp16" if half else "fp32")
+    if os.path.exists(engine_path):
+        print(f"✅ Engine TensorRT ya disponible: {engine_path}")
+        return engine_path
+    
+    try:
+        print(f"⚙️ Exportando {model_path} a TensorRT (FP16={half}, imgsz={imgsz}, batch={batch})...")
+        exported_path = YOLO(model_path).export(format="engine", imgsz=imgsz, half=half, device=0,
+                                                dynamic=batch > 1, batch=batch, workspace=2)
+        engine_path = _move_export(str(exported_path), engine_path)
+        print(f"✅ Engine TensorRT generado: {engine_path}")
+        return engine_path
+        
+    except Exception as e:
+        print(f"❌ Error exportando a TensorRT: {e}")
+        return None
+
+
+def export_openvino_model(model_path: str, imgsz: int = 640, batch: int = 1,
+                          precision: str = "fp32", data: Optional[str] = None) -> Optional[str]:
+    """Exporta un modelo YOLO a OpenVINO para inferencia en CPU (solo si no existe ya).
+    
+    Args:
+        model_path: Ruta al modelo YOLO (.pt)
+        imgsz: Tamaño de entrada del modelo exportado
+        batch: Tamaño de lote máximo; si es mayor que 1 se exporta con lote dinámico
+        precision: 'fp32', 'fp16' o 'int8' (INT8 cuantiza con las imágenes de `data`)
+        data: YAML de calibración (el que genera calibrate_int8.py)
+        
+    Returns:
+        Ruta de la carpeta del modelo OpenVINO, o None si la exportación falla
+    """
+    openvino_path = openvino_path_for(model_path, batch, precision)
+    if os.path.exists(openvino_path):
+        print(f"✅ Modelo OpenVINO ya disponible: {openvino_path}")
+        return openvino_path
+    
+    try:
+        print(f"⚙️ Exportando {model_path} a OpenVINO ({precision.upper()}, imgsz={imgsz}, batch={batch})...")
+        exported_path = YOLO(model_path).export(format="openvino", imgsz=imgsz, half=precision == "fp16",
+                                                int8=precision == "int8", data=data,
+                                                dynamic=batch > 1, batch=batch)
+        openvino_path = _move_export(str(exported_path), openvino_path)
+        print(f"✅ Modelo OpenVINO generado: {openvino_path}")
+        return openvino_path
+        
+    except Exception as e:
+        print(f"❌ Error exportando a OpenVINO: {e}")
+        return None
+
+
+def accelerated_model_path(model_path: str, backend: str = "auto", batch: int = 1,
+                           precision: str = "fp16", calib_data: Optional[str] = None) -> str:
+    """Exporta el modelo al backend indicado (una vez) y devuelve la ruta a cargar.
+    
+    Args:
+        model_path: Ruta al modelo YOLO (.pt)
+        backend: 'auto' (TensorRT con CUDA, OpenVINO sin ella), 'trt', 'openvino' o 'torch'
+        batch: Tamaño de lote máximo con el que se llamará al modelo
+        precision: 'fp32', 'fp16' o 'int8'
+        calib_data: YAML de calibración para exportar a INT8
+        
+    Returns:
+        Ruta del modelo exportado, o model_path si el backend es 'torch' o la exportación falla
+    """
+    if not model_path.endswith(".pt") or backend == "torch":
+        return model_path
+    
+    if backend == "auto":
+        backend = "trt" if torch.cuda.is_available() else "openvino"
+    
+    if precision == "int8" and not (calib_data and os.path.exists(calib_data)):
+        print(f"⚠️ Sin YAML de calibración ({calib_data}): se usa FP16 en lugar de INT8. "
+              "Ejecuta calibrate_int8.py para generarlo")
+        precision = "fp16"
+    
+    if backend == "trt":
+        if precision == "int8":
+            # El engine INT8 lo genera calibrate_int8.py; aquí solo se reutiliza
+            int8_engine = int8_engine_path_for(model_path, batch)
+            if os.path.exists(int8_engine):
+                print(f"✅ Engine TensorRT INT8 ya disponible: {int8_engine}")
+                return int8_engine
+            print(f"⚠️ No existe {int8_engine}: se usa FP16 en lugar de INT8. "
+                  f"Ejecuta calibrate_int8.py --batch {batch} para generarlo")
+            precision = "fp16"
+        exported_path = export_tensorrt_engine(model_path, half=precision == "fp16", batch=batch)
+    elif backend == "openvino":
+        exported_path = export_openvino_model(model_path, batch=batch, precision=precision,
+                                              data=calib_data)
+    else:
+        print(f"⚠️ Backend de aceleración desconocido: {backend}")
+        exported_path = None
+    
+    return exported_path or model_path
+
+
+@lru_cache(maxsize=None)
+def _load_yolo(model_path: str, backend: str, batch: int, precision: str,
+               calib_data: Optional[str]) -> Tuple[str, YOLO]:
+    """Exporta (si hace falta) y carga los pesos YOLO una sola vez por configuración y proceso.
+    
+    Args:
+        model_path: Ruta absoluta al modelo YOLO
+        backend: Backend de aceleración (ver accelerated_model_path)
+        batch: Tamaño de lote máximo con el que se llamará al modelo
+        precision: 'fp32', 'fp16' o 'int8'
+        calib_data: YAML de calibración para INT8
+        
+    Returns:
+        Tupla (ruta del modelo cargado, modelo YOLO)
+    """
+    loaded_path = accelerated_model_path(model_path, backend, batch, precision, calib_data)
+    return loaded_path, YOLO(loaded_path)
+
+
 class YOLOPoseDetector:
     """Detector de pose usando YOLO."""
     
-    def __init__(self, config_path: str = "config/config.yaml"):
+    def __init__(self, config_path: str = "config/config.yaml", model_path: Optional[str] = None):
         """Inicializa el detector YOLO para pose detection.
         
         Args:
             config_path: Ruta al archivo de configuración
+            model_path: Ruta al modelo (.pt o .engine); si es None se usa la de la configuración
         """
         self.config = self._load_config(config_path)
         self.model = None
         self.confidence_threshold = self.config['vision']['confidence_threshold']
-        self.model_path = self.config['vision']['yolo_model_path']
+        self.model_path = model_path or self.config['vision']['yolo_model_path']
+        self.accel_backend = self.config['vision'].get('accel_backend', 'torch')
+        self.fp_precision = self.config['vision'].get('fp_precision', 'fp32')
+        self.calib_data = self.config['vision'].get('calib_data', 'config/calib.yaml')
+        # FP16 en PyTorch solo con CUDA; los modelos exportados fijan su propia precisión
+        self.half = self.fp_precision == 'fp16' and torch.cuda.is_available()
         
     def _load_config(self, config_path: str) -> dict:
         """Carga la configuración desde archivo YAML."""
@@ -40,9 +261,16 @@ class YOLOPoseDetector:
             }
         }
     
-    def load_model(self) -> bool:
+    def load_model(self, batch: int = 1) -> bool:
         """Carga el modelo YOLO para pose detection.
         
+        Si el modelo es un .pt y accel_backend no es 'torch', se exporta la primera
+        vez a TensorRT/OpenVINO y se carga el modelo exportado. El modelo cargado se
+        comparte entre detectores con la misma ruta, backend, precisión y lote.
+        
+        Args:
+            batch: Tamaño de lote máximo con el que se llamará al modelo
+        
         Returns:
             True si el modelo se cargó correctamente, False en caso contrario
         """
@@ -51,8 +279,9 @@ class YOLOPoseDetector:
                 print(f"❌ Archivo de modelo no encontrado: {self.model_path}")
                 return False
             
-            self.model = YOLO(self.model_path)
-            print(f"✅ Modelo YOLO cargado exitosamente desde: {self.model_path}")
+            model_path, self.model = _load_yolo(os.path.abspath(self.model_path), self.accel_backend,
+                                                batch, self.fp_precision, self.calib_data)
+            print(f"✅ Modelo YOLO cargado exitosamente desde: {model_path}")
             print(f"📊 Clases del modelo: {list(self.model.names.values())}")
             return True
                 
@@ -75,7 +304,7 @@ class YOLOPoseDetector:
         
         try:
             # Realizar detección con YOLO
-            results = self.model(frame, conf=self.confidence_threshold, verbose=False)
+            results = self.model(frame, conf=self.confidence_threshold, half=self.half, verbose=False)
             # Usar el método plot() que automáticamente dibuja keypoints y bounding boxes
             annotated_frame = results[0].plot()
             return annotated_frame
@@ -84,11 +313,128 @@ class YOLOPoseDetector:
             print(f"⚠️ Error en detección YOLO: {e}")
             return None
     
-    def get_detections_data(self, frame: np.ndarray) -> List[dict]:
+    def _result_to_detections(self, result, scale: float = 1.0) -> List[dict]:
+        """Convierte un resultado de YOLO en la lista de detecciones del proyecto.
+        
+        Args:
+            result: Resultado de ultralytics para un frame
+            scale: Factor por el que multiplicar coordenadas (frame reducido → original)
+            
+        Returns:
+            Lista de detecciones con información de bounding boxes, keypoints y confianza
+        """
+        detections = []
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return detections
+        
+        # Una sola transferencia GPU→CPU por tensor en lugar de varias por detección
+        xyxy = boxes.xyxy.cpu().numpy()
+        if scale != 1.0:
+            xyxy = xyxy * scale
+        confs = boxes.conf.cpu().numpy()
+        class_ids = boxes.cls.cpu().numpy().astype(int)
+        
+        kpts_xy = kpts_conf = None
+        keypoints_data = getattr(result, 'keypoints', None)
+        if keypoints_data is not None:
+            kpts_xy = keypoints_data.xy.cpu().numpy()
+            if scale != 1.0:
+                kpts_xy = kpts_xy * scale
+            kpts_conf = keypoints_data.conf.cpu().numpy()
+        
+        for i in range(len(xyxy)):
+            x1, y1, x2, y2 = xyxy[i]
+            class_id = int(class_ids[i])
+            
+            detection = {
+                'bbox': [float(x1), float(y1), float(x2), float(y2)],
+                'confidence': float(confs[i]),
+                'class_id': class_id,
+                'class_name': self.model.names[class_id],
+                'keypoints': None
+            }
+            
+            # Agregar keypoints si están disponibles
+            if kpts_xy is not None and i < len(kpts_xy):
+                detection['keypoints'] = np.column_stack([kpts_xy[i], kpts_conf[i]])
+            
+            detections.append(detection)
+        
+        return detections
+    
+    def detect_batch(self, frames: List[np.ndarray]) -> List[Tuple[np.ndarray, List[dict]]]:
+        """Detecta poses en un lote de frames con una sola llamada al modelo.
+        
+        Args:
+            frames: Lista de frames (mismo tamaño) en formato numpy array
+            
+        Returns:
+            Lista de tuplas (frame_anotado, detecciones), una por frame de entrada.
+            Si hay error, se devuelve una copia del frame sin anotar y sin detecciones.
+        """
+        if self.model is None:
+            print("❌ Modelo no cargado. Llamar a load_model() primero.")
+            return [(frame.copy(), []) for frame in frames]
+        
+        try:
+            results = self.model(frames, conf=self.confidence_threshold, half=self.half, verbose=False)
+            return [(result.plot(), self._result_to_detections(result)) for result in results]
+            
+        except Exception as e:
+            print(f"⚠️ Error en detección YOLO por lotes: {e}")
+            return [(frame.copy(), []) for frame in frames]
+    
+    @staticmethod
+    def _shrink_for_inference(frame: np.ndarray, max_size: Optional[int]) -> Tuple[np.ndarray, float]:
+        """Reduce el frame si su lado mayor supera max_size.
+        
+        Returns:
+            Tupla (frame, escala) donde escala convierte coordenadas del frame reducido al original
+        """
+        height, width = frame.shape[:2]
+        if not max_size or max(height, width) <= max_size:
+            return frame, 1.0
+        
+        # Reducir al tamaño de entrada de YOLO antes de cualquier otra copia
+        scale = max(height, width) / max_size
+        frame = cv2.resize(frame, (round(width / scale), round(height / scale)),
+                           interpolation=cv2.INTER_AREA)
+        return frame, scale
+    
+    def get_detections_data_batch(self, frames: List[np.ndarray],
+                                  max_size: Optional[int] = None) -> List[List[dict]]:
+        """Obtiene los datos de detección de varios frames con una sola llamada al modelo.
+        
+        Args:
+            frames: Lista de frames (pueden tener distinto tamaño)
+            max_size: Igual que en get_detections_data
+            
+        Returns:
+            Lista de listas de detecciones, una por frame de entrada
+        """
+        if self.model is None:
+            print("❌ Modelo no cargado. Llamar a load_model() primero.")
+            return [[] for _ in frames]
+        
+        try:
+            shrunk = [self._shrink_for_inference(frame, max_size) for frame in frames]
+            results = self.model([frame for frame, _ in shrunk], conf=self.confidence_threshold,
+                                 half=self.half, verbose=False)
+            return [self._result_to_detections(result, scale)
+                    for result, (_, scale) in zip(results, shrunk)]
+            
+        except Exception as e:
+            print(f"⚠️ Error en detección YOLO por lotes: {e}")
+            return [[] for _ in frames]
+    
+    def get_detections_data(self, frame: np.ndarray, max_size: Optional[int] = None) -> List[dict]:
         """Obtiene los datos de detección sin anotar el frame.
         
         Args:
             frame: Frame de imagen en formato numpy array
+            max_size: Si el lado mayor del frame lo supera, se reduce (INTER_AREA) a este
+                tamaño antes de la inferencia; las coordenadas se devuelven en el frame original
             
         Returns:
             Lista de detecciones con información de bounding boxes, keypoints y confianza
@@ -100,53 +446,31 @@ class YOLOPoseDetector:
         detections = []
         
         try:
-            results = self.model(frame, conf=self.confidence_threshold, verbose=False)
+            frame, scale = self._shrink_for_inference(frame, max_size)
+            results = self.model(frame, conf=self.confidence_threshold, half=self.half, verbose=False)
             
             for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for i, box in enumerate(boxes):
-                        # Extraer información básica
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        confidence = float(box.conf[0].cpu().numpy())
-                        class_id = int(box.cls[0].cpu().numpy())
-                        class_name = self.model.names[class_id]
-                        
-                        detection = {
-                            'bbox': [float(x1), float(y1), float(x2), float(y2)],
-                            'confidence': confidence,
-                            'class_id': class_id,
-                            'class_name': class_name,
-                            'keypoints': None
-                        }
-                        
-                        # Agregar keypoints si están disponibles
-                        if hasattr(result, 'keypoints') and result.keypoints is not None:
-                            keypoints_data = result.keypoints
-                            if i < len(keypoints_data.xy):
-                                kpts_xy = keypoints_data.xy[i].cpu().numpy()
-                                kpts_conf = keypoints_data.conf[i].cpu().numpy()
-                                keypoints = np.column_stack([kpts_xy, kpts_conf])
-                                detection['keypoints'] = keypoints
-                        
-                        detections.append(detection)
+                detections.extend(self._result_to_detections(result, scale))
                         
         except Exception as e:
             print(f"⚠️ Error en detección: {e}")
             
         return detections
 
-    def draw_detections(self, frame: np.ndarray, detections: List[dict]) -> np.ndarray:
+    def draw_detections(self, frame: np.ndarray, detections: List[dict],
+                        inplace: bool = False) -> np.ndarray:
         """Dibuja las detecciones en el frame.
         
         Args:
             frame: Frame original
             detections: Lista de detecciones
+            inplace: Si es True dibuja sobre el propio frame en lugar de sobre una copia
             
         Returns:
             Frame con las detecciones dibujadas
         """
-        result_frame = frame.copy()
+        # cv2.copyTo admite tanto numpy como cv2.UMat (OpenCL)
+        result_frame = frame if inplace else cv2.copyTo(frame, None)
         
         for detection in detections:
             bbox = detection['bbox']
@@ -176,42 +500,61 @@ class YOLOPoseDetector:
         return result_frame
 
     
-    def run_real_time_detection(self, camera_index: int = 0) -> None:
+    def run_real_time_detection(self, camera_index: int = 0, batch_size: int = 1) -> None:
         """Ejecuta detección en tiempo real usando la cámara.
         
         Args:
             camera_index: Índice de la cámara (0 por defecto)
+            batch_size: Frames acumulados por llamada al modelo (1 = sin lotes)
         """
         print("🚀 Iniciando detección en tiempo real...")
         print(f"📁 Usando modelo: {self.model_path}")
         
-        if not self.load_model():
+        if not self.load_model(batch=max(1, batch_size)):
             print("❌ No se pudo cargar el modelo.")
             return
         
-        cap = cv2.VideoCapture(camera_index)
+        cap, buffer_ok = open_camera(camera_index)
         if not cap.isOpened():
             print("❌ No se pudo abrir la cámara.")
             return
         
         print("📹 Presiona 'q' para salir.")
         
-        while True:
-            ret, frame = cap.read()
+        window_name = "Detección YOLO - Bounding Boxes y Keypoints"
+        batch = []
+        running = True
+        
+        while running:
+            ret, frame = read_latest(cap, buffer_ok)
             if not ret:
                 print("❌ No se pudo leer el frame de la cámara.")
                 break
             
-            # Realizar detección y obtener frame anotado
-            annotated_frame = self.detect(frame)
-            if annotated_frame is not None:
-                cv2.imshow("Detección YOLO - Bounding Boxes y Keypoints", annotated_frame)
-            else:
-                cv2.imshow("Detección YOLO - Bounding Boxes y Keypoints", frame)
+            if batch_size <= 1:
+                # Realizar detección y obtener frame anotado
+                annotated_frame = self.detect(frame)
+                if annotated_frame is not None:
+                    cv2.imshow(window_name, annotated_frame)
+                else:
+                    cv2.imshow(window_name, frame)
+                
+                # Salir si se presiona 'q'
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
             
-            # Salir si se presiona 'q'
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+            # Acumular frames y detectar el lote completo en una sola llamada
+            batch.append(frame)
+            if len(batch) < batch_size:
+                continue
+            
+            for annotated_frame, _ in self.detect_batch(batch):
+                cv2.imshow(window_name, annotated_frame)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    running = False
+                    break
+            batch.clear()
         
         # Limpiar recursos
         cap.release()
@@ -0,0 +1,177 @@
+"""Ventanas de visualización para los scripts en tiempo real.
+
+GLDisplay sube cada frame a una textura OpenGL (glfw + PyOpenGL) y no pasa por
+el bucle de eventos de HighGUI; HighGUIDisplay mantiene cv2.imshow para equipos
+sin OpenGL. Ambas exponen la misma interfaz: show(frame), poll_key() y close().
+"""
+
+import cv2
+import numpy as np
+from collections import deque
+
+from .camera import poll_key
+
+try:
+    import glfw
+    from OpenGL import GL
+except ImportError:  # glfw/PyOpenGL son opcionales: se usa cv2.imshow
+    glfw = None
+    GL = None
+
+# Código devuelto por poll_key() cuando no hay ninguna tecla pulsada
+NO_KEY = 0xFF
+
+
+class HighGUIDisplay:
+    """Visualización con cv2.imshow."""
+
+    def __init__(self, window_name: str):
+        """
+        Args:
+            window_name: Título de la ventana
+        """
+        self.window_name = window_name
+
+    def show(self, frame: np.ndarray) -> None:
+        """Muestra un frame BGR."""
+        cv2.imshow(self.window_name, frame)
+
+    def poll_key(self) -> int:
+        """Devuelve la última tecla pulsada (8 bits) o NO_KEY."""
+        return poll_key()
+
+    def close(self) -> None:
+        """Cierra la ventana."""
+        cv2.destroyWindow(self.window_name)
+
+
+class GLDisplay:
+    """Visualización con una textura OpenGL en una ventana glfw."""
+
+    def __init__(self, window_name: str, width: int = 640, height: int = 480):
+        """
+        La ventana y el contexto OpenGL se crean aquí, ocultos, para que un fallo
+        salga del constructor (y create_display pueda recurrir a cv2.imshow); con
+        el primer frame la ventana toma su tamaño y se muestra.
+
+        Args:
+            window_name: Título de la ventana
+            width: Ancho inicial de la ventana oculta
+            height: Alto inicial de la ventana oculta
+
+        Raises:
+            RuntimeError: Si no se puede inicializar glfw o crear la ventana OpenGL
+        """
+        if glfw is None:
+            raise RuntimeError("glfw y PyOpenGL no están instalados")
+        if not glfw.init():
+            raise RuntimeError("No se pudo inicializar glfw")
+
+        self.window_name = window_name
+        self.window = None
+        self.texture = None
+        self.texture_shape = None
+        self._visible = False
+        self._keys = deque(maxlen=16)
+        self._create_window(width, height)
+
+    def _create_window(self, width: int, height: int) -> None:
+        """Crea la ventana oculta y el contexto OpenGL."""
+        glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+        self.window = glfw.create_window(width, height, self.window_name, None, None)
+        glfw.default_window_hints()
+        if not self.window:
+            glfw.terminate()
+            raise RuntimeError("No se pudo crear la ventana OpenGL")
+
+        try:
+            glfw.make_context_current(self.window)
+            glfw.swap_interval(0)  # Sin esperar al vsync: no bloquear el bucle
+            glfw.set_char_callback(self.window, self._on_char)
+
+            GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, 1)
+            GL.glEnable(GL.GL_TEXTURE_2D)
+            self.texture = GL.glGenTextures(1)
+            GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+        except Exception as e:
+            self.close()
+            raise RuntimeError(f"No se pudo inicializar el contexto OpenGL ({e})")
+
+    def _on_char(self, window, codepoint: int) -> None:
+        """Callback de glfw: guarda las teclas imprimibles para poll_key()."""
+        if codepoint < 256:
+            self._keys.append(codepoint)
+
+    def show(self, frame: np.ndarray) -> None:
+        """Sube el frame BGR a la textura y lo presenta."""
+        height, width = frame.shape[:2]
+        if not self._visible:
+            # Primer frame: ajustar la ventana a su tamaño y mostrarla
+            glfw.set_window_size(self.window, width, height)
+            glfw.show_window(self.window)
+            self._visible = True
+
+        frame = np.ascontiguousarray(frame)
+        if self.texture_shape != (height, width):
+            # Reservar la textura solo cuando cambia la resolución
+            GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGB, width, height, 0,
+                            GL.GL_BGR, GL.GL_UNSIGNED_BYTE, frame)
+            self.texture_shape = (height, width)
+        else:
+            GL.glTexSubImage2D(GL.GL_TEXTURE_2D, 0, 0, 0, width, height,
+                               GL.GL_BGR, GL.GL_UNSIGNED_BYTE, frame)
+
+        fb_width, fb_height = glfw.get_framebuffer_size(self.window)
+        GL.glViewport(0, 0, fb_width, fb_height)
+
+        # Cuadrado a pantalla completa; la fila 0 del frame va arriba
+        GL.glBegin(GL.GL_QUADS)
+        GL.glTexCoord2f(0, 1); GL.glVertex2f(-1, -1)
+        GL.glTexCoord2f(1, 1); GL.glVertex2f(1, -1)
+        GL.glTexCoord2f(1, 0); GL.glVertex2f(1, 1)
+        GL.glTexCoord2f(0, 0); GL.glVertex2f(-1, 1)
+        GL.glEnd()
+
+        glfw.swap_buffers(self.window)
+
+    def poll_key(self) -> int:
+        """Procesa los eventos y devuelve la tecla pulsada (8 bits) o NO_KEY.
+
+        Cerrar la ventana equivale a pulsar 'q'.
+        """
+        glfw.poll_events()
+        if self.window is not None and glfw.window_should_close(self.window):
+            return ord('q')
+        return self._keys.popleft() if self._keys else NO_KEY
+
+    def close(self) -> None:
+        """Destruye la ventana y libera glfw."""
+        if self.window is not None:
+            glfw.destroy_window(self.window)
+            self.window = None
+        glfw.terminate()
+
+
+def create_display(window_name: str, use_highgui: bool = False):
+    """
+    Crea la ventana de visualización más rápida disponible.
+
+    Args:
+        window_name: Título de la ventana
+        use_highgui: Forzar cv2.imshow aunque haya OpenGL
+
+    Returns:
+        GLDisplay si glfw/PyOpenGL están disponibles y la ventana OpenGL se pudo crear,
+        HighGUIDisplay en otro caso
+    """
+    if not use_highgui:
+        if glfw is None:
+            print("⚠️ glfw/PyOpenGL no disponibles: usando cv2.imshow")
+        else:
+            try:
+                return GLDisplay(window_name)
+            except RuntimeError as e:
+                print(f"⚠️ {e}: usando cv2.imshow")
+    return HighGUIDisplay(window_name)
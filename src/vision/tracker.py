@@ -2,7 +2,7 @@
 
 import cv2
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
 from collections import defaultdict
 import time
 
@@ -267,4 +267,166 @@ class KalmanTracker:
         self.kalman.statePre = np.array([initial_position[0], initial_position[1], 0, 0], 
                                        dtype=np.float32)
         self.kalman.statePost = np.array([initial_position[0], initial_position[1], 0, 0], 
-                                        dtype=np.float32)
\ No newline at end of file
+                                        dtype=np.float32)
+
+class FrameDiffGate:
+    """Reutiliza las detecciones previas mientras la escena apenas cambia.
+    
+    Compara una miniatura del frame con la del último frame detectado por bloques:
+    la diferencia absoluta media de cada bloque de la rejilla se compara con el
+    umbral y basta con que un bloque lo supere para llamar al detector. Con la
+    media global un objeto pequeño moviéndose no llegaba a notarse. Además se
+    fuerza una detección nueva cada `max_reuse` frames reutilizados.
+    """
+    
+    def __init__(self, detect_fn: Callable[[np.ndarray], List[Dict]], threshold: float = 8.0,
+                 size: int = 64, grid: int = 16, max_reuse: int = 5):
+        """Inicializa el filtro.
+        
+        Args:
+            detect_fn: Función de detección (p. ej. YOLOPoseDetector.get_detections_data)
+            threshold: Diferencia media (0-255) de un bloque por encima de la cual se detecta de nuevo
+            size: Lado de la miniatura con la que se comparan los frames
+            grid: Bloques por lado en los que se divide la miniatura
+            max_reuse: Frames seguidos como máximo que reutilizan las detecciones
+        """
+        self.detect_fn = detect_fn
+        self.threshold = threshold
+        self.size = size
+        self.grid = grid
+        self.max_reuse = max_reuse
+        self.enabled = True
+        self.prev_small = None
+        self.prev_detections = []
+        self.reused = 0
+    
+    def _changed(self, small: np.ndarray) -> bool:
+        """True si algún bloque de la miniatura difiere de la referencia más que el umbral."""
+        diff = cv2.absdiff(small, self.prev_small)
+        if diff.ndim == 3:
+            diff = diff.max(axis=2)
+        # Media por bloque con INTER_AREA y criterio del máximo entre bloques
+        blocks = cv2.resize(diff, (self.grid, self.grid), interpolation=cv2.INTER_AREA)
+        return float(blocks.max()) >= self.threshold
+    
+    def __call__(self, frame: np.ndarray) -> List[Dict]:
+        """Obtiene las detecciones del frame (nuevas o las del último frame detectado).
+        
+        Args:
+            frame: Frame BGR
+            
+        Returns:
+            Lista de detecciones con el mismo formato que el detector
+        """
+        if not self.enabled:
+            self.prev_small = None
+            return self.detect_fn(frame)
+        
+        small = cv2.resize(frame, (self.size, self.size), interpolation=cv2.INTER_AREA)
+        if (self.prev_small is not None and self.reused < self.max_reuse
+                and not self._changed(small)):
+            self.reused += 1
+            return self.prev_detections
+        
+        # La referencia es el último frame detectado, para no acumular cambios lentos
+        detections = self.detect_fn(frame)
+        self.prev_small = small
+        self.prev_detections = detections
+        self.reused = 0
+        return detections
+
+
+class KeypointFlowTracker:
+    """Ejecuta el detector cada N frames y propaga los keypoints con flujo óptico."""
+    
+    def __init__(self, detect_fn: Callable[[np.ndarray], List[Dict]], skip: int = 2):
+        """Inicializa el tracker.
+        
+        Args:
+            detect_fn: Función de detección (p. ej. YOLOPoseDetector.get_detections_data)
+            skip: Ejecutar la detección completa cada `skip` frames (1 = todos)
+        """
+        self.detect_fn = detect_fn
+        self.skip = max(1, skip)
+        self.frame_count = 0
+        self.prev_gray = None
+        self.prev_detections = []
+        self.lk_params = dict(winSize=(21, 21), maxLevel=3,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+    
+    def __call__(self, frame: np.ndarray) -> List[Dict]:
+        """Obtiene las detecciones del frame (detectadas o propagadas).
+        
+        Args:
+            frame: Frame BGR
+            
+        Returns:
+            Lista de detecciones con el mismo formato que el detector
+        """
+        if self.skip == 1:
+            return self.detect_fn(frame)
+        
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.frame_count % self.skip == 0 or self.prev_gray is None or not self.prev_detections:
+            detections = self.detect_fn(frame)
+        else:
+            detections = self._propagate(gray)
+        
+        self.frame_count += 1
+        self.prev_gray = gray
+        self.prev_detections = detections
+        return detections
+    
+    def _propagate(self, gray: np.ndarray) -> List[Dict]:
+        """Desplaza las detecciones previas con Lucas-Kanade piramidal.
+        
+        Los keypoints que se pierden conservan su posición con confianza 0, de modo
+        que los calculadores de distancia los descartan. La bounding box se desplaza
+        con la mediana del movimiento de sus keypoints (o de su centro si no tiene).
+        
+        Args:
+            gray: Frame actual en escala de grises
+            
+        Returns:
+            Detecciones propagadas al frame actual
+        """
+        # Todos los puntos de todas las detecciones en una sola llamada
+        point_sets = []
+        for detection in self.prev_detections:
+            keypoints = detection.get('keypoints')
+            if keypoints is not None and len(keypoints):
+                point_sets.append(np.asarray(keypoints, dtype=np.float32)[:, :2])
+            else:
+                x1, y1, x2, y2 = detection['bbox']
+                point_sets.append(np.array([[(x1 + x2) / 2, (y1 + y2) / 2]], dtype=np.float32))
+        
+        prev_points = np.concatenate(point_sets).reshape(-1, 1, 2)
+        next_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, prev_points, None,
+                                                          **self.lk_params)
+        next_points = next_points.reshape(-1, 2)
+        tracked = status.ravel() == 1
+        
+        detections = []
+        start = 0
+        for detection, points in zip(self.prev_detections, point_sets):
+            end = start + len(points)
+            ok = tracked[start:end]
+            moved = next_points[start:end]
+            shift = np.median(moved[ok] - points[ok], axis=0) if ok.any() else np.zeros(2)
+            
+            propagated = dict(detection)
+            x1, y1, x2, y2 = detection['bbox']
+            propagated['bbox'] = [x1 + float(shift[0]), y1 + float(shift[1]),
+                                  x2 + float(shift[0]), y2 + float(shift[1])]
+            
+            keypoints = detection.get('keypoints')
+            if keypoints is not None and len(keypoints):
+                keypoints = np.array(keypoints, dtype=np.float64)
+                keypoints[ok, :2] = moved[ok]
+                keypoints[~ok, 2] = 0.0
+                propagated['keypoints'] = keypoints
+            
+            detections.append(propagated)
+            start = end
+        
+        return detections